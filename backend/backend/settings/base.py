@@ -50,6 +50,7 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     "django.middleware.security.SecurityMiddleware",
+    "utils.request_metrics.RequestMetricsMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "corsheaders.middleware.CorsMiddleware",
     "django.middleware.common.CommonMiddleware",
@@ -157,15 +158,58 @@ Q_CLUSTER = {
     "attempt_count": 1,
 }
 
+# Comma separated "host:port" list; room groups are sharded across the hosts
+# by jump consistent hashing. Defaults to the main Redis instance.
+REDIS_CHANNEL_HOSTS = [
+    tuple(host.strip().rsplit(":", 1))
+    for host in os.environ.get(
+        "REDIS_CHANNEL_HOSTS", f"{os.environ['REDIS_HOST']}:{os.environ['REDIS_PORT']}"
+    ).split(",")
+    if host.strip()
+]
+
 CHANNEL_LAYERS = {
     "default": {
-        "BACKEND": "channels_redis.core.RedisChannelLayer",
+        "BACKEND": "job_portal.apps.chats.layers.ShardedRedisChannelLayer",
         "CONFIG": {
-            "hosts": [(os.environ["REDIS_HOST"], os.environ["REDIS_PORT"])],
+            "hosts": REDIS_CHANNEL_HOSTS,
         },
     },
 }
 
+# Chat WebSocket limits. Rates are messages per second; "connection" is
+# enforced in-process, "user" and "room" are shared through Redis.
+CHAT_RATE_LIMITS = {
+    "connection": {"rate": 5, "burst": 10},
+    "user": {"rate": 5, "burst": 20},
+    "room": {"rate": 30, "burst": 60},
+}
+# Throttled messages tolerated per connection within CHAT_THROTTLE_STRIKE_WINDOW
+# seconds before it is closed
+CHAT_THROTTLE_MAX_STRIKES = 20
+CHAT_THROTTLE_STRIKE_WINDOW = 60
+# Outbound frames buffered per socket before a slow client is disconnected
+CHAT_SEND_QUEUE_SIZE = 256
+
+RATE_LIMIT_REDIS_URL = f"redis://{os.environ['REDIS_HOST']}:{os.environ['REDIS_PORT']}/2"
+
+# Scopes of utils.rate_limit: "user" limits authenticated users, "ip" anonymous
+# clients and "global" the whole scope. Rates are "<count>/<s|min|hour|day>".
+RATE_LIMITS = {
+    "search": {"user": "120/min", "ip": "60/min"},
+    "contact_create": {"user": "5/hour", "ip": "5/hour"},
+}
+
+# Reference data snapshots (job_portal.apps.core.reference_snapshot): version
+# bumps are published on this channel; snapshots are revalidated after
+# REFERENCE_SNAPSHOT_MAX_AGE seconds regardless.
+REFERENCE_DATA_REDIS_URL = f"redis://{os.environ['REDIS_HOST']}:{os.environ['REDIS_PORT']}/0"
+REFERENCE_DATA_CHANNEL = "reference_data_version"
+REFERENCE_SNAPSHOT_MAX_AGE = 60
+
+# utils.counters: view counters buffered in Redis, flushed by a django-q schedule
+BUFFERED_COUNTERS_REDIS_URL = f"redis://{os.environ['REDIS_HOST']}:{os.environ['REDIS_PORT']}/3"
+
 # Redis Cache Configuration
 CACHES = {
     "default": {
@@ -181,8 +225,41 @@ CACHES = {
 SESSION_ENGINE = "django.contrib.sessions.backends.cache"
 SESSION_CACHE_ALIAS = "default"
 
+# Resumable chunked attachment uploads
+ATTACHMENT_UPLOAD_MAX_SIZE = 10 * 1024 * 1024
+ATTACHMENT_UPLOAD_CHUNK_SIZE = 512 * 1024
+ATTACHMENT_UPLOAD_MAX_CHUNK_SIZE = 2 * 1024 * 1024
+ATTACHMENT_UPLOAD_MAX_PENDING = 20
+
+# Attachment storage quotas per uploader and per attached object (None = unlimited)
+ATTACHMENT_QUOTAS = {
+    "uploader": {"files": 5000, "bytes": 1024 * 1024 * 1024},
+    "object": {"files": 100, "bytes": 100 * 1024 * 1024},
+}
+
 USE_NGINX = os.environ.get("USE_NGINX", "False").lower() == "true"
 
+# Non-public attachments are served by nginx from this internal location
+PROTECTED_MEDIA_INTERNAL_URL = "/internal/"
+# Lifetime of signed attachment download links (seconds)
+PROTECTED_MEDIA_TOKEN_MAX_AGE = 60 * 60
+
+# Fail list requests whose query count grows with the page size (see utils.query_planner)
+QUERY_COUNT_ASSERTIONS = os.environ.get("QUERY_COUNT_ASSERTIONS", "False").lower() == "true"
+
+# Share of requests measured by utils.request_metrics (0 disables the middleware)
+REQUEST_METRICS_SAMPLE_RATE = float(os.environ.get("REQUEST_METRICS_SAMPLE_RATE", "0.05"))
+# Max SQL queries per sampled request, by URL name; views can set `query_budget` instead
+REQUEST_QUERY_BUDGETS = {}
+REQUEST_QUERY_BUDGET_DEFAULT = 50
+
+# Client addresses allowed to scrape /metrics/ without a staff session
+METRICS_ALLOWED_IPS = os.environ.get("METRICS_ALLOWED_IPS", "127.0.0.1").split(",")
+
+# Reverse proxies in front of the app (1 behind nginx) whose X-Forwarded-For
+# entries are trusted for access control and rate limiting (utils.helpers.get_remote_ip)
+TRUSTED_PROXY_COUNT = int(os.environ.get("TRUSTED_PROXY_COUNT", "0"))
+
 FIREBASE_CREDENTIALS_PATH = os.environ["FIREBASE_CREDENTIALS_PATH"]
 cred = credentials.Certificate(FIREBASE_CREDENTIALS_PATH)
 firebase_admin.initialize_app(cred)
@@ -3,8 +3,12 @@ from django.conf.urls.static import static
 from django.contrib import admin
 from django.urls import include, path
 
+from job_portal.apps.attachments.views import serve_media
+from utils.views import metrics_view
+
 urlpatterns = [
     path("admin/", admin.site.urls),
+    path("metrics/", metrics_view, name="metrics"),
     path("", include("accounts.urls", namespace="accounts")),
     path("", include("job_portal.urls", namespace="job_portal")),
 ]
@@ -31,7 +35,7 @@ if settings.DEBUG:
     ]
 
     urlpatterns += static(settings.STATIC_URL, document_root=settings.STATIC_ROOT)
-    urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
+    urlpatterns += static(settings.MEDIA_URL, view=serve_media, document_root=settings.MEDIA_ROOT)
 
     # from debug_toolbar.toolbar import debug_toolbar_urls
     # urlpatterns += debug_toolbar_urls()
@@ -0,0 +1,124 @@
+"""
+Access checks for non-public attachments.
+
+An attachment is visible to its uploader, staff, the participants of every
+chat room it was posted in, and the owner and assigned master of every job
+or assignment it belongs to. Both sides of the check are cached: the users
+and rooms an attachment belongs to, and the chat rooms a user is in. Room
+membership is invalidated when participants change.
+"""
+
+from typing import FrozenSet, Tuple
+
+from django.conf import settings
+from django.core import signing
+
+from utils.cache_utils import cache_key_generator, delete_cache, get_cache, set_cache
+
+from .models import Attachment
+
+AUDIENCE_CACHE_PREFIX = "attachment_audience"
+CHAT_ROOMS_CACHE_PREFIX = "attachment_access_chat_rooms"
+
+# Assignments can change without touching the attachment, keep this short
+AUDIENCE_CACHE_TIMEOUT = 60
+CHAT_ROOMS_CACHE_TIMEOUT = 300
+
+DOWNLOAD_TOKEN_SALT = "attachments.download"
+
+
+def get_attachment_audience(attachment_id: int) -> Tuple[FrozenSet[int], FrozenSet[int]]:
+    """
+    Get who an attachment is shared with, through the objects it is attached to.
+
+    Args:
+        attachment_id (int): Attachment ID
+
+    Returns:
+        tuple: (user IDs of job owners and assigned masters, chat room IDs)
+    """
+    key = cache_key_generator(AUDIENCE_CACHE_PREFIX, attachment_id)
+    audience = get_cache(key)
+    if audience is not None:
+        return audience
+
+    attachment = Attachment(pk=attachment_id)
+    user_ids = set()
+    for row in attachment.jobs.values_list("employer__user_id", "assignment__master__user_id"):
+        user_ids.update(row)
+    for row in attachment.assignments.values_list("job__employer__user_id", "master__user_id"):
+        user_ids.update(row)
+    user_ids.discard(None)
+    room_ids = attachment.chat_messages.values_list("chat_room_id", flat=True).distinct()
+
+    audience = (frozenset(user_ids), frozenset(room_ids))
+    set_cache(key, audience, AUDIENCE_CACHE_TIMEOUT)
+    return audience
+
+
+def get_user_chat_room_ids(user_id: int) -> FrozenSet[int]:
+    """Get the IDs of the chat rooms a user participates in."""
+    from job_portal.apps.chats.models import ChatParticipant
+
+    key = cache_key_generator(CHAT_ROOMS_CACHE_PREFIX, user_id)
+    room_ids = get_cache(key)
+    if room_ids is None:
+        room_ids = frozenset(
+            ChatParticipant.objects.filter(user_id=user_id).values_list("chat_room_id", flat=True)
+        )
+        set_cache(key, room_ids, CHAT_ROOMS_CACHE_TIMEOUT)
+    return room_ids
+
+
+def invalidate_user_chat_rooms(user_id: int) -> None:
+    delete_cache(cache_key_generator(CHAT_ROOMS_CACHE_PREFIX, user_id))
+
+
+def can_access_attachment(user, attachment: Attachment) -> bool:
+    """
+    Check whether a user may download an attachment.
+
+    Args:
+        user: Requesting user (may be anonymous)
+        attachment (Attachment): Attachment to check
+
+    Returns:
+        bool: True if access is allowed
+    """
+    if attachment.is_public:
+        return True
+    if not user or not user.is_authenticated:
+        return False
+    if user.is_staff or attachment.uploaded_by_id == user.id:
+        return True
+
+    user_ids, room_ids = get_attachment_audience(attachment.pk)
+    if user.id in user_ids:
+        return True
+    return bool(room_ids) and not room_ids.isdisjoint(get_user_chat_room_ids(user.id))
+
+
+def make_download_token(attachment_id: int, user_id: int) -> str:
+    """Sign a download link for one attachment on behalf of one user."""
+    return signing.dumps({"a": attachment_id, "u": user_id}, salt=DOWNLOAD_TOKEN_SALT, compress=True)
+
+
+def read_download_token(token: str, attachment_id: int):
+    """
+    Validate a download token.
+
+    Returns:
+        The user ID the token was issued to, or None if it is invalid, expired
+        or issued for another attachment
+    """
+    try:
+        data = signing.loads(
+            token,
+            salt=DOWNLOAD_TOKEN_SALT,
+            max_age=settings.PROTECTED_MEDIA_TOKEN_MAX_AGE,
+        )
+    except signing.BadSignature:
+        return None
+    if data.get("a") != attachment_id:
+        return None
+    return data.get("u")
@@ -2,7 +2,9 @@ from django.contrib import admin
 from django.contrib.contenttypes.admin import GenericTabularInline
 from django.utils.translation import gettext_lazy as _
 
-from .models import Attachment
+from utils.helpers import format_file_size
+
+from .models import Attachment, AttachmentUpload, AttachmentUsage
 
 
 @admin.register(Attachment)
@@ -63,6 +65,41 @@ class AttachmentAdmin(admin.ModelAdmin):
         )
 
 
+@admin.register(AttachmentUpload)
+class AttachmentUploadAdmin(admin.ModelAdmin):
+    """Admin interface for in-progress chunked uploads."""
+
+    list_display = ['filename', 'uploaded_by', 'offset', 'size', 'parts_count', 'updated_at']
+    search_fields = ['filename', 'uploaded_by__username', 'uploaded_by__email']
+    readonly_fields = ['id', 'offset', 'parts_count', 'created_at', 'updated_at']
+    list_select_related = ['uploaded_by']
+
+    def delete_model(self, request, obj):
+        obj.discard()
+
+
+@admin.register(AttachmentUsage)
+class AttachmentUsageAdmin(admin.ModelAdmin):
+    """Storage usage report; reads the maintained counters only."""
+
+    list_display = ['scope', 'content_type', 'object_id', 'file_count', 'total_size', 'updated_at']
+    list_filter = ['scope', 'content_type']
+    search_fields = ['object_id']
+    ordering = ['-total_bytes']
+    list_select_related = ['content_type']
+    readonly_fields = ['scope', 'content_type', 'object_id', 'file_count', 'total_bytes', 'updated_at']
+
+    @admin.display(description=_('Total Size'), ordering='total_bytes')
+    def total_size(self, obj):
+        return format_file_size(obj.total_bytes)
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+
 class AttachmentInline(GenericTabularInline):
     """Generic inline for attachments."""
     model = Attachment
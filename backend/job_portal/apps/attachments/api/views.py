@@ -0,0 +1,189 @@
+from urllib.parse import quote
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.files.base import File
+from django.core.files.storage import default_storage
+from django.db import transaction
+from django.http import FileResponse, Http404, HttpResponse
+from django.utils.http import content_disposition_header
+from drf_spectacular.utils import OpenApiParameter, extend_schema
+from rest_framework import mixins, parsers, status, viewsets
+from rest_framework.decorators import action
+from rest_framework.exceptions import NotAuthenticated, PermissionDenied, ValidationError
+from rest_framework.permissions import AllowAny, IsAuthenticated
+from rest_framework.response import Response
+
+from job_portal.apps.attachments.access import can_access_attachment, read_download_token
+from job_portal.apps.attachments.models import Attachment, AttachmentUpload
+from job_portal.apps.attachments.serializers import AttachmentUploadSerializer
+
+
+class ChunkParser(parsers.BaseParser):
+    """Raw chunk body of a resumable upload (tus-style media type)."""
+
+    media_type = "application/offset+octet-stream"
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        return stream
+
+
+class AttachmentUploadAPIViewSet(
+    mixins.CreateModelMixin,
+    mixins.RetrieveModelMixin,
+    mixins.DestroyModelMixin,
+    viewsets.GenericViewSet,
+):
+    """
+    Resumable chunked uploads.
+
+    1. POST with filename and size to start an upload.
+    2. PATCH raw chunks with an ``Upload-Offset`` header; each chunk is
+       written to storage immediately. GET returns the offset to resume from.
+    3. Pass the upload id in ``upload_ids`` to an attachment endpoint, which
+       assembles the file and creates the Attachment.
+    """
+
+    serializer_class = AttachmentUploadSerializer
+    permission_classes = [IsAuthenticated]
+    parser_classes = [parsers.JSONParser, ChunkParser]
+
+    def get_queryset(self):
+        return AttachmentUpload.objects.filter(uploaded_by=self.request.user)
+
+    def perform_create(self, serializer):
+        pending = self.get_queryset().count()
+        if pending >= settings.ATTACHMENT_UPLOAD_MAX_PENDING:
+            raise ValidationError("Too many unfinished uploads")
+        serializer.save(uploaded_by=self.request.user)
+
+    def perform_destroy(self, instance: AttachmentUpload):
+        instance.discard()
+
+    @extend_schema(
+        description="Append a chunk to an upload. The body is the raw chunk.",
+        request={"application/offset+octet-stream": bytes},
+        parameters=[
+            OpenApiParameter(
+                "Upload-Offset",
+                int,
+                OpenApiParameter.HEADER,
+                required=True,
+                description="Offset the chunk starts at; must equal the current offset",
+            )
+        ],
+        responses={200: AttachmentUploadSerializer},
+    )
+    def partial_update(self, request, *args, **kwargs):
+        try:
+            offset = int(request.headers["Upload-Offset"])
+            length = int(request.headers["Content-Length"])
+        except (KeyError, ValueError):
+            raise ValidationError("Upload-Offset and Content-Length headers are required")
+        if length <= 0:
+            raise ValidationError("Empty chunk")
+        if length > settings.ATTACHMENT_UPLOAD_MAX_CHUNK_SIZE:
+            raise ValidationError(
+                f"Chunk is larger than {settings.ATTACHMENT_UPLOAD_MAX_CHUNK_SIZE} bytes"
+            )
+
+        with transaction.atomic():
+            upload = self.get_queryset().select_for_update().get(pk=self.get_object().pk)
+            if offset != upload.offset:
+                return Response(
+                    AttachmentUploadSerializer(upload).data,
+                    status=status.HTTP_409_CONFLICT,
+                    headers={"Upload-Offset": str(upload.offset)},
+                )
+            if offset + length > upload.size:
+                raise ValidationError("Chunk exceeds the declared upload size")
+
+            name = upload.part_name(upload.parts_count)
+            if default_storage.exists(name):
+                # Leftover of an interrupted attempt at this chunk
+                default_storage.delete(name)
+            chunk = File(request.stream, name=name)
+            chunk.size = length
+            name = default_storage.save(name, chunk)
+            if default_storage.size(name) != length:
+                default_storage.delete(name)
+                raise ValidationError("Chunk body does not match Content-Length")
+
+            upload.offset += length
+            upload.parts_count += 1
+            upload.save(update_fields=["offset", "parts_count", "updated_at"])
+
+        return Response(
+            AttachmentUploadSerializer(upload).data,
+            headers={"Upload-Offset": str(upload.offset)},
+        )
+
+
+class AttachmentFileAPIViewSet(viewsets.GenericViewSet):
+    """
+    Authorized downloads of attachment files.
+
+    Access is checked here; behind nginx (``USE_NGINX``) the bytes are then
+    served by nginx through ``X-Accel-Redirect`` so they never pass through
+    Python. Requests are authenticated as usual or with the signed ``token``
+    query parameter put into ``file_url``/``thumbnail_url`` by the serializers.
+    """
+
+    queryset = Attachment.objects.all()
+    permission_classes = [AllowAny]
+
+    def get_download_user(self, attachment):
+        token = self.request.query_params.get("token")
+        if not token:
+            return self.request.user
+        user_id = read_download_token(token, attachment.pk)
+        if user_id is None:
+            raise PermissionDenied("Invalid or expired download link")
+        if self.request.user.is_authenticated and self.request.user.pk == user_id:
+            return self.request.user
+        return get_user_model().objects.filter(pk=user_id, is_active=True).first()
+
+    def serve(self, attachment, file, filename, content_type):
+        if not file:
+            raise Http404
+        user = self.get_download_user(attachment)
+        if not can_access_attachment(user, attachment):
+            if not user or not user.is_authenticated:
+                raise NotAuthenticated()
+            raise PermissionDenied()
+
+        if settings.USE_NGINX:
+            response = HttpResponse(content_type=content_type)
+            response["X-Accel-Redirect"] = settings.PROTECTED_MEDIA_INTERNAL_URL + quote(file.name)
+            response["Content-Disposition"] = content_disposition_header(False, filename)
+        else:
+            response = FileResponse(default_storage.open(file.name), filename=filename)
+        response["Cache-Control"] = (
+            "public, max-age=86400" if attachment.is_public else "private, max-age=3600"
+        )
+        return response
+
+    @extend_schema(
+        description="Download the attachment file.",
+        parameters=[OpenApiParameter("token", str, description="Signed download token")],
+        responses={(200, "application/octet-stream"): bytes},
+    )
+    @action(detail=True, methods=["get"])
+    def download(self, request, pk=None):
+        attachment = self.get_object()
+        return self.serve(
+            attachment,
+            attachment.file,
+            attachment.original_filename,
+            attachment.mime_type or "application/octet-stream",
+        )
+
+    @extend_schema(
+        description="Download the attachment thumbnail.",
+        parameters=[OpenApiParameter("token", str, description="Signed download token")],
+        responses={(200, "image/webp"): bytes},
+    )
+    @action(detail=True, methods=["get"])
+    def thumbnail(self, request, pk=None):
+        attachment = self.get_object()
+        return self.serve(attachment, attachment.thumbnail, f"{attachment.pk}.webp", "image/webp")
@@ -0,0 +1,229 @@
+"""
+Orphaned media file detection and cleanup.
+
+Both sides of the comparison are produced as sorted streams, so the set of
+orphaned files is computed with a single merge pass in constant memory:
+
+* referenced paths come from every FileField/ImageField in the project,
+  read with ``.iterator()`` and ordered with a binary collation;
+* stored paths come from a depth-first ``os.scandir`` walk whose entries are
+  sorted the same way the full relative paths compare.
+
+Progress is checkpointed after every delete batch so an interrupted run can
+resume where it stopped.
+"""
+
+import heapq
+import json
+import logging
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Iterator, List, Optional, Tuple
+
+from django.apps import apps
+from django.core.files.storage import FileSystemStorage, default_storage
+from django.db import connection, models
+from django.db.models.functions import Collate
+
+logger = logging.getLogger(__name__)
+
+# Managed by AttachmentUpload / cleanup_stale_uploads, not by file fields
+EXCLUDED_PREFIXES = ("uploads/",)
+
+# Save a checkpoint at least this often, even when nothing is orphaned
+CHECKPOINT_INTERVAL = 10000
+
+
+@dataclass
+class CleanupStats:
+    scanned: int = 0
+    orphaned: int = 0
+    orphaned_bytes: int = 0
+    deleted: int = 0
+    skipped_recent: int = 0
+    errors: List[str] = field(default_factory=list)
+
+
+def get_file_fields() -> List[Tuple[type, str]]:
+    """All (model, field name) pairs that store files in default storage."""
+    result = []
+    for model in apps.get_models():
+        if model._meta.proxy or not model._meta.managed:
+            continue
+        for model_field in model._meta.concrete_fields:
+            if isinstance(model_field, models.FileField):
+                result.append((model, model_field.name))
+    return result
+
+
+def _binary_collation() -> Optional[str]:
+    # Byte order of UTF-8 equals code point order, i.e. Python string order.
+    return {"postgresql": "C", "sqlite": "BINARY"}.get(connection.vendor)
+
+
+def iter_field_paths(model, field_name: str, after: Optional[str] = None) -> Iterator[str]:
+    """
+    Stream the stored paths of one file field in ascending order.
+
+    Args:
+        model: Model class
+        field_name (str): FileField name
+        after (str): Only yield paths greater than this one
+
+    Returns:
+        Iterator[str]: Sorted, non-empty file paths
+    """
+    collation = _binary_collation()
+    path = Collate(models.F(field_name), collation) if collation else models.F(field_name)
+    queryset = (
+        model._base_manager.annotate(_path=path)
+        .exclude(**{field_name: ""})
+        .exclude(**{f"{field_name}__isnull": True})
+    )
+    if after is not None:
+        queryset = queryset.filter(_path__gt=after)
+    yield from queryset.order_by("_path").values_list("_path", flat=True).iterator(
+        chunk_size=2000
+    )
+
+
+def iter_referenced_paths(after: Optional[str] = None) -> Iterator[str]:
+    """Merge every file field's sorted stream into one sorted, de-duplicated stream."""
+    previous = None
+    streams = [iter_field_paths(model, name, after) for model, name in get_file_fields()]
+    for path in heapq.merge(*streams):
+        if path != previous:
+            yield path
+            previous = path
+
+
+def iter_stored_files(root: str, after: Optional[str] = None, prefix: str = ""):
+    """
+    Walk ``root`` depth-first, yielding ``(relative path, DirEntry)`` in ascending
+    path order.
+
+    Directories sort as ``name + "/"`` so the walk order matches plain string
+    comparison of the full relative paths (e.g. ``a-1`` before ``a/x``).
+    Subtrees entirely before ``after`` are skipped without being read.
+    """
+    with os.scandir(root) as it:
+        entries = sorted(
+            it, key=lambda e: e.name + "/" if e.is_dir(follow_symlinks=False) else e.name
+        )
+    for entry in entries:
+        rel_path = prefix + entry.name
+        if entry.is_dir(follow_symlinks=False):
+            dir_prefix = rel_path + "/"
+            if after is not None and dir_prefix < after and not after.startswith(dir_prefix):
+                continue
+            yield from iter_stored_files(entry.path, after, dir_prefix)
+        elif entry.is_file(follow_symlinks=False):
+            if after is not None and rel_path <= after:
+                continue
+            yield rel_path, entry
+
+
+class OrphanedFileCleaner:
+    """Find and delete files in default storage that no model references."""
+
+    def __init__(
+        self,
+        dry_run: bool = False,
+        grace_period: float = 24 * 3600,
+        workers: int = 8,
+        batch_size: int = 500,
+        checkpoint_file: Optional[str] = None,
+        on_orphan=None,
+    ):
+        if not isinstance(default_storage, FileSystemStorage):
+            raise ValueError("Orphaned file cleanup requires FileSystemStorage")
+        self.root = default_storage.location
+        self.dry_run = dry_run
+        self.grace_period = grace_period
+        self.workers = workers
+        self.batch_size = batch_size
+        self.checkpoint_file = checkpoint_file
+        self.on_orphan = on_orphan
+        self.stats = CleanupStats()
+
+    def load_checkpoint(self) -> Optional[str]:
+        if not self.checkpoint_file or not os.path.exists(self.checkpoint_file):
+            return None
+        with open(self.checkpoint_file) as fh:
+            return json.load(fh).get("last_path")
+
+    def save_checkpoint(self, last_path: str) -> None:
+        if not self.checkpoint_file or self.dry_run:
+            return
+        tmp_path = f"{self.checkpoint_file}.tmp"
+        with open(tmp_path, "w") as fh:
+            json.dump({"last_path": last_path, "saved_at": time.time()}, fh)
+        os.replace(tmp_path, self.checkpoint_file)
+
+    def clear_checkpoint(self) -> None:
+        if self.checkpoint_file and not self.dry_run and os.path.exists(self.checkpoint_file):
+            os.remove(self.checkpoint_file)
+
+    def run(self, resume: bool = False) -> CleanupStats:
+        after = self.load_checkpoint() if resume else None
+        if after:
+            logger.info(f"Resuming orphaned file cleanup after {after}")
+        cutoff = time.time() - self.grace_period
+
+        referenced = iter_referenced_paths(after)
+        next_ref = next(referenced, None)
+        batch = []
+        last_path = after
+
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            for rel_path, entry in iter_stored_files(self.root, after):
+                if self.stats.scanned and self.stats.scanned % CHECKPOINT_INTERVAL == 0:
+                    self._flush(executor, batch, last_path)
+                    batch = []
+                self.stats.scanned += 1
+                last_path = rel_path
+
+                while next_ref is not None and next_ref < rel_path:
+                    next_ref = next(referenced, None)
+                if next_ref == rel_path or rel_path.startswith(EXCLUDED_PREFIXES):
+                    continue
+
+                stat = entry.stat(follow_symlinks=False)
+                if stat.st_mtime > cutoff:
+                    self.stats.skipped_recent += 1
+                    continue
+
+                self.stats.orphaned += 1
+                self.stats.orphaned_bytes += stat.st_size
+                if self.on_orphan:
+                    self.on_orphan(rel_path, stat.st_size)
+                batch.append(rel_path)
+                if len(batch) >= self.batch_size:
+                    self._flush(executor, batch, last_path)
+                    batch = []
+
+            self._flush(executor, batch, last_path)
+
+        self.clear_checkpoint()
+        return self.stats
+
+    def _flush(self, executor, batch: List[str], last_path: Optional[str]) -> None:
+        if batch and not self.dry_run:
+            for path, error in zip(batch, executor.map(self._delete, batch)):
+                if error:
+                    self.stats.errors.append(f"{path}: {error}")
+                else:
+                    self.stats.deleted += 1
+        if last_path:
+            self.save_checkpoint(last_path)
+
+    @staticmethod
+    def _delete(path: str) -> Optional[str]:
+        try:
+            default_storage.delete(path)
+        except Exception as e:
+            logger.warning(f"Failed to delete orphaned file {path}: {e}")
+            return str(e)
+        return None
@@ -1,12 +1,8 @@
-import os
 import logging
-from django.core.management.base import BaseCommand
-from django.core.files.storage import default_storage
-from django.contrib.contenttypes.models import ContentType
-from django.db.models import Q
 
-from job_portal.apps.attachments.models import Attachment
-from job_portal.apps.users.models import PortfolioItem, Certificate
+from django.core.management.base import BaseCommand, CommandError
+
+from job_portal.apps.attachments.cleanup import OrphanedFileCleaner
 
 logger = logging.getLogger(__name__)
 
@@ -25,94 +21,82 @@ class Command(BaseCommand):
             action='store_true',
             help='Show detailed output',
         )
+        parser.add_argument(
+            '--grace-hours',
+            type=float,
+            default=24,
+            help='Keep unreferenced files younger than this (in-flight uploads). Default: 24',
+        )
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=8,
+            help='Number of threads deleting files in parallel. Default: 8',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=500,
+            help='Orphaned files deleted per batch between checkpoints. Default: 500',
+        )
+        parser.add_argument(
+            '--checkpoint-file',
+            type=str,
+            default='.cleanup_orphaned_files.json',
+            help='Where progress is saved for --resume',
+        )
+        parser.add_argument(
+            '--resume',
+            action='store_true',
+            help='Continue after the path saved in the checkpoint file',
+        )
 
     def handle(self, *args, **options):
         dry_run = options['dry_run']
         verbose = options['verbose']
-        
+
+        def report_orphan(path, size):
+            if verbose:
+                action = 'Would delete' if dry_run else 'Deleting'
+                self.stdout.write(f"  - {action}: {path} ({size} bytes)")
+
+        try:
+            cleaner = OrphanedFileCleaner(
+                dry_run=dry_run,
+                grace_period=options['grace_hours'] * 3600,
+                workers=options['workers'],
+                batch_size=options['batch_size'],
+                checkpoint_file=options['checkpoint_file'],
+                on_orphan=report_orphan,
+            )
+        except ValueError as e:
+            raise CommandError(str(e))
+
         self.stdout.write("Starting orphaned file cleanup...")
-        
-        # Get all file paths from database
-        db_file_paths = set()
-        
-        # Attachment files
-        attachment_files = Attachment.objects.values_list('file', flat=True).exclude(file='')
-        db_file_paths.update(attachment_files)
-        
-        # Portfolio images
-        portfolio_images = PortfolioItem.objects.values_list('image', flat=True).exclude(image='')
-        db_file_paths.update(portfolio_images)
-        
-        # Certificate files
-        certificate_files = Certificate.objects.values_list('certificate_file', flat=True).exclude(certificate_file='')
-        db_file_paths.update(certificate_files)
-        
-        # Remove empty strings and None values
-        db_file_paths = {path for path in db_file_paths if path}
-        
+        stats = cleaner.run(resume=options['resume'])
+
         if verbose:
-            self.stdout.write(f"Found {len(db_file_paths)} files in database")
-        
-        # Get all files in storage
-        try:
-            storage_files = set()
-            for root, dirs, files in os.walk(default_storage.location):
-                for file in files:
-                    file_path = os.path.join(root, file)
-                    # Convert to relative path
-                    rel_path = os.path.relpath(file_path, default_storage.location)
-                    storage_files.add(rel_path)
-            
-            if verbose:
-                self.stdout.write(f"Found {len(storage_files)} files in storage")
-            
-            # Find orphaned files
-            orphaned_files = storage_files - db_file_paths
-            
-            if not orphaned_files:
-                self.stdout.write(self.style.SUCCESS("No orphaned files found!"))
-                return
-            
-            self.stdout.write(f"Found {len(orphaned_files)} orphaned files:")
-            
-            total_size = 0
-            for file_path in orphaned_files:
-                try:
-                    full_path = os.path.join(default_storage.location, file_path)
-                    if os.path.exists(full_path):
-                        file_size = os.path.getsize(full_path)
-                        total_size += file_size
-                        
-                        if verbose:
-                            self.stdout.write(f"  - {file_path} ({file_size} bytes)")
-                        
-                        if not dry_run:
-                            default_storage.delete(file_path)
-                            self.stdout.write(f"    Deleted: {file_path}")
-                        else:
-                            self.stdout.write(f"    Would delete: {file_path}")
-                            
-                except Exception as e:
-                    self.stdout.write(
-                        self.style.ERROR(f"Error processing {file_path}: {e}")
-                    )
-            
-            if dry_run:
-                self.stdout.write(
-                    self.style.WARNING(
-                        f"DRY RUN: Would delete {len(orphaned_files)} files "
-                        f"totaling {total_size} bytes"
-                    )
-                )
-            else:
-                self.stdout.write(
-                    self.style.SUCCESS(
-                        f"Successfully deleted {len(orphaned_files)} orphaned files "
-                        f"totaling {total_size} bytes"
-                    )
+            self.stdout.write(f"Scanned {stats.scanned} files in storage")
+            self.stdout.write(
+                f"Skipped {stats.skipped_recent} unreferenced files within the grace period"
+            )
+
+        for error in stats.errors:
+            self.stdout.write(self.style.ERROR(f"Error deleting {error}"))
+
+        if not stats.orphaned:
+            self.stdout.write(self.style.SUCCESS("No orphaned files found!"))
+        elif dry_run:
+            self.stdout.write(
+                self.style.WARNING(
+                    f"DRY RUN: Would delete {stats.orphaned} files "
+                    f"totaling {stats.orphaned_bytes} bytes"
                 )
-                
-        except Exception as e:
+            )
+        else:
             self.stdout.write(
-                self.style.ERROR(f"Error during cleanup: {e}")
+                self.style.SUCCESS(
+                    f"Successfully deleted {stats.deleted} of {stats.orphaned} orphaned files "
+                    f"totaling {stats.orphaned_bytes} bytes"
+                )
             )
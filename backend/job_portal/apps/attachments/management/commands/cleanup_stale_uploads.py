@@ -0,0 +1,38 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from job_portal.apps.attachments.models import AttachmentUpload
+
+
+class Command(BaseCommand):
+    help = 'Delete chunked uploads that were abandoned before being attached'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--hours',
+            type=int,
+            default=24,
+            help='Delete uploads not touched for this many hours (default: 24)',
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Show what would be deleted without actually deleting',
+        )
+
+    def handle(self, *args, **options):
+        cutoff = timezone.now() - timedelta(hours=options['hours'])
+        stale = AttachmentUpload.objects.filter(updated_at__lt=cutoff)
+
+        count = 0
+        for upload in stale.iterator():
+            if options['dry_run']:
+                self.stdout.write(f'Would delete: {upload}')
+            else:
+                upload.discard()
+            count += 1
+
+        action = 'Would delete' if options['dry_run'] else 'Deleted'
+        self.stdout.write(self.style.SUCCESS(f'{action} {count} stale uploads'))
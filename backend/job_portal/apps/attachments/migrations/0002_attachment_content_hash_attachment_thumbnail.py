@@ -0,0 +1,23 @@
+# Generated by Django 5.0.2 on 2026-10-19 06:39
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('attachments', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='attachment',
+            name='content_hash',
+            field=models.CharField(blank=True, db_index=True, max_length=64, verbose_name='Content Hash'),
+        ),
+        migrations.AddField(
+            model_name='attachment',
+            name='thumbnail',
+            field=models.FileField(blank=True, max_length=255, upload_to='', verbose_name='Thumbnail'),
+        ),
+    ]
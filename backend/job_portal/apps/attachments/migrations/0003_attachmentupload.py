@@ -0,0 +1,35 @@
+# Generated by Django 5.0.2 on 2026-10-19 06:41
+
+import django.db.models.deletion
+import uuid
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('attachments', '0002_attachment_content_hash_attachment_thumbnail'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AttachmentUpload',
+            fields=[
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('filename', models.CharField(max_length=255, verbose_name='Filename')),
+                ('size', models.PositiveBigIntegerField(verbose_name='Total Size (bytes)')),
+                ('offset', models.PositiveBigIntegerField(default=0, verbose_name='Received (bytes)')),
+                ('parts_count', models.PositiveIntegerField(default=0, verbose_name='Parts')),
+                ('uploaded_by', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='attachment_uploads', to=settings.AUTH_USER_MODEL, verbose_name='Uploaded By')),
+            ],
+            options={
+                'verbose_name': 'Attachment Upload',
+                'verbose_name_plural': 'Attachment Uploads',
+                'ordering': ['-created_at'],
+            },
+        ),
+    ]
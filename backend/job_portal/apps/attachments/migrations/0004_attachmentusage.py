@@ -0,0 +1,72 @@
+# Generated by Django 5.0.2 on 2026-10-19 06:44
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+def backfill_usage(apps, schema_editor):
+    Attachment = apps.get_model('attachments', 'Attachment')
+    AttachmentUsage = apps.get_model('attachments', 'AttachmentUsage')
+    ContentType = apps.get_model('contenttypes', 'ContentType')
+
+    app_label, model_name = settings.AUTH_USER_MODEL.split('.')
+    user_content_type, _ = ContentType.objects.get_or_create(
+        app_label=app_label, model=model_name.lower()
+    )
+
+    usage = []
+    by_uploader = Attachment.objects.values('uploaded_by_id').annotate(
+        files=models.Count('id'), bytes=models.Sum('size')
+    )
+    for row in by_uploader.order_by():
+        usage.append(AttachmentUsage(
+            scope='uploader',
+            content_type_id=user_content_type.id,
+            object_id=row['uploaded_by_id'],
+            file_count=row['files'],
+            total_bytes=row['bytes'] or 0,
+        ))
+    by_object = Attachment.objects.values('content_type_id', 'object_id').annotate(
+        files=models.Count('id'), bytes=models.Sum('size')
+    )
+    for row in by_object.order_by():
+        usage.append(AttachmentUsage(
+            scope='object',
+            content_type_id=row['content_type_id'],
+            object_id=row['object_id'],
+            file_count=row['files'],
+            total_bytes=row['bytes'] or 0,
+        ))
+    AttachmentUsage.objects.bulk_create(usage, batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('attachments', '0003_attachmentupload'),
+        ('contenttypes', '0002_remove_content_type_name'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AttachmentUsage',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('scope', models.CharField(choices=[('uploader', 'Uploader'), ('object', 'Content Object')], max_length=20, verbose_name='Scope')),
+                ('object_id', models.PositiveIntegerField()),
+                ('file_count', models.PositiveIntegerField(default=0, verbose_name='Files')),
+                ('total_bytes', models.PositiveBigIntegerField(default=0, verbose_name='Total Size (bytes)')),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('content_type', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='contenttypes.contenttype')),
+            ],
+            options={
+                'verbose_name': 'Attachment Usage',
+                'verbose_name_plural': 'Attachment Usage',
+                'ordering': ['-total_bytes'],
+                'unique_together': {('scope', 'content_type', 'object_id')},
+            },
+        ),
+        migrations.RunPython(backfill_usage, migrations.RunPython.noop),
+    ]
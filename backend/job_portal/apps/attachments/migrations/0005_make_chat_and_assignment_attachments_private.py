@@ -0,0 +1,21 @@
+from django.db import migrations, models
+
+
+def make_private(apps, schema_editor):
+    Attachment = apps.get_model('attachments', 'Attachment')
+    Attachment.objects.filter(
+        models.Q(chat_messages__isnull=False) | models.Q(assignments__isnull=False)
+    ).update(is_public=False)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('attachments', '0004_attachmentusage'),
+        ('chats', '0001_initial'),
+        ('jobs', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.RunPython(make_private, migrations.RunPython.noop),
+    ]
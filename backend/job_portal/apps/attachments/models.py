@@ -1,3 +1,4 @@
+import hashlib
 import logging
 import mimetypes
 import os
@@ -6,15 +7,24 @@ import uuid
 from django.contrib.auth import get_user_model
 from django.contrib.contenttypes.fields import GenericForeignKey
 from django.contrib.contenttypes.models import ContentType
+from django.core.files.base import File
 from django.core.files.storage import default_storage
-from django.db import models
+from django.conf import settings
+from django.db import models, transaction
+from django.db.models.functions import Greatest
 from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
+from django_q.tasks import async_task
+from rest_framework.exceptions import ValidationError
 
 from utils.abstract_models import AbstractTimestampedModel
+from utils.helpers import format_file_size
 
+logger = logging.getLogger(__name__)
 UserModel = get_user_model()
 
+HASH_CHUNK_SIZE = 64 * 1024
+
 
 def generic_attachment_storage_upload_to(instance, filename):
     """Generate upload path for generic attachments."""
@@ -31,6 +41,70 @@ def generic_attachment_storage_upload_to(instance, filename):
     return f"attachments/{content_type}/{object_id}/{updated_filename}"
 
 
+def detect_file_type(filename):
+    """
+    Derive MIME type and attachment file type from a file name.
+
+    Args:
+        filename (str): Original or stored file name
+
+    Returns:
+        tuple: (mime_type, file_type); mime_type is "" when unknown
+    """
+    mime_type, _ = mimetypes.guess_type(filename)
+    if mime_type:
+        if mime_type.startswith("image/"):
+            file_type = "image"
+        elif mime_type.startswith("video/"):
+            file_type = "video"
+        elif mime_type.startswith("audio/"):
+            file_type = "audio"
+        elif mime_type in ["application/pdf"]:
+            file_type = "pdf"
+        elif mime_type in [
+            "application/msword",
+            "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+        ]:
+            file_type = "document"
+        elif mime_type in [
+            "application/vnd.ms-excel",
+            "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+        ]:
+            file_type = "spreadsheet"
+        else:
+            file_type = "file"
+        return mime_type, file_type
+
+    # Fallback to file extension
+    ext = os.path.splitext(filename)[1].lower()
+    if ext in [".jpg", ".jpeg", ".png", ".gif", ".webp", ".svg"]:
+        file_type = "image"
+    elif ext in [".mp4", ".avi", ".mov", ".wmv", ".flv"]:
+        file_type = "video"
+    elif ext in [".mp3", ".wav", ".flac", ".aac"]:
+        file_type = "audio"
+    elif ext in [".pdf"]:
+        file_type = "pdf"
+    elif ext in [".doc", ".docx"]:
+        file_type = "document"
+    elif ext in [".xls", ".xlsx"]:
+        file_type = "spreadsheet"
+    else:
+        file_type = "file"
+    return "", file_type
+
+
+def attachment_blob_path(content_hash, filename):
+    """Content-addressed storage path shared by all copies of the same file."""
+    ext = os.path.splitext(filename)[1].lower()
+    return f"attachments/blobs/{content_hash[:2]}/{content_hash[2:4]}/{content_hash}{ext}"
+
+
+def attachment_thumbnail_path(content_hash):
+    """Storage path of the WebP thumbnail generated for a blob."""
+    return f"attachments/thumbnails/{content_hash[:2]}/{content_hash}.webp"
+
+
 class Attachment(AbstractTimestampedModel):
     """Generic attachment model that can be linked to any model using ContentType."""
 
@@ -45,6 +119,10 @@ class Attachment(AbstractTimestampedModel):
     size = models.PositiveIntegerField(_("File Size (bytes)"))
     file_type = models.CharField(_("File Type"), max_length=100, blank=True)
     mime_type = models.CharField(_("MIME Type"), max_length=100, blank=True)
+    content_hash = models.CharField(
+        _("Content Hash"), max_length=64, blank=True, db_index=True
+    )
+    thumbnail = models.FileField(_("Thumbnail"), max_length=255, blank=True)
 
     # Upload information
     uploaded_by = models.ForeignKey(
@@ -79,96 +157,276 @@ class Attachment(AbstractTimestampedModel):
             except (OSError, AttributeError):
                 self.size = 0
 
-        if self.file and not self.mime_type:
-            # Get MIME type from file extension
-            mime_type, _ = mimetypes.guess_type(
+        if self.file and not (self.mime_type and self.file_type):
+            mime_type, file_type = detect_file_type(
                 self.original_filename or self.file.name
             )
-            if mime_type:
-                self.mime_type = mime_type
-
-        if self.file and not self.file_type:
-            # Determine file type based on MIME type or extension
-            if self.mime_type:
-                if self.mime_type.startswith("image/"):
-                    self.file_type = "image"
-                elif self.mime_type.startswith("video/"):
-                    self.file_type = "video"
-                elif self.mime_type.startswith("audio/"):
-                    self.file_type = "audio"
-                elif self.mime_type in ["application/pdf"]:
-                    self.file_type = "pdf"
-                elif self.mime_type in [
-                    "application/msword",
-                    "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
-                ]:
-                    self.file_type = "document"
-                elif self.mime_type in [
-                    "application/vnd.ms-excel",
-                    "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-                ]:
-                    self.file_type = "spreadsheet"
-                else:
-                    self.file_type = "file"
-            else:
-                # Fallback to file extension
-                ext = os.path.splitext(self.original_filename or self.file.name)[
-                    1
-                ].lower()
-                if ext in [".jpg", ".jpeg", ".png", ".gif", ".webp", ".svg"]:
-                    self.file_type = "image"
-                elif ext in [".mp4", ".avi", ".mov", ".wmv", ".flv"]:
-                    self.file_type = "video"
-                elif ext in [".mp3", ".wav", ".flac", ".aac"]:
-                    self.file_type = "audio"
-                elif ext in [".pdf"]:
-                    self.file_type = "pdf"
-                elif ext in [".doc", ".docx"]:
-                    self.file_type = "document"
-                elif ext in [".xls", ".xlsx"]:
-                    self.file_type = "spreadsheet"
-                else:
-                    self.file_type = "file"
+            self.mime_type = self.mime_type or mime_type
+            self.file_type = self.file_type or file_type
 
         super().save(*args, **kwargs)
 
-    def delete(self, *args, **kwargs):
-        """Override delete to clean up files from storage."""
-        # Store file path before deletion
-        file_path = self.file.path if self.file else None
+    def __str__(self):
+        return f"Attachment: {self.original_filename} for {self.content_type.model} #{self.object_id} [#{self.id}]"
+
+
+class AttachmentUpload(AbstractTimestampedModel):
+    """
+    Resumable chunked upload.
+
+    Each chunk is written to storage as a separate part as soon as it
+    arrives; the parts are assembled into an Attachment when the upload is
+    referenced by one of the attachment endpoints.
+    """
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    uploaded_by = models.ForeignKey(
+        UserModel,
+        on_delete=models.CASCADE,
+        related_name="attachment_uploads",
+        verbose_name=_("Uploaded By"),
+    )
+    filename = models.CharField(_("Filename"), max_length=255)
+    size = models.PositiveBigIntegerField(_("Total Size (bytes)"))
+    offset = models.PositiveBigIntegerField(_("Received (bytes)"), default=0)
+    parts_count = models.PositiveIntegerField(_("Parts"), default=0)
+
+    class Meta:
+        verbose_name = _("Attachment Upload")
+        verbose_name_plural = _("Attachment Uploads")
+        ordering = ["-created_at"]
 
-        # Call parent delete method
-        super().delete(*args, **kwargs)
+    @property
+    def is_complete(self):
+        return self.offset == self.size
 
-        # Clean up file from storage
-        if file_path and default_storage.exists(file_path):
+    def part_name(self, index):
+        return f"uploads/{self.id}/{index:06d}.part"
+
+    def as_file(self):
+        return AssembledUpload(self)
+
+    def discard(self):
+        """Delete the stored parts and the upload record."""
+        for index in range(self.parts_count + 1):
+            name = self.part_name(index)
             try:
-                default_storage.delete(file_path)
+                if default_storage.exists(name):
+                    default_storage.delete(name)
             except Exception as e:
-                logger = logging.getLogger(__name__)
-                logger.warning(f"Failed to delete file {file_path}: {e}")
+                logger.warning(f"Failed to delete upload part {name}: {e}")
+        self.delete()
 
     def __str__(self):
-        return f"Attachment: {self.original_filename} for {self.content_type.model} #{self.object_id} [#{self.id}]"
+        return f"Upload: {self.filename} ({self.offset}/{self.size}) [#{self.id}]"
+
+
+class AssembledUpload(File):
+    """Read-only file streaming the parts of a completed AttachmentUpload in order."""
+
+    def __init__(self, upload):
+        super().__init__(None, name=upload.filename)
+        self.upload = upload
+        self.size = upload.size
+
+    def chunks(self, chunk_size=None):
+        chunk_size = chunk_size or self.DEFAULT_CHUNK_SIZE
+        for index in range(self.upload.parts_count):
+            with default_storage.open(self.upload.part_name(index), "rb") as part:
+                while True:
+                    data = part.read(chunk_size)
+                    if not data:
+                        break
+                    yield data
+
+    def multiple_chunks(self, chunk_size=None):
+        return True
+
+    def open(self, mode=None):
+        return self
 
+    def close(self):
+        pass
 
-def create_attachments(files, user, instance):
+
+class AttachmentQuotaExceeded(ValidationError):
+    """Raised when an upload would exceed the uploader's or object's storage quota."""
+
+
+class UsageScope(models.TextChoices):
+    UPLOADER = "uploader", _("Uploader")
+    OBJECT = "object", _("Content Object")
+
+
+class AttachmentUsageManager(models.Manager):
+    def _scope_keys(self, user_id, content_type, object_id):
+        return [
+            (UsageScope.UPLOADER, ContentType.objects.get_for_model(UserModel), user_id),
+            (UsageScope.OBJECT, content_type, object_id),
+        ]
+
+    def check_quota(self, user, content_type, object_id, files_count, total_bytes):
+        """
+        Reject an upload that would exceed ``settings.ATTACHMENT_QUOTAS``.
+
+        Reads the two maintained counter rows; never aggregates Attachment.
+        """
+        quotas = settings.ATTACHMENT_QUOTAS
+        keys = self._scope_keys(user.pk, content_type, object_id)
+        condition = models.Q()
+        for scope, scope_content_type, scope_object_id in keys:
+            condition |= models.Q(
+                scope=scope, content_type=scope_content_type, object_id=scope_object_id
+            )
+        current = {
+            usage.scope: usage
+            for usage in self.filter(condition).only("scope", "file_count", "total_bytes")
+        }
+
+        for scope in (UsageScope.UPLOADER, UsageScope.OBJECT):
+            quota = quotas.get(scope) or {}
+            usage = current.get(scope)
+            used_files = usage.file_count if usage else 0
+            used_bytes = usage.total_bytes if usage else 0
+            if quota.get("files") is not None and used_files + files_count > quota["files"]:
+                raise AttachmentQuotaExceeded(
+                    f"Attachment limit reached: at most {quota['files']} files allowed "
+                    f"per {UsageScope(scope).label.lower()}."
+                )
+            if quota.get("bytes") is not None and used_bytes + total_bytes > quota["bytes"]:
+                raise AttachmentQuotaExceeded(
+                    f"Storage limit reached: {format_file_size(used_bytes)} of "
+                    f"{format_file_size(quota['bytes'])} used "
+                    f"per {UsageScope(scope).label.lower()}."
+                )
+
+    def record(self, user_id, content_type, object_id, files_delta, bytes_delta):
+        """Apply a file/byte delta to the uploader's and the content object's counters."""
+        for scope, scope_content_type, scope_object_id in self._scope_keys(
+            user_id, content_type, object_id
+        ):
+            usage, created = self.get_or_create(
+                scope=scope, content_type=scope_content_type, object_id=scope_object_id
+            )
+            self.filter(pk=usage.pk).update(
+                file_count=Greatest(models.F("file_count") + files_delta, 0),
+                total_bytes=Greatest(models.F("total_bytes") + bytes_delta, 0),
+                updated_at=timezone.now(),
+            )
+
+
+class AttachmentUsage(models.Model):
+    """Maintained attachment file and byte counters per uploader and per content object."""
+
+    scope = models.CharField(_("Scope"), max_length=20, choices=UsageScope.choices)
+    content_type = models.ForeignKey(ContentType, on_delete=models.CASCADE)
+    object_id = models.PositiveIntegerField()
+    owner = GenericForeignKey("content_type", "object_id")
+    file_count = models.PositiveIntegerField(_("Files"), default=0)
+    total_bytes = models.PositiveBigIntegerField(_("Total Size (bytes)"), default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    objects = AttachmentUsageManager()
+
+    class Meta:
+        verbose_name = _("Attachment Usage")
+        verbose_name_plural = _("Attachment Usage")
+        ordering = ["-total_bytes"]
+        unique_together = [("scope", "content_type", "object_id")]
+
+    def __str__(self):
+        return f"{self.get_scope_display()} {self.content_type.model} #{self.object_id}: {self.file_count} files, {self.total_bytes} bytes"
+
+
+def hash_file(file):
+    """Compute the SHA-256 of an uploaded file, reading it in chunks."""
+    digest = hashlib.sha256()
+    for chunk in file.chunks(HASH_CHUNK_SIZE):
+        digest.update(chunk)
+    return digest.hexdigest()
+
+
+def create_attachments(files, user, instance, is_public=True):
     """
     Create one or multiple attachments linked to a generic instance.
 
+    Files are hashed while streaming and stored once per content hash; rows
+    pointing at an already stored file reuse it. All rows are inserted with a
+    single bulk_create and image thumbnails are generated by a django-q task
+    after commit.
+
     :param files: list or QueryDict of uploaded files
     :param user: request.user (uploader)
     :param instance: model instance (Job, JobAssignment, Dispute, etc.)
+    :param is_public: False for files only the instance's participants may
+        download (see attachments.access)
     :return: list of Attachment objects
     """
     content_type = ContentType.objects.get_for_model(instance.__class__)
+    files = list(files)
+    total_bytes = sum(file.size for file in files)
+    AttachmentUsage.objects.check_quota(
+        user, content_type, instance.id, len(files), total_bytes
+    )
+    hashes = [hash_file(file) for file in files]
+
+    stored = {}
+    for content_hash, file_name, thumbnail in (
+        Attachment.objects.filter(content_hash__in=set(hashes))
+        .order_by("id")
+        .values_list("content_hash", "file", "thumbnail")
+    ):
+        stored.setdefault(content_hash, (file_name, thumbnail))
+
     attachments = []
+    for file, content_hash in zip(files, hashes):
+        if content_hash not in stored:
+            name = attachment_blob_path(content_hash, file.name)
+            if not default_storage.exists(name):
+                saved_name = default_storage.save(name, file)
+                if saved_name != name:
+                    # A concurrent upload of the same content stored the blob
+                    # first; keep one file per hash so cleanup can find it.
+                    default_storage.delete(saved_name)
+            stored[content_hash] = (name, "")
+        file_name, thumbnail = stored[content_hash]
+
+        mime_type, file_type = detect_file_type(file.name)
+        attachments.append(
+            Attachment(
+                file=file_name,
+                thumbnail=thumbnail,
+                original_filename=os.path.basename(file.name),
+                size=file.size,
+                mime_type=mime_type,
+                file_type=file_type,
+                content_hash=content_hash,
+                uploaded_by=user,
+                content_type=content_type,
+                object_id=instance.id,
+                is_public=is_public,
+            )
+        )
+    Attachment.objects.bulk_create(attachments)
+    AttachmentUsage.objects.record(
+        user.pk, content_type, instance.id, len(attachments), total_bytes
+    )
+
+    # Chunked uploads now live on as attachment blobs; drop their parts.
     for file in files:
-        attachment = Attachment.objects.create(
-            file=file,
-            uploaded_by=user,
-            content_type=content_type,
-            object_id=instance.id
+        if isinstance(file, AssembledUpload):
+            transaction.on_commit(file.upload.discard)
+
+    pending_thumbnails = [
+        attachment.id
+        for attachment in attachments
+        if attachment.file_type == "image" and not attachment.thumbnail
+    ]
+    if pending_thumbnails:
+        transaction.on_commit(
+            lambda: async_task(
+                "job_portal.apps.attachments.tasks.generate_thumbnails",
+                pending_thumbnails,
+            )
         )
-        attachments.append(attachment)
     return attachments
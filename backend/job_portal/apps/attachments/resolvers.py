@@ -0,0 +1,139 @@
+"""
+Batched URL resolution for attachment files.
+
+One resolver lives on each request: the absolute base URL is computed once,
+URLs are memoized per file name, and storages that sign their URLs
+(S3-style ``querystring_auth``) have signed URLs cached with a timeout a
+little shorter than the signature lifetime, so each file is signed at most
+once per expiry window instead of once per serialized attachment.
+
+Non-public attachments resolve to the authorized download endpoint instead,
+with a download token signed for the requesting user.
+"""
+
+from typing import Dict, Iterable, Optional
+
+from django.core.cache import cache
+from django.core.files.storage import default_storage
+from django.urls import reverse
+
+from utils.cache_utils import cache_key_generator
+
+from .access import make_download_token
+
+SIGNED_URL_CACHE_PREFIX = "attachment_signed_url"
+
+# Fraction of the signature lifetime a cached signed URL may be served for
+SIGNED_URL_TTL_RATIO = 0.9
+
+
+class AttachmentURLResolver:
+    """Resolve storage file names to absolute URLs, in batches."""
+
+    def __init__(self, request=None, storage=None):
+        self.request = request
+        self.storage = storage or default_storage
+        self._base_url: Optional[str] = None
+        self._urls: Dict[str, str] = {}
+
+    @classmethod
+    def for_request(cls, request) -> "AttachmentURLResolver":
+        """Get the resolver shared by everything serialized for this request."""
+        if request is None:
+            return cls()
+        resolver = getattr(request, "_attachment_url_resolver", None)
+        if resolver is None:
+            resolver = cls(request)
+            request._attachment_url_resolver = resolver
+        return resolver
+
+    @property
+    def base_url(self) -> str:
+        if self._base_url is None:
+            self._base_url = (
+                self.request.build_absolute_uri("/").rstrip("/") if self.request else ""
+            )
+        return self._base_url
+
+    @property
+    def signed_url_ttl(self) -> int:
+        """Seconds a signed URL may be cached; 0 if the storage does not sign URLs."""
+        if not getattr(self.storage, "querystring_auth", False):
+            return 0
+        expire = getattr(self.storage, "querystring_expire", 3600)
+        return int(expire * SIGNED_URL_TTL_RATIO)
+
+    def _absolute(self, url: str) -> str:
+        if url.startswith("/"):
+            return self.base_url + url
+        return url
+
+    def prime(self, names: Iterable[str]) -> None:
+        """
+        Resolve many file names at once.
+
+        Args:
+            names: Storage file names; empty names are ignored
+        """
+        missing = {name for name in names if name and name not in self._urls}
+        if not missing:
+            return
+
+        ttl = self.signed_url_ttl
+        urls = {}
+        if ttl:
+            keys = {cache_key_generator(SIGNED_URL_CACHE_PREFIX, name): name for name in missing}
+            for key, url in cache.get_many(list(keys)).items():
+                urls[keys[key]] = url
+            signed = {
+                key: self.storage.url(name)
+                for key, name in keys.items()
+                if name not in urls
+            }
+            if signed:
+                cache.set_many(signed, ttl)
+                urls.update((keys[key], url) for key, url in signed.items())
+        else:
+            urls = {name: self.storage.url(name) for name in missing}
+
+        for name, url in urls.items():
+            self._urls[name] = self._absolute(url)
+
+    def url(self, name: str) -> Optional[str]:
+        """Absolute URL of a single stored file."""
+        if not name:
+            return None
+        if name not in self._urls:
+            self.prime([name])
+        return self._urls[name]
+
+    def protected_url(self, attachment, variant: str = "download", sign: bool = True) -> str:
+        """
+        URL of the authorized download endpoint for a non-public attachment.
+
+        Args:
+            attachment: Attachment instance
+            variant (str): ``download`` for the file, ``thumbnail`` for its thumbnail
+            sign (bool): Append a download token for the request user
+        """
+        url = self.base_url + reverse(
+            f"job_portal:attachments:attachment-files-{variant}", args=[attachment.pk]
+        )
+        user = getattr(self.request, "user", None)
+        if sign and user is not None and user.is_authenticated:
+            url += "?token=" + make_download_token(attachment.pk, user.pk)
+        return url
+
+    def prime_attachments(self, attachments: Iterable) -> None:
+        """Resolve file and thumbnail URLs of many Attachment instances at once."""
+        names = []
+        for attachment in attachments:
+            if not attachment.is_public:
+                continue
+            names.append(attachment.file.name)
+            names.append(attachment.thumbnail.name)
+        self.prime(names)
+
+
+def get_url_resolver(request) -> AttachmentURLResolver:
+    return AttachmentURLResolver.for_request(request)
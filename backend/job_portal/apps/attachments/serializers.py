@@ -1,15 +1,54 @@
+import os
+
+from django.conf import settings
 from django.contrib.auth import get_user_model
+from django.db import models
 from rest_framework import serializers
 
-from .models import Attachment
+from .models import Attachment, AttachmentUpload
+from .resolvers import get_url_resolver
 
 UserModel = get_user_model()
 
 
+class AttachmentListSerializer(serializers.ListSerializer):
+    """Resolves the URLs of the whole list in one batch before rendering it."""
+
+    def to_representation(self, data):
+        iterable = list(data.all() if isinstance(data, models.manager.BaseManager) else data)
+        get_url_resolver(self.context.get("request")).prime_attachments(iterable)
+        return super().to_representation(iterable)
+
+
+class PrimeAttachmentURLsListSerializer(serializers.ListSerializer):
+    """
+    List serializer for models with nested attachments.
+
+    Resolves the URLs of the attachments of every item in one batch, so
+    nested ``AttachmentSerializer(many=True)`` fields only do dict lookups.
+    Set ``attachment_fields`` on a subclass when the relation is not named
+    ``attachments``. Only prefetched relations are primed; the others are
+    left to the nested serializer rather than queried once more per item.
+    """
+
+    attachment_fields = ("attachments",)
+
+    def to_representation(self, data):
+        iterable = list(data.all() if isinstance(data, models.manager.BaseManager) else data)
+        attachments = []
+        for item in iterable:
+            prefetched = getattr(item, "_prefetched_objects_cache", {})
+            for field_name in self.attachment_fields:
+                attachments.extend(prefetched.get(field_name, ()))
+        get_url_resolver(self.context.get("request")).prime_attachments(attachments)
+        return super().to_representation(iterable)
+
+
 class AttachmentSerializer(serializers.ModelSerializer):
     """Generic serializer for attachments."""
 
     file_url = serializers.SerializerMethodField()
+    thumbnail_url = serializers.SerializerMethodField()
 
     class Meta:
         model = Attachment
@@ -17,6 +56,7 @@ class AttachmentSerializer(serializers.ModelSerializer):
             "id",
             "original_filename",
             "file_url",
+            "thumbnail_url",
             "size",
             "file_type",
             "mime_type",
@@ -26,9 +66,98 @@ class AttachmentSerializer(serializers.ModelSerializer):
             "created_at",
         ]
         read_only_fields = ["id", "created_at"]
+        list_serializer_class = AttachmentListSerializer
 
     def get_file_url(self, obj):
-        request = self.context.get("request")
-        if request and obj.file:
-            return request.build_absolute_uri(obj.file.url)
-        return obj.file.url if obj.file else None
+        if not obj.file:
+            return None
+        resolver = get_url_resolver(self.context.get("request"))
+        if not obj.is_public:
+            return resolver.protected_url(obj)
+        return resolver.url(obj.file.name)
+
+    def get_thumbnail_url(self, obj):
+        if not obj.thumbnail:
+            return None
+        resolver = get_url_resolver(self.context.get("request"))
+        if not obj.is_public:
+            return resolver.protected_url(obj, "thumbnail")
+        return resolver.url(obj.thumbnail.name)
+
+
+class AttachmentUploadSerializer(serializers.ModelSerializer):
+    """Serializer for starting and inspecting a chunked upload."""
+
+    is_complete = serializers.BooleanField(read_only=True)
+    chunk_size = serializers.SerializerMethodField()
+
+    class Meta:
+        model = AttachmentUpload
+        fields = [
+            "id",
+            "filename",
+            "size",
+            "offset",
+            "is_complete",
+            "chunk_size",
+            "created_at",
+        ]
+        read_only_fields = ["id", "offset", "created_at"]
+
+    def get_chunk_size(self, obj) -> int:
+        return settings.ATTACHMENT_UPLOAD_CHUNK_SIZE
+
+    def validate_filename(self, value):
+        value = os.path.basename(value)
+        if not value:
+            raise serializers.ValidationError("Filename is required")
+        return value
+
+    def validate_size(self, value):
+        if value <= 0:
+            raise serializers.ValidationError("Size must be positive")
+        if value > settings.ATTACHMENT_UPLOAD_MAX_SIZE:
+            raise serializers.ValidationError(
+                f"File is larger than {settings.ATTACHMENT_UPLOAD_MAX_SIZE} bytes"
+            )
+        return value
+
+
+class ChunkedUploadField(serializers.UUIDField):
+    """
+    Accepts the id of a completed chunked upload owned by the request user.
+
+    Returns the assembled file, so the usual file validators and
+    ``create_attachments`` work on it like on a multipart upload.
+    """
+
+    def to_internal_value(self, data):
+        upload_id = super().to_internal_value(data)
+        request = self.context["request"]
+        upload = AttachmentUpload.objects.filter(
+            id=upload_id, uploaded_by=request.user
+        ).first()
+        if upload is None:
+            raise serializers.ValidationError("Upload not found")
+        if not upload.is_complete:
+            raise serializers.ValidationError(
+                f"Upload is incomplete ({upload.offset}/{upload.size} bytes)"
+            )
+        return upload.as_file()
+
+
+def merge_chunked_uploads(attrs, files_field, uploads_field):
+    """
+    Move files assembled from chunked uploads into the uploaded files list.
+
+    Args:
+        attrs (dict): Validated serializer data
+        files_field (str): Name of the multipart files field
+        uploads_field (str): Name of the ``ChunkedUploadField`` list field
+
+    Returns:
+        list: All files to attach
+    """
+    files = list(attrs.get(files_field) or []) + list(attrs.pop(uploads_field, None) or [])
+    attrs[files_field] = files
+    return files
@@ -1,20 +1,56 @@
 import logging
-from django.db.models.signals import post_delete
+from django.db.models.signals import post_delete, post_save
 from django.dispatch import receiver
 from django.core.files.storage import default_storage
+from django.contrib.contenttypes.models import ContentType
 
-from .models import Attachment
+from .access import invalidate_user_chat_rooms
+from .models import Attachment, AttachmentUsage
 
 logger = logging.getLogger(__name__)
 
 
+def _is_shared(instance):
+    """Check whether another attachment still points at the same stored file."""
+    if instance.content_hash:
+        return Attachment.objects.filter(content_hash=instance.content_hash).exists()
+    return Attachment.objects.filter(file=instance.file.name).exists()
+
+
+@receiver(post_delete, sender=Attachment)
+def update_attachment_usage(sender, instance, **kwargs):
+    """Release the deleted attachment's files and bytes from the usage counters."""
+    AttachmentUsage.objects.record(
+        instance.uploaded_by_id,
+        ContentType.objects.get_for_id(instance.content_type_id),
+        instance.object_id,
+        -1,
+        -instance.size,
+    )
+
+
 @receiver(post_delete, sender=Attachment)
 def cleanup_attachment_file(sender, instance, **kwargs):
-    """Clean up attachment file when Attachment instance is deleted."""
-    if instance.file:
+    """Clean up attachment file when the last Attachment using it is deleted."""
+    if not instance.file or _is_shared(instance):
+        return
+    for file in (instance.file, instance.thumbnail):
+        if not file:
+            continue
         try:
-            if default_storage.exists(instance.file.name):
-                default_storage.delete(instance.file.name)
-                logger.info(f"Successfully deleted attachment file: {instance.file.name}")
+            if default_storage.exists(file.name):
+                default_storage.delete(file.name)
+                logger.info(f"Successfully deleted attachment file: {file.name}")
         except Exception as e:
-            logger.warning(f"Failed to delete attachment file {instance.file.name}: {e}")
+            logger.warning(f"Failed to delete attachment file {file.name}: {e}")
+
+
+@receiver(post_save, sender="chats.ChatParticipant")
+def invalidate_chat_membership_on_join(sender, instance, created, **kwargs):
+    if created:
+        invalidate_user_chat_rooms(instance.user_id)
+
+
+@receiver(post_delete, sender="chats.ChatParticipant")
+def invalidate_chat_membership_on_leave(sender, instance, **kwargs):
+    invalidate_user_chat_rooms(instance.user_id)
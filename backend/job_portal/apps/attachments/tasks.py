@@ -0,0 +1,71 @@
+import logging
+from io import BytesIO
+
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from PIL import Image, ImageOps
+
+from .models import Attachment, attachment_thumbnail_path
+
+logger = logging.getLogger(__name__)
+
+THUMBNAIL_SIZE = (480, 480)
+THUMBNAIL_QUALITY = 80
+
+
+def render_thumbnail(file_name):
+    """
+    Render a WebP thumbnail for a stored image.
+
+    Args:
+        file_name (str): Storage name of the source image
+
+    Returns:
+        bytes: Encoded WebP image
+    """
+    with default_storage.open(file_name, "rb") as source:
+        image = Image.open(source)
+        image.draft("RGB", THUMBNAIL_SIZE)
+        image = ImageOps.exif_transpose(image)
+        image.thumbnail(THUMBNAIL_SIZE)
+        if image.mode not in ("RGB", "RGBA"):
+            image = image.convert("RGBA" if "A" in image.getbands() else "RGB")
+        output = BytesIO()
+        image.save(output, "WEBP", quality=THUMBNAIL_QUALITY, method=4)
+    return output.getvalue()
+
+
+def generate_thumbnails(attachment_ids):
+    """
+    django-q task: create WebP thumbnails for image attachments.
+
+    Thumbnails are stored once per content hash and assigned to every
+    attachment sharing that hash.
+    """
+    attachments = (
+        Attachment.objects.filter(id__in=attachment_ids, file_type="image", thumbnail="")
+        .exclude(content_hash="")
+        .only("id", "file", "content_hash")
+    )
+    done = set()
+    for attachment in attachments:
+        content_hash = attachment.content_hash
+        if content_hash in done:
+            continue
+        done.add(content_hash)
+
+        name = attachment_thumbnail_path(content_hash)
+        if not default_storage.exists(name):
+            try:
+                name = default_storage.save(
+                    name, ContentFile(render_thumbnail(attachment.file.name))
+                )
+            except (OSError, ValueError, Image.DecompressionBombError) as e:
+                logger.warning(
+                    f"Failed to generate thumbnail for attachment #{attachment.id}: {e}"
+                )
+                continue
+
+        Attachment.objects.filter(content_hash=content_hash, thumbnail="").update(
+            thumbnail=name
+        )
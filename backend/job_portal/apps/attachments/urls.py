@@ -0,0 +1,14 @@
+from django.urls import path, include
+from rest_framework.routers import DefaultRouter
+
+from .api.views import AttachmentFileAPIViewSet, AttachmentUploadAPIViewSet
+
+app_name = "attachments"
+
+router = DefaultRouter()
+router.register(r'api/v1/uploads', AttachmentUploadAPIViewSet, basename='uploads')
+router.register(r'api/v1/attachments', AttachmentFileAPIViewSet, basename='attachment-files')
+
+urlpatterns = [
+    path("", include(router.urls)),
+]
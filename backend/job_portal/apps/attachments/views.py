@@ -1,2 +1,22 @@
-# This app is for management commands and utilities
-# No views needed for file usage analysis
+from django.conf import settings
+from django.db.models import Q
+from django.http import Http404
+from django.views.static import serve
+
+from .models import Attachment
+
+# Attachment files under these prefixes may belong to non-public attachments
+PROTECTED_MEDIA_PREFIXES = ("attachments/blobs/", "attachments/thumbnails/")
+
+
+def serve_media(request, path, document_root=None, show_indexes=False):
+    """
+    Development media server that only serves attachment files of public attachments.
+
+    Non-public files are downloaded through AttachmentFileAPIViewSet instead.
+    """
+    if path.startswith(PROTECTED_MEDIA_PREFIXES) and not Attachment.objects.filter(
+        Q(file=path) | Q(thumbnail=path), is_public=True
+    ).exists():
+        raise Http404
+    return serve(request, path, document_root=document_root or settings.MEDIA_ROOT, show_indexes=show_indexes)
@@ -2,7 +2,12 @@ from django.contrib.auth import get_user_model
 from django.core.validators import FileExtensionValidator, get_available_image_extensions
 from rest_framework import serializers
 
-from job_portal.apps.attachments.serializers import AttachmentSerializer
+from job_portal.apps.attachments.serializers import (
+    AttachmentSerializer,
+    ChunkedUploadField,
+    PrimeAttachmentURLsListSerializer,
+    merge_chunked_uploads,
+)
 from job_portal.apps.users.api.serializers import (
     PublicMasterProfileSerializer,
     UserDetailChildSerializer,
@@ -151,6 +156,7 @@ class MessageSerializer(AbstractTimestampedModelSerializer):
             "created_at",
             "updated_at",
         ]
+        list_serializer_class = PrimeAttachmentURLsListSerializer
 
     def get_reply_to_sender(self, obj):
         if obj.reply_to:
@@ -204,6 +210,20 @@ class MessageCreateSerializer(serializers.ModelSerializer):
         required=False,
         allow_null=True,
     )
+    attachments_upload_ids = serializers.ListField(
+        child=ChunkedUploadField(
+            validators=[
+                FileExtensionValidator(
+                    allowed_extensions=get_available_image_extensions()
+                ),
+                validate_file_size,
+            ],
+        ),
+        allow_empty=False,
+        write_only=True,
+        required=False,
+        help_text="IDs of completed chunked uploads (api/v1/uploads/)",
+    )
 
     class Meta:
         model = ChatMessage
@@ -219,6 +239,7 @@ class MessageCreateSerializer(serializers.ModelSerializer):
             "updated_at",
             "attachments",
             "attachments_files",
+            "attachments_upload_ids",
         ]
         read_only_fields = [
             "id",
@@ -233,11 +254,13 @@ class MessageCreateSerializer(serializers.ModelSerializer):
     def validate(self, data):
         """Validate that attachments_files is required for image/file messages."""
         message_type = data.get('message_type')
-        attachments_files = data.get('attachments_files', [])
-        
-        # Handle both list and None cases
-        if attachments_files is None:
-            attachments_files = []
+        attachments_files = merge_chunked_uploads(
+            data, 'attachments_files', 'attachments_upload_ids'
+        )
+        if attachments_files:
+            validate_total_size(attachments_files)
+        else:
+            data['attachments_files'] = None
         
         if message_type in [MessageType.IMAGE, MessageType.FILE]:
             if not attachments_files:
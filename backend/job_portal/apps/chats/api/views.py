@@ -1,7 +1,5 @@
-from asgiref.sync import async_to_sync
-from channels.layers import get_channel_layer
 from django.contrib.auth import get_user_model
-from django.db import models
+from django.db import models, transaction
 from django_filters.rest_framework import DjangoFilterBackend
 from drf_spectacular.types import OpenApiTypes
 from drf_spectacular.utils import OpenApiParameter, extend_schema
@@ -16,8 +14,10 @@ from rest_framework.serializers import ValidationError
 from rest_framework.viewsets import ModelViewSet
 
 from job_portal.apps.attachments.models import create_attachments
+from job_portal.apps.attachments.resolvers import get_url_resolver
 
 from ...users.models import Master
+from ..broadcast import broadcast_room_event
 from ..models import (
     ChatMessage,
     ChatParticipant,
@@ -26,7 +26,6 @@ from ..models import (
     ChatType,
     MessageType,
 )
-from ..utils import get_chat_channel_name
 from .permissions import IsChatMessageOwner, IsChatOwner
 from .serializers import (
     ChatRoomCreateSerializer,
@@ -227,13 +226,10 @@ class ChatRoomAPIViewSet(ModelViewSet):
     def _broadcast_user_left(self, chat_room, user):
         """Broadcast user left event via WebSocket."""
 
-        channel_layer = get_channel_layer()
-        chat_room_channel_name = get_chat_channel_name(chat_room)
-
-        async_to_sync(channel_layer.group_send)(
-            chat_room_channel_name,
+        broadcast_room_event(
+            chat_room,
+            "user_left",
             {
-                "type": "user_left",
                 "user_id": user.id,
                 "username": user.get_full_name() or user.username,
             },
@@ -300,6 +296,7 @@ class ChatRoomMessageAPIViewSet(ModelViewSet):
             perms += [IsChatMessageOwner()]
         return perms
 
+    @transaction.atomic
     def perform_create(self, serializer):
         chat_context = self._get_chat_context()
         user = self.request.user
@@ -320,7 +317,7 @@ class ChatRoomMessageAPIViewSet(ModelViewSet):
         )
         if attachments_files is not None:
             created_attachments = create_attachments(
-                attachments_files, user, chat_message
+                attachments_files, user, chat_message, is_public=False
             )
             chat_message.attachments.add(*created_attachments)
 
@@ -349,26 +346,32 @@ class ChatRoomMessageAPIViewSet(ModelViewSet):
 
     def _broadcast_message_add(self, chat_room, message, request):
         """Broadcast new message via WebSocket."""
-        channel_layer = get_channel_layer()
-        chat_room_channel_name = get_chat_channel_name(chat_room)
 
         # Prepare attachments data
+        message_attachments = list(message.attachments.all())
+        url_resolver = get_url_resolver(request)
+        url_resolver.prime_attachments(message_attachments)
         attachments = []
-        for attachment in message.attachments.all():
+        for attachment in message_attachments:
             attachments.append(
                 {
                     "id": attachment.id,
                     "name": attachment.original_filename,
-                    "url": request.build_absolute_uri(attachment.file.url),
+                    "url": (
+                        url_resolver.url(attachment.file.name)
+                        if attachment.is_public
+                        # Seen by every participant, so not signed for the sender
+                        else url_resolver.protected_url(attachment, sign=False)
+                    ),
                     "size": attachment.size,
                     "type": attachment.file_type,
                 }
             )
 
-        async_to_sync(channel_layer.group_send)(
-            chat_room_channel_name,
+        broadcast_room_event(
+            chat_room,
+            "chat_message",
             {
-                "type": "chat_message",
                 "message_id": message.id,
                 "message_type": message.message_type,
                 "content": message.content,
@@ -384,13 +387,11 @@ class ChatRoomMessageAPIViewSet(ModelViewSet):
 
     def _broadcast_message_edit(self, chat_room, message, request):
         """Broadcast message edit via WebSocket."""
-        channel_layer = get_channel_layer()
-        chat_room_channel_name = get_chat_channel_name(chat_room)
 
-        async_to_sync(channel_layer.group_send)(
-            chat_room_channel_name,
+        broadcast_room_event(
+            chat_room,
+            "message_edited",
             {
-                "type": "message_edited",
                 "message_id": message.id,
                 "content": message.content,
                 "created_at": message.created_at.isoformat(),
@@ -401,13 +402,10 @@ class ChatRoomMessageAPIViewSet(ModelViewSet):
     def _broadcast_message_deletion(self, chat_room, message, request):
         """Broadcast message deletion via WebSocket."""
 
-        channel_layer = get_channel_layer()
-        chat_room_channel_name = get_chat_channel_name(chat_room)
-
-        async_to_sync(channel_layer.group_send)(
-            chat_room_channel_name,
+        broadcast_room_event(
+            chat_room,
+            "message_deleted",
             {
-                "type": "message_deleted",
                 "message_id": message.id,
                 "deleted_by": request.user.id,
                 "created_at": message.created_at.isoformat(),
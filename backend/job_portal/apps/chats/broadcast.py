@@ -0,0 +1,154 @@
+"""
+Coalesced WebSocket broadcasts for chat rooms.
+
+Events are encoded once per room group into the exact frame every socket in
+the room receives, and are queued in-process after the surrounding
+transaction commits. A single background thread drains the queue in batches,
+so request threads never wait on a channel layer round-trip and consumers
+only forward the pre-encoded frame.
+"""
+
+import asyncio
+import json
+import logging
+import queue
+import threading
+import time
+from collections import defaultdict
+from typing import Any, Dict
+
+from channels.layers import get_channel_layer
+from django.db import transaction
+
+from utils import metrics
+
+from .utils import get_chat_channel_name
+
+logger = logging.getLogger(__name__)
+
+MAX_BATCH_SIZE = 100
+
+broadcast_latency = metrics.histogram(
+    "chat_broadcast_latency_seconds",
+    "Time between enqueueing a chat event and its group_send completing.",
+)
+broadcast_batch_size = metrics.histogram(
+    "chat_broadcast_batch_size",
+    "Number of chat events flushed to the channel layer per batch.",
+    buckets=(1, 2, 5, 10, 25, 50, 100, 250),
+)
+broadcast_errors = metrics.counter(
+    "chat_broadcast_errors_total",
+    "Chat events that failed to reach the channel layer.",
+)
+
+
+def encode_frame(event_type: str, payload: Dict[str, Any]) -> str:
+    """Encode an event into the JSON text frame sent to WebSocket clients."""
+    return json.dumps({"type": event_type, **payload}, separators=(",", ":"))
+
+
+def build_group_message(event_type: str, payload: Dict[str, Any]) -> Dict[str, str]:
+    """
+    Build a channel layer message carrying a pre-encoded frame.
+
+    The channel layer serializes the message with msgpack; keeping the body to
+    a single string means one cheap pack/unpack per recipient and no
+    per-recipient ``json.dumps`` in the consumer.
+    """
+    return {"type": event_type, "frame": encode_frame(event_type, payload)}
+
+
+class ChatBroadcaster:
+    """Background sender that batches group sends issued from sync code."""
+
+    def __init__(self, max_batch_size: int = MAX_BATCH_SIZE):
+        self.max_batch_size = max_batch_size
+        self._queue = queue.SimpleQueue()
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def publish(self, group: str, message: Dict[str, str]) -> None:
+        """Queue a message for the group; returns immediately."""
+        self._ensure_started()
+        self._queue.put((group, message, time.monotonic()))
+
+    def _ensure_started(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(
+                    target=self._run, name="chat-broadcaster", daemon=True
+                )
+                self._thread.start()
+
+    def _next_batch(self) -> list:
+        batch = [self._queue.get()]
+        while len(batch) < self.max_batch_size:
+            try:
+                batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self) -> None:
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        while True:
+            batch = self._next_batch()
+            try:
+                loop.run_until_complete(self._flush(batch))
+            except Exception as e:
+                broadcast_errors.inc(len(batch))
+                logger.error(f"Error flushing chat broadcast batch: {e}")
+
+    async def _flush(self, batch: list) -> None:
+        broadcast_batch_size.observe(len(batch))
+        channel_layer = get_channel_layer()
+
+        # Events of one room are sent in order; different rooms go out concurrently.
+        by_group = defaultdict(list)
+        for group, message, enqueued_at in batch:
+            by_group[group].append((message, enqueued_at))
+
+        await asyncio.gather(
+            *(
+                self._send_group(channel_layer, group, items)
+                for group, items in by_group.items()
+            )
+        )
+
+    @staticmethod
+    async def _send_group(channel_layer, group: str, items: list) -> None:
+        for message, enqueued_at in items:
+            try:
+                await channel_layer.group_send(group, message)
+            except Exception as e:
+                broadcast_errors.inc(event=message["type"])
+                logger.error(f"Error broadcasting {message['type']} to {group}: {e}")
+                continue
+            broadcast_latency.observe(
+                time.monotonic() - enqueued_at, event=message["type"]
+            )
+
+
+broadcaster = ChatBroadcaster()
+
+
+def broadcast_room_event(chat_room, event_type: str, payload: Dict[str, Any]) -> None:
+    """
+    Broadcast an event to everyone connected to the chat room.
+
+    The frame is encoded immediately and handed to the background broadcaster
+    once the current transaction commits (or right away in autocommit mode),
+    so rolled-back changes are never announced.
+
+    Args:
+        chat_room: ChatRoom instance or its ID
+        event_type (str): Consumer handler name, e.g. ``chat_message``
+        payload (dict): Event body sent to clients next to ``type``
+    """
+    group = get_chat_channel_name(chat_room)
+    message = build_group_message(event_type, payload)
+    transaction.on_commit(lambda: broadcaster.publish(group, message))
@@ -1,26 +1,54 @@
+import asyncio
 import json
 import logging
+import time
+from collections import deque
 from typing import Any, Dict, Optional
 
 from channels.db import database_sync_to_async
 from channels.generic.websocket import AsyncWebsocketConsumer
+from django.conf import settings
 from django.contrib.auth import get_user_model
 from django.db import models
 
+from job_portal.apps.chats.broadcast import build_group_message
+from job_portal.apps.chats.ephemeral import (
+    debouncer,
+    encode_ephemeral,
+    is_ephemeral,
+    parse_ephemeral,
+)
+from job_portal.apps.chats.throttling import ChatRateLimiter
 from job_portal.apps.chats.utils import get_chat_channel_name
+from utils import metrics
 
 from .models import ChatMessage, ChatParticipant, ChatRoom
 
 logger = logging.getLogger(__name__)
 UserModel = get_user_model()
 
+CLOSE_CODE_THROTTLED = 4029
+CLOSE_CODE_SLOW_CONSUMER = 4008
+
+closed_connections = metrics.counter(
+    "chat_connections_closed_total",
+    "Chat WebSocket connections closed by the server for misbehaving.",
+)
+
 
 class ChatConsumer(AsyncWebsocketConsumer):
     """
     Simple WebSocket consumer for real-time chat functionality.
     Handles basic message sending and broadcasting.
+
+    Incoming messages are rate limited (see chats.throttling) and outgoing
+    frames go through a bounded queue, so a flooding or stalled client is
+    disconnected instead of holding worker resources.
     """
 
+    send_queue: Optional[asyncio.Queue] = None
+    writer_task: Optional[asyncio.Task] = None
+
     async def connect(self):
         """Handle WebSocket connection."""
         self.room_id = self.scope["url_route"]["kwargs"]["room_id"]
@@ -37,10 +65,17 @@ class ChatConsumer(AsyncWebsocketConsumer):
             await self.close(code=4003)
             return
 
+        self.rate_limiter = ChatRateLimiter(self.user.id, self.room_id)
+        # Monotonic times of recent throttled messages, see handle_throttled
+        self.throttle_strikes = deque()
+
         # Join room group
         await self.channel_layer.group_add(self.room_group_name, self.channel_name)
         await self.accept()
 
+        self.send_queue = asyncio.Queue(maxsize=settings.CHAT_SEND_QUEUE_SIZE)
+        self.writer_task = asyncio.create_task(self.drain_send_queue())
+
         # Send connection confirmation
         await self.send(
             text_data=json.dumps(
@@ -54,16 +89,42 @@ class ChatConsumer(AsyncWebsocketConsumer):
 
     async def disconnect(self, close_code):
         """Handle WebSocket disconnection."""
+        self.stop_writer()
         await self.channel_layer.group_discard(self.room_group_name, self.channel_name)
 
     async def receive(self, text_data):
         """Handle incoming WebSocket messages."""
-
-        print("Received data:", text_data)
         try:
             data = json.loads(text_data)
-            message_type = data.get("type", "chat_message")
+        except json.JSONDecodeError:
+            data = None
+        message_type = (
+            data.get("type", "chat_message") if isinstance(data, dict) else None
+        )
+
+        # Typing/presence/seen only count against the connection's local limit
+        # and are debounced before they fan out to the room.
+        if is_ephemeral(message_type):
+            if not self.rate_limiter.allow_local():
+                await self.handle_throttled("connection")
+                return
+            await self.handle_ephemeral(message_type, data)
+            return
+
+        limited_by = await self.rate_limiter.allow()
+        if limited_by:
+            await self.handle_throttled(limited_by)
+            return
+
+        if not isinstance(data, dict):
+            await self.send(
+                text_data=json.dumps(
+                    {"type": "error", "message": "Invalid JSON format"}
+                )
+            )
+            return
 
+        try:
             if message_type == "chat_message":
                 await self.handle_chat_message(data)
             else:
@@ -76,15 +137,42 @@ class ChatConsumer(AsyncWebsocketConsumer):
                     )
                 )
 
-        except json.JSONDecodeError:
-            await self.send(
-                text_data=json.dumps(
-                    {"type": "error", "message": "Invalid JSON format"}
-                )
-            )
         except Exception as e:
             await self.send(text_data=json.dumps({"type": "error", "message": str(e)}))
 
+    async def handle_ephemeral(self, event_type: str, data: Dict[str, Any]) -> None:
+        """Broadcast a typing/presence/seen signal to the rest of the room."""
+        value = parse_ephemeral(event_type, data)
+        if value is None:
+            await self.send_error(f"Invalid {event_type} event")
+            return
+        if not debouncer.should_send(event_type, self.user.id, self.room_id, value):
+            return
+        if event_type == "seen" and not await self.room_has_message(value):
+            await self.send_error("Message not found in this room")
+            return
+
+        await self.channel_layer.group_send(
+            self.room_group_name,
+            {
+                "type": "ephemeral_event",
+                "frame": encode_ephemeral(event_type, self.user.id, value),
+                "sender_channel": self.channel_name,
+            },
+        )
+
+    async def handle_throttled(self, scope: str) -> None:
+        """Reject a rate limited message; close connections that keep flooding."""
+        now = time.monotonic()
+        self.throttle_strikes.append(now)
+        while now - self.throttle_strikes[0] > settings.CHAT_THROTTLE_STRIKE_WINDOW:
+            self.throttle_strikes.popleft()
+        if len(self.throttle_strikes) > settings.CHAT_THROTTLE_MAX_STRIKES:
+            closed_connections.inc(reason="throttled")
+            await self.close_connection(CLOSE_CODE_THROTTLED)
+            return
+        await self.send_error(f"Rate limit exceeded ({scope}). Slow down.")
+
     async def handle_chat_message(self, data: Dict[str, Any]) -> None:
         """Handle incoming chat messages."""
         try:
@@ -112,83 +200,87 @@ class ChatConsumer(AsyncWebsocketConsumer):
             # Broadcast message to room group
             await self.channel_layer.group_send(
                 self.room_group_name,
-                {
-                    "type": "chat_message",
-                    "message_id": saved_message.id,
-                    "message_type": saved_message.message_type,
-                    "content": content,
-                    "sender": {
-                        "id": self.user.id,
-                        "full_name": f"{self.user.first_name} {self.user.last_name}".strip()
-                        or self.user.username,
+                build_group_message(
+                    "chat_message",
+                    {
+                        "message_id": saved_message.id,
+                        "message_type": saved_message.message_type,
+                        "content": content,
+                        "sender": {
+                            "id": self.user.id,
+                            "full_name": f"{self.user.first_name} {self.user.last_name}".strip()
+                            or self.user.username,
+                        },
+                        "attachments": attachments,
+                        "created_at": saved_message.created_at.isoformat(),
+                        "updated_at": saved_message.updated_at.isoformat(),
                     },
-                    "attachments": attachments,
-                    "created_at": saved_message.created_at.isoformat(),
-                    "updated_at": saved_message.updated_at.isoformat(),
-                },
+                ),
             )
         except Exception as e:
             logger.error(f"Error handling chat message: {e}")
             await self.send_error("An error occurred while processing your message")
 
-    # WebSocket message handlers for group broadcasts
+    # WebSocket message handlers for group broadcasts.
+    # Events arrive with the client frame already encoded (see chats.broadcast),
+    # so each handler only forwards it.
 
     async def chat_message(self, event):
         """Send chat message to WebSocket."""
-        await self.send(
-            text_data=json.dumps(
-                {
-                    "type": "chat_message",
-                    "message_id": event["message_id"],
-                    "message_type": event["message_type"],
-                    "content": event["content"],
-                    "sender": event["sender"],
-                    "attachments": event["attachments"],
-                    "created_at": event["created_at"],
-                    "updated_at": event["updated_at"],
-                }
-            )
-        )
+        await self.send(text_data=event["frame"])
 
     async def message_edited(self, event):
         """Send message edit notification to WebSocket."""
-        await self.send(
-            text_data=json.dumps(
-                {
-                    "type": "message_edited",
-                    "message_id": event["message_id"],
-                    "content": event["content"],
-                    "created_at": event["created_at"],
-                    "updated_at": event["updated_at"],
-                }
-            )
-        )
+        await self.send(text_data=event["frame"])
 
     async def message_deleted(self, event):
         """Send message deletion notification to WebSocket."""
-        await self.send(
-            text_data=json.dumps(
-                {
-                    "type": "message_deleted",
-                    "message_id": event["message_id"],
-                    "deleted_by": event["deleted_by"],
-                    "created_at": event["created_at"],
-                    "updated_at": event["updated_at"],
-                }
-            )
-        )
+        await self.send(text_data=event["frame"])
 
     async def user_left(self, event):
         """Send user left notification to WebSocket."""
-        await self.send(
-            text_data=json.dumps(
-                {
-                    "type": "user_left",
-                    "user_id": event["user_id"],
-                    "username": event["username"],
-                }
+        await self.send(text_data=event["frame"])
+
+    async def ephemeral_event(self, event):
+        """Send typing/presence/seen signals from other sockets in the room."""
+        if event["sender_channel"] == self.channel_name:
+            return
+        # Ephemeral frames are worthless once stale; skip them rather than
+        # pushing a lagging client over the send queue limit.
+        if self.send_queue is not None and self.send_queue.full():
+            return
+        await self.send(text_data=event["frame"])
+
+    async def send(self, text_data=None, bytes_data=None, close=False):
+        """Queue a frame for the client, dropping clients that cannot keep up."""
+        if close or self.send_queue is None:
+            await super().send(text_data=text_data, bytes_data=bytes_data, close=close)
+            return
+        try:
+            self.send_queue.put_nowait((text_data, bytes_data))
+        except asyncio.QueueFull:
+            closed_connections.inc(reason="slow_consumer")
+            logger.warning(
+                f"Closing slow chat consumer for user {self.user.id} in room {self.room_id}"
             )
-        )
+            await self.close_connection(CLOSE_CODE_SLOW_CONSUMER)
+
+    async def drain_send_queue(self) -> None:
+        """Write queued frames to the socket in order."""
+        while True:
+            text_data, bytes_data = await self.send_queue.get()
+            await super().send(text_data=text_data, bytes_data=bytes_data)
+
+    def stop_writer(self) -> None:
+        self.send_queue = None
+        if self.writer_task is not None:
+            self.writer_task.cancel()
+            self.writer_task = None
+
+    async def close_connection(self, code: int) -> None:
+        """Discard pending frames and close the socket."""
+        self.stop_writer()
+        await self.close(code=code)
 
     async def send_error(self, message: str) -> None:
         """Send error message to WebSocket."""
@@ -221,6 +313,11 @@ class ChatConsumer(AsyncWebsocketConsumer):
         except ChatRoom.DoesNotExist:
             return False
     @database_sync_to_async
+    def room_has_message(self, message_id: int) -> bool:
+        """Check that a message belongs to this chat room."""
+        return ChatMessage.objects.filter(id=message_id, chat_room_id=self.room_id).exists()
+
+    @database_sync_to_async
     def save_message(self, content: str) -> Optional[ChatMessage]:
         """Save message to database."""
         try:
@@ -0,0 +1,113 @@
+"""
+Ephemeral chat events: typing indicators, presence and read receipts.
+
+These signals only travel through the channel layer. They are never saved,
+repeats of the same value are debounced per event type, user and room
+in-process, and they are encoded from fixed templates instead of going
+through ``json.dumps``. A changed value (typing stopped, a newer message
+seen) is always sent, so peers never keep a stale state; the connection's
+local rate limit bounds how often a client can flip it.
+"""
+
+import time
+from typing import Any, Dict, Optional, Tuple
+
+from utils import metrics
+
+# Minimum seconds between two identical events from one user in one room
+EPHEMERAL_DEBOUNCE_SECONDS = {
+    "typing": 2.0,
+    "presence": 10.0,
+    "seen": 1.0,
+}
+
+PRESENCE_STATUSES = ("online", "away")
+
+_FRAME_TEMPLATES = {
+    "typing": '{"type":"typing","user_id":%d,"is_typing":%s}',
+    "presence": '{"type":"presence","user_id":%d,"status":"%s"}',
+    "seen": '{"type":"seen","user_id":%d,"message_id":%d}',
+}
+
+# Drop idle debounce entries once the table grows past this size
+_PRUNE_THRESHOLD = 10000
+
+ephemeral_events = metrics.counter(
+    "chat_ephemeral_events_total",
+    "Ephemeral chat events received, by event and outcome.",
+)
+
+
+def is_ephemeral(event_type: str) -> bool:
+    return event_type in EPHEMERAL_DEBOUNCE_SECONDS
+
+
+def parse_ephemeral(event_type: str, data: Dict[str, Any]):
+    """
+    Extract the single value an ephemeral event carries.
+
+    Args:
+        event_type (str): One of the ephemeral event types
+        data (dict): Decoded client frame
+
+    Returns:
+        The event value, or None if the frame is invalid
+    """
+    if event_type == "typing":
+        is_typing = data.get("is_typing", True)
+        return is_typing if isinstance(is_typing, bool) else None
+    if event_type == "presence":
+        status = data.get("status", "online")
+        return status if status in PRESENCE_STATUSES else None
+    if event_type == "seen":
+        message_id = data.get("message_id")
+        if isinstance(message_id, int) and not isinstance(message_id, bool):
+            return message_id
+    return None
+
+
+def encode_ephemeral(event_type: str, user_id: int, value) -> str:
+    """Encode an ephemeral event into the client frame."""
+    if event_type == "typing":
+        value = "true" if value else "false"
+    return _FRAME_TEMPLATES[event_type] % (user_id, value)
+
+
+class EphemeralDebouncer:
+    """Leading-edge debounce of repeated ephemeral events per event type, user and room."""
+
+    def __init__(self):
+        self._last_sent: Dict[tuple, Tuple[Any, float]] = {}
+        self._pruned_at = 0.0
+
+    def should_send(self, event_type: str, user_id: int, room_id, value) -> bool:
+        now = time.monotonic()
+        key = (event_type, user_id, room_id)
+        last: Optional[Tuple[Any, float]] = self._last_sent.get(key)
+        if (
+            last is not None
+            and last[0] == value
+            and now - last[1] < EPHEMERAL_DEBOUNCE_SECONDS[event_type]
+        ):
+            ephemeral_events.inc(event=event_type, result="debounced")
+            return False
+
+        self._last_sent[key] = (value, now)
+        window = max(EPHEMERAL_DEBOUNCE_SECONDS.values())
+        # At most one prune per window, however many users are active
+        if len(self._last_sent) > _PRUNE_THRESHOLD and now - self._pruned_at > window:
+            self._prune(now)
+        ephemeral_events.inc(event=event_type, result="sent")
+        return True
+
+    def _prune(self, now: float) -> None:
+        window = max(EPHEMERAL_DEBOUNCE_SECONDS.values())
+        self._pruned_at = now
+        self._last_sent = {
+            key: last
+            for key, last in self._last_sent.items()
+            if now - last[1] < window
+        }
+
+
+debouncer = EphemeralDebouncer()
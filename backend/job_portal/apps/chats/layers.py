@@ -0,0 +1,61 @@
+"""
+Channel layers used by the chat app.
+
+``ShardedRedisChannelLayer`` spreads room groups (``chat_{room_id}``, see
+``chats.utils.get_chat_channel_name``) and consumer channels across several
+Redis hosts. Configure it with more than one entry in ``hosts``; with a single
+host it behaves exactly like ``channels_redis.core.RedisChannelLayer``.
+"""
+
+import hashlib
+
+from channels_redis.core import RedisChannelLayer
+
+
+def jump_consistent_hash(key: int, num_buckets: int) -> int:
+    """
+    Map a 64-bit key to a bucket in ``[0, num_buckets)``.
+
+    Jump consistent hash (Lamping & Veach): when a shard is added only
+    ``1 / num_buckets`` of the keys move, unlike the range split used by
+    channels_redis which reshuffles most groups.
+
+    Args:
+        key (int): 64-bit integer key
+        num_buckets (int): Number of shards
+
+    Returns:
+        int: Shard index
+    """
+    b, j = -1, 0
+    while j < num_buckets:
+        b = j
+        key = (key * 2862933555777941757 + 1) & 0xFFFFFFFFFFFFFFFF
+        j = int((b + 1) * (float(1 << 31) / float((key >> 33) + 1)))
+    return b
+
+
+def shard_for(value, num_shards: int) -> int:
+    """
+    Get the shard index for a group or channel name.
+
+    Args:
+        value: Group/channel name as str or bytes
+        num_shards (int): Number of shards
+
+    Returns:
+        int: Shard index
+    """
+    if num_shards == 1:
+        return 0
+    if isinstance(value, str):
+        value = value.encode("utf8")
+    key = int.from_bytes(hashlib.blake2b(value, digest_size=8).digest(), "big")
+    return jump_consistent_hash(key, num_shards)
+
+
+class ShardedRedisChannelLayer(RedisChannelLayer):
+    """Redis channel layer with jump consistent hashing across hosts."""
+
+    def consistent_hash(self, value):
+        return shard_for(value, self.ring_size)
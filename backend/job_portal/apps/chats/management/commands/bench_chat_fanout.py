@@ -0,0 +1,226 @@
+import asyncio
+import json
+import statistics
+import time
+
+from channels.layers import DEFAULT_CHANNEL_LAYER, InMemoryChannelLayer, channel_layers
+from channels.routing import URLRouter
+from channels.testing import WebsocketCommunicator
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.urls import re_path
+
+from job_portal.apps.chats.broadcast import build_group_message
+from job_portal.apps.chats.consumers import ChatConsumer
+from job_portal.apps.chats.layers import ShardedRedisChannelLayer
+from job_portal.apps.chats.utils import get_chat_channel_name
+from utils.helpers import percentile
+
+UserModel = get_user_model()
+
+
+class BenchChatConsumer(ChatConsumer):
+    """ChatConsumer without the database membership check."""
+
+    async def can_access_room(self) -> bool:
+        return True
+
+
+def build_application(users):
+    """Route to BenchChatConsumer and authenticate each socket as a fake user."""
+    router = URLRouter(
+        [re_path(r"ws/chat/(?P<room_id>\d+)/$", BenchChatConsumer.as_asgi())]
+    )
+
+    async def application(scope, receive, send):
+        user_id = int(dict(scope.get("headers", [])).get(b"x-bench-user", b"0"))
+        scope = dict(scope, user=users[user_id])
+        return await router(scope, receive, send)
+
+    return application
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark chat fan-out: open many ChatConsumer sockets, broadcast to their "
+        "rooms and report delivery latency percentiles and throughput per core"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--layer",
+            choices=["memory", "redis"],
+            default="memory",
+            help="Channel layer to benchmark",
+        )
+        parser.add_argument(
+            "--redis-hosts",
+            type=str,
+            help="Comma separated host:port list (default: REDIS_CHANNEL_HOSTS)",
+        )
+        parser.add_argument(
+            "--connections", type=int, default=2000, help="Total WebSocket connections"
+        )
+        parser.add_argument("--rooms", type=int, default=100, help="Number of chat rooms")
+        parser.add_argument(
+            "--messages", type=int, default=500, help="Messages broadcast in total"
+        )
+        parser.add_argument(
+            "--rate",
+            type=float,
+            default=200.0,
+            help="Broadcast rate in messages/second (0 = as fast as possible)",
+        )
+        parser.add_argument(
+            "--timeout",
+            type=float,
+            default=30.0,
+            help="Seconds to wait for outstanding deliveries",
+        )
+        parser.add_argument(
+            "--json", action="store_true", help="Print the report as JSON"
+        )
+
+    def handle(self, *args, **options):
+        if options["connections"] < options["rooms"]:
+            raise CommandError("--connections must be at least --rooms")
+
+        layer = self.make_layer(options)
+        previous = channel_layers.set(DEFAULT_CHANNEL_LAYER, layer)
+        try:
+            report = asyncio.run(self.run(layer, options))
+        finally:
+            channel_layers.set(DEFAULT_CHANNEL_LAYER, previous)
+
+        if options["json"]:
+            self.stdout.write(json.dumps(report, indent=2))
+            return
+        for key, value in report.items():
+            self.stdout.write(f"{key:>28}: {value}")
+
+    def make_layer(self, options):
+        # Sockets in one room share a group; give channels room for bursts.
+        capacity = max(1000, options["messages"])
+        if options["layer"] == "memory":
+            return InMemoryChannelLayer(capacity=capacity)
+
+        if options["redis_hosts"]:
+            hosts = [
+                tuple(host.strip().rsplit(":", 1))
+                for host in options["redis_hosts"].split(",")
+            ]
+        else:
+            hosts = settings.REDIS_CHANNEL_HOSTS
+        return ShardedRedisChannelLayer(
+            hosts=hosts, prefix="bench", capacity=capacity, expiry=60
+        )
+
+    async def run(self, layer, options):
+        connections = options["connections"]
+        rooms = options["rooms"]
+        messages = options["messages"]
+
+        users = [
+            UserModel(id=i + 1, username=f"bench{i + 1}") for i in range(connections)
+        ]
+        application = build_application(users)
+
+        # Connect in waves so the accept handshakes don't all queue at once.
+        communicators = []
+        room_of = []
+        for start in range(0, connections, 500):
+            wave = []
+            for i in range(start, min(start + 500, connections)):
+                room_id = i % rooms + 1
+                communicator = WebsocketCommunicator(
+                    application,
+                    f"ws/chat/{room_id}/",
+                    headers=[(b"x-bench-user", str(i).encode())],
+                )
+                wave.append(communicator)
+                room_of.append(room_id)
+            results = await asyncio.gather(*(c.connect() for c in wave))
+            if not all(connected for connected, _ in results):
+                raise CommandError("Some bench connections were rejected")
+            await asyncio.gather(*(c.receive_from() for c in wave))
+            communicators.extend(wave)
+
+        members = [0] * (rooms + 1)
+        for room_id in room_of:
+            members[room_id] += 1
+        expected = [0] * (rooms + 1)
+        for seq in range(messages):
+            expected[seq % rooms + 1] += 1
+
+        sent_at = {}
+        latencies = []
+
+        async def reader(communicator, count):
+            for _ in range(count):
+                frame = json.loads(await communicator.receive_from(options["timeout"]))
+                latencies.append(time.perf_counter() - sent_at[frame["message_id"]])
+
+        readers = [
+            asyncio.create_task(reader(c, expected[room_id]))
+            for c, room_id in zip(communicators, room_of)
+        ]
+
+        interval = 1 / options["rate"] if options["rate"] > 0 else 0
+        wall_start = time.perf_counter()
+        cpu_start = time.process_time()
+        for seq in range(messages):
+            room_id = seq % rooms + 1
+            message = build_group_message(
+                "chat_message",
+                {
+                    "message_id": seq,
+                    "message_type": "text",
+                    "content": "x" * 64,
+                    "sender": {"id": 0, "full_name": "bench"},
+                    "attachments": [],
+                },
+            )
+            sent_at[seq] = time.perf_counter()
+            await layer.group_send(get_chat_channel_name(room_id), message)
+            if interval:
+                await asyncio.sleep(max(0, sent_at[seq] + interval - time.perf_counter()))
+
+        done, pending = await asyncio.wait(readers, timeout=options["timeout"])
+        wall = time.perf_counter() - wall_start
+        cpu = time.process_time() - cpu_start
+        for task in pending:
+            task.cancel()
+        errors = sum(1 for task in done if task.exception() is not None)
+
+        await asyncio.gather(
+            *(c.disconnect() for c in communicators), return_exceptions=True
+        )
+        if hasattr(layer, "close_pools"):
+            await layer.close_pools()
+
+        expected_deliveries = sum(
+            expected[room_id] * members[room_id] for room_id in range(1, rooms + 1)
+        )
+        delivered = len(latencies)
+        return {
+            "layer": options["layer"],
+            "connections": connections,
+            "rooms": rooms,
+            "messages_sent": messages,
+            "deliveries_expected": expected_deliveries,
+            "deliveries": delivered,
+            "lost": expected_deliveries - delivered,
+            "reader_errors": errors + len(pending),
+            "latency_p50_ms": round(percentile(latencies, 50) * 1000, 3),
+            "latency_p99_ms": round(percentile(latencies, 99) * 1000, 3),
+            "latency_max_ms": round(max(latencies, default=0) * 1000, 3),
+            "latency_mean_ms": round(statistics.fmean(latencies) * 1000, 3)
+            if latencies
+            else 0.0,
+            "wall_seconds": round(wall, 3),
+            "cpu_seconds": round(cpu, 3),
+            "deliveries_per_second": round(delivered / wall, 1) if wall else 0.0,
+            # The benchmark runs on one event loop, so CPU seconds == core seconds.
+            "deliveries_per_core_second": round(delivered / cpu, 1) if cpu else 0.0,
+        }
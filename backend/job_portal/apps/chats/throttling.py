@@ -0,0 +1,65 @@
+"""
+Rate limiting for chat WebSocket messages.
+
+Each consumer keeps a local limit that rejects obvious floods without a
+network round-trip. Messages that pass it are checked against shared
+per-user and per-room limits with one atomic call to the Redis rate limiter
+(see utils.rate_limit), so limits hold across every ASGI worker. If Redis is
+unreachable the local limit alone is enforced. All three use the GCRA of
+utils.rate_limit.
+"""
+
+from typing import Optional
+
+from django.conf import settings
+
+from utils import metrics
+from utils.rate_limit import AsyncRateLimiter, Limit, LocalRateLimit
+
+throttled_messages = metrics.counter(
+    "chat_messages_throttled_total",
+    "Chat messages rejected by the rate limiter.",
+)
+
+
+class ChatRateLimiter:
+    """
+    Rate limiter for messages sent over one chat connection.
+
+    Limits come from ``settings.CHAT_RATE_LIMITS``: ``connection`` is enforced
+    locally, ``user`` and ``room`` are shared through Redis.
+    """
+
+    def __init__(self, user_id: int, room_id):
+        limits = settings.CHAT_RATE_LIMITS
+        self.local = LocalRateLimit(Limit.parse(limits["connection"]))
+        self.shared = AsyncRateLimiter(
+            [
+                ("user", f"ratelimit:chat:user:{user_id}", Limit.parse(limits["user"])),
+                ("room", f"ratelimit:chat:room:{room_id}", Limit.parse(limits["room"])),
+            ]
+        )
+
+    def allow_local(self) -> bool:
+        """Consume a token of the connection limit only, for frames that skip Redis."""
+        if self.local.consume():
+            return True
+        throttled_messages.inc(scope="connection")
+        return False
+
+    async def allow(self) -> Optional[str]:
+        """
+        Consume a token for one incoming message.
+
+        Returns:
+            Optional[str]: None if allowed, otherwise the limiting scope
+        """
+        if not self.local.consume():
+            throttled_messages.inc(scope="connection")
+            return "connection"
+
+        result = await self.shared.check()
+        if not result.allowed:
+            throttled_messages.inc(scope=result.limited_by)
+            return result.limited_by
+        return None
@@ -1,21 +1,18 @@
 from rest_framework import viewsets
-from rest_framework.decorators import action, throttle_classes
+from rest_framework.decorators import action
 from rest_framework.permissions import IsAdminUser, IsAuthenticated
 from rest_framework.response import Response
-from rest_framework.throttling import ScopedRateThrottle
 
 from utils.helpers import get_client_ip
+from utils.rate_limit import RateLimitThrottle
 
 from ..models import SimpleContact
 from .serializers import SimpleContactSerializer
 
 
-class ContactCreateThrottle(ScopedRateThrottle):
+class ContactCreateThrottle(RateLimitThrottle):
     scope = "contact_create"
 
-    def get_rate(self):
-        return "5/hour"
-
 
 class SimpleContactAPIViewSet(viewsets.ModelViewSet):
     """Contact enquiries API with minimal code."""
@@ -33,6 +30,11 @@ class SimpleContactAPIViewSet(viewsets.ModelViewSet):
             permission_classes = [IsAdminUser]
         return [permission() for permission in permission_classes]
 
+    def get_throttles(self):
+        if self.action == "create":
+            return [ContactCreateThrottle()]
+        return super().get_throttles()
+
     def get_queryset(self):
         """Filter queryset with minimal validation."""
         queryset = super().get_queryset()
@@ -64,11 +66,6 @@ class SimpleContactAPIViewSet(viewsets.ModelViewSet):
             }
         )
 
-    @throttle_classes([ContactCreateThrottle])
-    def create(self, request, *args, **kwargs):
-        """Create contact with throttling."""
-        return super().create(request, *args, **kwargs)
-
     def perform_create(self, serializer):
         """Create contact with IP tracking."""
         ip_address = get_client_ip(self.request)
@@ -0,0 +1,65 @@
+from django.core.exceptions import FieldDoesNotExist
+from rest_framework import serializers
+
+from ..reference_snapshot import get_compiled_reference
+
+
+class ReferencePrimaryKeyRelatedField(serializers.PrimaryKeyRelatedField):
+    """
+    ``PrimaryKeyRelatedField`` validated against the compiled reference snapshot.
+
+    ``filters`` restricts the accepted rows by attribute value, e.g.
+    ``{"is_active": True}``, and should match the queryset. Models outside
+    the snapshot, and pks the snapshot has no matching row for (rows created
+    or changed since it was compiled), fall back to the queryset.
+    """
+
+    def __init__(self, filters=None, **kwargs):
+        self.filters = filters or {}
+        super().__init__(**kwargs)
+
+    def to_internal_value(self, data):
+        model = self.get_queryset().model
+        reference = get_compiled_reference()
+        if model not in reference:
+            return super().to_internal_value(data)
+        if isinstance(data, bool):
+            self.fail("incorrect_type", data_type=type(data).__name__)
+        try:
+            pk = self.pk_field.to_internal_value(data) if self.pk_field is not None else int(data)
+        except (TypeError, ValueError):
+            self.fail("incorrect_type", data_type=type(data).__name__)
+        instance = reference.get(model, pk)
+        if instance is None or any(getattr(instance, name) != value for name, value in self.filters.items()):
+            return super().to_internal_value(data)
+        return instance
+
+
+class ReferenceSerializerMixin:
+    """
+    Nested serializer of a reference model that reads its instance from the snapshot.
+
+    Used as a field on a forward foreign key, the related row is looked up by
+    the key's value instead of loading the relation, so the query planner
+    does not join it (``resolves_from_snapshot``). Rows missing from the
+    snapshot (soft-deleted ones) are loaded as usual.
+    """
+
+    resolves_from_snapshot = True
+
+    def get_attribute(self, instance):
+        # Serializers re-rendering already serialized data pass dicts
+        if not self.resolves_from_snapshot or not hasattr(instance, "_meta"):
+            return super().get_attribute(instance)
+        try:
+            model_field = instance._meta.get_field(self.source)
+        except FieldDoesNotExist:
+            model_field = None
+        if model_field is not None and model_field.many_to_one and not model_field.is_cached(instance):
+            pk = getattr(instance, model_field.attname)
+            if pk is None:
+                return None
+            related = get_compiled_reference().get(self.Meta.model, pk)
+            if related is not None:
+                return related
+        return super().get_attribute(instance)
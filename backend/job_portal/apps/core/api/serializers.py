@@ -1,8 +1,11 @@
+from django.core.exceptions import ValidationError as DjangoValidationError
 from rest_framework import serializers
 
+from utils.counters import BufferedCountersListSerializer, BufferedCountersSerializerMixin
 from utils.serializers import (
     AbstractTimestampedModelSerializer,
 )
+from .fields import ReferencePrimaryKeyRelatedField, ReferenceSerializerMixin
 from ..models import (
     AppVersion,
     Language,
@@ -14,7 +17,7 @@ from ..models import (
 )
 
 
-class LanguageSerializer(AbstractTimestampedModelSerializer):
+class LanguageSerializer(ReferenceSerializerMixin, AbstractTimestampedModelSerializer):
     class Meta:
         model = Language
         fields = [
@@ -29,7 +32,7 @@ class LanguageSerializer(AbstractTimestampedModelSerializer):
         ]
 
 
-class ServiceSubcategorySerializer(AbstractTimestampedModelSerializer):
+class ServiceSubcategorySerializer(ReferenceSerializerMixin, AbstractTimestampedModelSerializer):
     class Meta:
         model = ServiceSubcategory
         fields = [
@@ -47,9 +50,7 @@ class ServiceSubcategorySerializer(AbstractTimestampedModelSerializer):
         ]
 
 
-class ServiceCategorySerializer(AbstractTimestampedModelSerializer):
-    subcategories = ServiceSubcategorySerializer(many=True, read_only=True)
-
+class ServiceCategoryBasicSerializer(ReferenceSerializerMixin, AbstractTimestampedModelSerializer):
     class Meta:
         model = ServiceCategory
         fields = [
@@ -64,10 +65,19 @@ class ServiceCategorySerializer(AbstractTimestampedModelSerializer):
             "featured",
             "commission_rate",
             "slug",
-            "subcategories",
         ]
 
 
+class ServiceCategorySerializer(ServiceCategoryBasicSerializer):
+    # Subcategories are not in the snapshot, so nested uses keep the prefetch
+    resolves_from_snapshot = False
+
+    subcategories = ServiceSubcategorySerializer(many=True, read_only=True)
+
+    class Meta(ServiceCategoryBasicSerializer.Meta):
+        fields = ServiceCategoryBasicSerializer.Meta.fields + ["subcategories"]
+
+
 class ServiceAreaSerializer(AbstractTimestampedModelSerializer):
     class Meta:
         model = ServiceArea
@@ -100,7 +110,7 @@ class SystemSettingsSerializer(AbstractTimestampedModelSerializer):
         ]
 
 
-class SupportFAQSerializer(AbstractTimestampedModelSerializer):
+class SupportFAQSerializer(BufferedCountersSerializerMixin, AbstractTimestampedModelSerializer):
     class Meta:
         model = SupportFAQ
         fields = [
@@ -115,6 +125,8 @@ class SupportFAQSerializer(AbstractTimestampedModelSerializer):
             "view_count",
             "created_at",
         ]
+        buffered_counters = ["view_count"]
+        list_serializer_class = BufferedCountersListSerializer
 
 
 # CRUD Serializers for Create/Update operations
@@ -153,6 +165,8 @@ class ServiceCategoryCreateUpdateSerializer(serializers.ModelSerializer):
 class ServiceSubcategoryCreateUpdateSerializer(serializers.ModelSerializer):
     """Serializer for creating and updating service subcategories."""
 
+    category = ReferencePrimaryKeyRelatedField(queryset=ServiceCategory.objects.all())
+
     class Meta:
         model = ServiceSubcategory
         fields = [
@@ -219,6 +233,15 @@ class SystemSettingsCreateUpdateSerializer(serializers.ModelSerializer):
             "category",
         ]
 
+    def validate(self, attrs):
+        current = {field: getattr(self.instance, field) for field in self.Meta.fields} if self.instance else {}
+        setting = SystemSettings(**{**current, **attrs})
+        try:
+            setting.clean()
+        except DjangoValidationError as e:
+            raise serializers.ValidationError(e.message_dict)
+        return attrs
+
 
 class AppVersionCreateUpdateSerializer(serializers.ModelSerializer):
     """Serializer for creating and updating app versions."""
@@ -1,10 +1,17 @@
 from django_filters.rest_framework import DjangoFilterBackend
-from rest_framework import viewsets
+from drf_spectacular.types import OpenApiTypes
+from drf_spectacular.utils import OpenApiParameter, extend_schema
+from rest_framework import status, viewsets
+from rest_framework.exceptions import ValidationError
 from rest_framework.filters import SearchFilter, OrderingFilter
-from rest_framework.permissions import IsAuthenticated
+from rest_framework.permissions import AllowAny, IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.views import APIView
 
+from utils.counters import get_counter
 from utils.pagination import CustomPagination
 from utils.permissions import HasSpecificPermission
+from utils.query_planner import SerializerQueryPlanMixin
 from .serializers import (
     LanguageSerializer, ServiceCategorySerializer, ServiceSubcategorySerializer,
     ServiceAreaSerializer, SystemSettingsSerializer, SupportFAQSerializer,
@@ -12,6 +19,9 @@ from .serializers import (
     ServiceAreaCreateUpdateSerializer, SystemSettingsCreateUpdateSerializer,
     SupportFAQCreateUpdateSerializer
 )
+from ..reference_data import get_reference_delta, get_reference_snapshot
+from ..reference_snapshot import get_reference_version
+from ..system_settings import get_loaded_settings
 from ..models import Language, ServiceCategory, ServiceSubcategory, ServiceArea, SystemSettings, SupportFAQ
 
 
@@ -33,7 +43,7 @@ class LanguageReadOnlyModelViewSet(viewsets.ReadOnlyModelViewSet):
     pagination_class = CustomPagination
 
 
-class ServiceCategoryViewSet(viewsets.ModelViewSet):
+class ServiceCategoryViewSet(SerializerQueryPlanMixin, viewsets.ModelViewSet):
     """Service Categories - Full CRUD with authenticated access."""
 
     queryset = ServiceCategory.objects.all()
@@ -44,6 +54,9 @@ class ServiceCategoryViewSet(viewsets.ModelViewSet):
     ordering = ['sort_order', 'name']
     pagination_class = CustomPagination
 
+    def get_queryset(self):
+        return self.plan_queryset(super().get_queryset())
+
     def get_serializer_class(self):
         if self.action in ['list', 'retrieve']:
             return ServiceCategorySerializer
@@ -88,7 +101,7 @@ class ServiceSubcategoryViewSet(viewsets.ModelViewSet):
                 ['core.add_servicesubcategory', 'core.change_servicesubcategory', 'core.delete_servicesubcategory'])]
 
 
-class ServiceAreaViewSet(viewsets.ModelViewSet):
+class ServiceAreaViewSet(SerializerQueryPlanMixin, viewsets.ModelViewSet):
     """Service Areas - Full CRUD with authenticated access."""
 
     queryset = ServiceArea.objects.all()
@@ -102,6 +115,9 @@ class ServiceAreaViewSet(viewsets.ModelViewSet):
     ordering = ['name']
     pagination_class = CustomPagination
 
+    def get_queryset(self):
+        return self.plan_queryset(super().get_queryset())
+
     def get_serializer_class(self):
         if self.action in ['list', 'retrieve']:
             return ServiceAreaSerializer
@@ -163,3 +179,71 @@ class SupportFAQViewSet(viewsets.ModelViewSet):
             return [IsAuthenticated()]
         else:
             return [HasSpecificPermission(['core.add_supportfaq', 'core.change_supportfaq', 'core.delete_supportfaq'])()]
+
+    def retrieve(self, request, *args, **kwargs):
+        instance = self.get_object()
+        get_counter(SupportFAQ, "view_count").incr(instance.pk)
+        return Response(self.get_serializer(instance).data)
+
+
+class ReferenceDataAPIView(APIView):
+    """Versioned reference data for client-side caches."""
+
+    permission_classes = [AllowAny]
+
+    @extend_schema(
+        parameters=[
+            OpenApiParameter("since", OpenApiTypes.INT, description="Version the client already has"),
+        ],
+        responses={200: OpenApiTypes.OBJECT, 304: None},
+        summary="Get reference data",
+        description="Returns service categories, subcategories, countries, cities, languages, skills and "
+                    "professions. With `since`, only rows changed after that version are returned, and rows "
+                    "removed since then are listed by ID under `deleted`; `full` is true when the client must "
+                    "replace its copy instead. Deltas may repeat rows the client already has, so apply them by ID. The ETag is the data version, so `If-None-Match` yields 304 "
+                    "while nothing changed.",
+    )
+    def get(self, request):
+        version = get_reference_version()
+        etag = f'"{version}"'
+        if etag in request.headers.get("If-None-Match", ""):
+            return Response(status=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+
+        since = request.query_params.get("since")
+        datasets = None
+        if since:
+            try:
+                since = int(since)
+            except ValueError:
+                raise ValidationError({"since": "Must be a version returned by this endpoint."})
+            if since <= version:
+                datasets = get_reference_delta(since)
+        full = datasets is None
+        if full:
+            datasets = get_reference_snapshot(version)
+        response = Response({"version": version, "full": full, "datasets": datasets})
+        response["ETag"] = etag
+        response["Cache-Control"] = "no-cache"
+        return response
+
+
+class PublicSettingsAPIView(APIView):
+    """Public system settings, typed by their setting type."""
+
+    permission_classes = [AllowAny]
+
+    @extend_schema(
+        responses={200: OpenApiTypes.OBJECT, 304: None},
+        summary="Get public settings",
+        description="Returns the active public system settings as a key/value object. The ETag changes "
+                    "whenever any setting changes, so `If-None-Match` yields 304 otherwise.",
+    )
+    def get(self, request):
+        loaded = get_loaded_settings()
+        etag = f'"{loaded.version}"'
+        if etag in request.headers.get("If-None-Match", ""):
+            return Response(status=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+        response = Response(dict(loaded.public))
+        response["ETag"] = etag
+        response["Cache-Control"] = "public, max-age=60"
+        return response
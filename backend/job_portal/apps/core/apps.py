@@ -5,3 +5,6 @@ class CoreConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'job_portal.apps.core'
     verbose_name = 'Core Services'
+
+    def ready(self):
+        import job_portal.apps.core.signals
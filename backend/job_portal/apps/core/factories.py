@@ -0,0 +1,399 @@
+"""
+Bulk data factories for query-count checks and benchmarks.
+
+Reference data comes from the same fixtures ``scripts/seed.py`` loads; all
+other rows are created with ``bulk_create``. Attachment rows point at file
+names only, nothing is written to storage.
+"""
+
+import itertools
+import os
+from dataclasses import dataclass, field
+from decimal import Decimal
+from typing import List, Optional
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.contrib.contenttypes.models import ContentType
+from django.core.management import call_command
+from django.utils import timezone
+from rest_framework.authtoken.models import Token
+
+from accounts.models import UserNotificationSettings
+from job_portal.apps.attachments.models import Attachment
+from job_portal.apps.chats.models import ChatMessage, ChatParticipant, ChatRole, ChatRoom
+from job_portal.apps.core.models import ServiceCategory, ServiceSubcategory
+from job_portal.apps.jobs.models import (
+    Job,
+    JobApplication,
+    JobApplicationStatus,
+    JobAssignment,
+    JobStatus,
+)
+from job_portal.apps.locations.models import City, Country
+from job_portal.apps.notifications.models import Notification
+from job_portal.apps.resumes.models import MasterResume
+from job_portal.apps.reviews.models import Review
+from job_portal.apps.users.models import (
+    Certificate,
+    Employer,
+    Master,
+    MasterSkill,
+    PortfolioItem,
+    Profession,
+    Skill,
+)
+from utils.abstract_models import assign_unique_slugs
+
+UserModel = get_user_model()
+
+# Same order as scripts/seed.py:load_fixtures
+FIXTURE_FILES = [
+    "languages.json",
+    "countries.json",
+    "cities.json",
+    "service_categories.json",
+    "service_subcategories.json",
+    "service_areas.json",
+    "professions.json",
+    "skills.json",
+    "companies.json",
+    "system_settings.json",
+    "support_faq.json",
+]
+
+
+@dataclass
+class Scenario:
+    """Users and objects created by ``DataFactory.scenario``."""
+
+    employer_user: object
+    master_user: object
+    staff_user: object
+    jobs: List[Job] = field(default_factory=list)
+    assignments: List[JobAssignment] = field(default_factory=list)
+    chat_rooms: List[ChatRoom] = field(default_factory=list)
+    portfolio_items: List[PortfolioItem] = field(default_factory=list)
+
+    @property
+    def users(self):
+        return [self.employer_user, self.master_user, self.staff_user]
+
+
+class DataFactory:
+    """
+    Creates related rows in bulk.
+
+    Args:
+        prefix (str): Prefix for usernames, titles and slugs, so several runs
+            can share a database
+        batch_size (int): ``bulk_create`` batch size
+    """
+
+    def __init__(self, prefix: str = "factory", batch_size: int = 1000):
+        self.prefix = prefix
+        self.batch_size = batch_size
+        self._seq = itertools.count(1)
+        self._password = make_password(None)
+        self.subcategory: Optional[ServiceSubcategory] = None
+        self.city: Optional[City] = None
+        self.profession: Optional[Profession] = None
+        self.skill: Optional[Skill] = None
+
+    def next_id(self) -> int:
+        return next(self._seq)
+
+    def _bulk(self, model, objects):
+        assign_unique_slugs(objects)
+        return model.objects.bulk_create(objects, batch_size=self.batch_size)
+
+    def reference_data(self) -> None:
+        """Load the seed fixtures if the reference tables are empty, then pick defaults."""
+        if not ServiceSubcategory.objects.exists():
+            fixtures_dir = os.path.join(settings.BASE_DIR, "fixtures")
+            for fixture_file in FIXTURE_FILES:
+                fixture_path = os.path.join(fixtures_dir, fixture_file)
+                if os.path.exists(fixture_path):
+                    call_command("loaddata", fixture_path, verbosity=0)
+
+        category = ServiceCategory.objects.first() or ServiceCategory.objects.create(
+            name=f"{self.prefix} category", description=""
+        )
+        self.subcategory = ServiceSubcategory.objects.first() or ServiceSubcategory.objects.create(
+            name=f"{self.prefix} subcategory", category=category, description=""
+        )
+        country = Country.objects.first() or Country.objects.create(
+            name=f"{self.prefix} country", code=self.prefix[:10]
+        )
+        self.city = City.objects.first() or City.objects.create(
+            name=f"{self.prefix} city", code=self.prefix[:10], country=country
+        )
+        self.profession = Profession.objects.first() or Profession.objects.create(
+            name=f"{self.prefix} profession", category=category
+        )
+        self.skill = Skill.objects.first() or Skill.objects.create(
+            name=f"{self.prefix} skill", category=category
+        )
+
+    def users(self, count: int, **fields) -> List:
+        users = []
+        for _i in range(count):
+            n = self.next_id()
+            users.append(
+                UserModel(
+                    username=f"{self.prefix}_user_{n}",
+                    email=f"{self.prefix}_user_{n}@example.com",
+                    first_name="Factory",
+                    last_name=str(n),
+                    password=self._password,
+                    **fields,
+                )
+            )
+        self._bulk(UserModel, users)
+        # Not every backend returns primary keys from bulk_create
+        users = list(UserModel.objects.filter(username__in=[u.username for u in users]).order_by("pk"))
+        # Created on first login for real users
+        self._bulk(UserNotificationSettings, [UserNotificationSettings(user=user) for user in users])
+        return users
+
+    def employers(self, users) -> List[Employer]:
+        return self._bulk(Employer, [Employer(user=user) for user in users])
+
+    def masters(self, users) -> List[Master]:
+        masters = self._bulk(
+            Master,
+            [Master(user=user, profession=self.profession, hourly_rate=Decimal("25.00")) for user in users],
+        )
+        self._bulk(MasterSkill, [MasterSkill(master=master, skill=self.skill) for master in masters])
+        services = Master.services_offered.through
+        self._bulk(
+            services,
+            [services(master_id=master.pk, servicesubcategory_id=self.subcategory.pk) for master in masters],
+        )
+        return masters
+
+    def jobs(self, employers, per_employer: int, status=JobStatus.PUBLISHED) -> List[Job]:
+        now = timezone.now()
+        jobs = []
+        for employer in employers:
+            for _i in range(per_employer):
+                n = self.next_id()
+                jobs.append(
+                    Job(
+                        employer=employer,
+                        title=f"{self.prefix} job {n}",
+                        description="Factory job",
+                        location="Bishkek",
+                        city=self.city,
+                        service_subcategory=self.subcategory,
+                        status=status,
+                        published_at=now,
+                        budget_min=Decimal("100.00"),
+                        budget_max=Decimal("500.00"),
+                    )
+                )
+        return self._bulk(Job, jobs)
+
+    def applications(self, jobs, masters, status=JobApplicationStatus.PENDING) -> List[JobApplication]:
+        """One application per job, from the master at the same position in ``masters``."""
+        return self._bulk(
+            JobApplication,
+            [
+                JobApplication(job=job, applicant=master, amount=Decimal("200.00"), status=status)
+                for job, master in zip(jobs, masters)
+            ],
+        )
+
+    def assignments(self, applications) -> List[JobAssignment]:
+        return self._bulk(
+            JobAssignment,
+            [
+                JobAssignment(job=application.job, master=application.applicant, accepted_application=application)
+                for application in applications
+            ],
+        )
+
+    def attachments(self, instances, per_instance: int, user, relation: str = "attachments") -> List[Attachment]:
+        """
+        Create attachment rows and add them to ``relation`` of every instance.
+
+        Args:
+            instances: Objects with an ``attachments``-style many-to-many field
+            per_instance (int): Attachments per object
+            user: Uploader
+            relation (str): Many-to-many field name
+        """
+        if not instances or per_instance <= 0:
+            return []
+        content_type = ContentType.objects.get_for_model(instances[0])
+        attachments = []
+        for instance in instances:
+            for _i in range(per_instance):
+                n = self.next_id()
+                attachments.append(
+                    Attachment(
+                        content_type=content_type,
+                        object_id=instance.pk,
+                        file=f"attachments/{self.prefix}/{n}.txt",
+                        original_filename=f"{n}.txt",
+                        size=1,
+                        file_type="file",
+                        mime_type="text/plain",
+                        content_hash=f"{self.prefix}-{n}",
+                        uploaded_by=user,
+                    )
+                )
+        attachments = self._bulk(Attachment, attachments)
+        through = getattr(type(instances[0]), relation).through
+        source_field = f"{type(instances[0])._meta.model_name}_id"
+        self._bulk(
+            through,
+            [
+                through(**{source_field: attachment.object_id, "attachment_id": attachment.pk})
+                for attachment in attachments
+            ],
+        )
+        return attachments
+
+    def chat_rooms(self, participant_groups, job: Optional[Job] = None) -> List[ChatRoom]:
+        """Create one room per list of users; the first user of each list is the room admin."""
+        rooms = self._bulk(
+            ChatRoom,
+            [ChatRoom(title=f"{self.prefix} chat {self.next_id()}", job=job) for _group in participant_groups],
+        )
+        self._bulk(
+            ChatParticipant,
+            [
+                ChatParticipant(chat_room=room, user=user, role=ChatRole.ADMIN if i == 0 else ChatRole.MEMBER)
+                for room, users in zip(rooms, participant_groups)
+                for i, user in enumerate(users)
+            ],
+        )
+        return rooms
+
+    def messages(self, rooms, senders, per_room: int) -> List[ChatMessage]:
+        """
+        Create ``per_room`` messages in every room.
+
+        Args:
+            rooms: Chat rooms
+            senders: One list of senders per room, used in turn
+            per_room (int): Messages per room
+        """
+        messages = self._bulk(
+            ChatMessage,
+            [
+                ChatMessage(chat_room=room, sender=room_senders[i % len(room_senders)], content=f"Message {i}")
+                for room, room_senders in zip(rooms, senders)
+                for i in range(per_room)
+            ],
+        )
+        ChatRoom.objects.filter(pk__in=[room.pk for room in rooms]).update(last_message_at=timezone.now())
+        return messages
+
+    def notifications(self, users, per_user: int) -> List[Notification]:
+        actor_type = ContentType.objects.get_for_model(UserModel)
+        return self._bulk(
+            Notification,
+            [
+                Notification(
+                    recipient=user,
+                    title=f"Notification {i}",
+                    message="Factory notification",
+                    verb="created",
+                    actor_content_type=actor_type,
+                    actor_object_id=str(user.pk),
+                )
+                for user in users
+                for i in range(per_user)
+            ],
+        )
+
+    def tokens(self, users) -> List[Token]:
+        """API tokens for ``users``; ``bulk_create`` skips ``Token.save``, so keys are set here."""
+        return self._bulk(Token, [Token(user=user, key=Token.generate_key()) for user in users])
+
+    def reviews(self, jobs, reviewer, master: Master) -> List[Review]:
+        return self._bulk(
+            Review,
+            [Review(job=job, reviewer=reviewer, master=master, rating=5, title="Great work") for job in jobs],
+        )
+
+    def portfolio_items(self, master: Master, count: int) -> List[PortfolioItem]:
+        return self._bulk(
+            PortfolioItem,
+            [PortfolioItem(master=master, title=f"{self.prefix} work {i}", skill_used=self.skill) for i in range(count)],
+        )
+
+    def certificates(self, master: Master, count: int) -> List[Certificate]:
+        return self._bulk(
+            Certificate,
+            [
+                Certificate(master=master, name=f"Certificate {i}", issuing_organization="Factory")
+                for i in range(count)
+            ],
+        )
+
+    def resumes(self, master: Master, count: int) -> List[MasterResume]:
+        return self._bulk(
+            MasterResume,
+            [MasterResume(master=master, title=f"Resume {i}", content="Factory resume") for i in range(count)],
+        )
+
+    def scenario(self, size: int = 50, attachments_per_object: int = 2) -> Scenario:
+        """
+        Create an employer, a master and a staff user with ``size`` rows of every
+        kind of object the API lists for them.
+
+        Args:
+            size (int): Rows per list endpoint
+            attachments_per_object (int): Attachments on jobs, assignments,
+                messages and portfolio items
+
+        Returns:
+            Scenario: The created users and parent objects
+        """
+        self.reference_data()
+        employer_user, master_user = self.users(2)
+        staff_user = self.users(1, is_staff=True)[0]
+        employer = self.employers([employer_user])[0]
+        master = self.masters([master_user])[0]
+        # Other masters, for the public master lists and search
+        self.masters(self.users(size - 1))
+
+        published = self.jobs([employer], size)
+        self.attachments(published, attachments_per_object, employer_user)
+        self.applications(published, [master] * size)
+        # Published jobs the master has not applied to yet (recommendations)
+        open_jobs = self.jobs([employer], size)
+        self.attachments(open_jobs, attachments_per_object, employer_user)
+
+        assigned = self.jobs([employer], size, status=JobStatus.IN_PROGRESS)
+        self.attachments(assigned, attachments_per_object, employer_user)
+        assignments = self.assignments(
+            self.applications(assigned, [master] * size, status=JobApplicationStatus.ACCEPTED)
+        )
+        self.attachments(assignments, attachments_per_object, master_user)
+        self.reviews(assigned, employer_user, master)
+
+        rooms = self.chat_rooms([[employer_user, master_user]] * size, job=published[0])
+        messages = self.messages(rooms[:1], [[employer_user, master_user]], size)
+        self.attachments(messages, attachments_per_object, employer_user)
+
+        self.notifications([employer_user, master_user], size)
+
+        portfolio_items = self.portfolio_items(master, size)
+        self.attachments(portfolio_items, attachments_per_object, master_user)
+        self.certificates(master, size)
+        self.resumes(master, size)
+
+        return Scenario(
+            employer_user=employer_user,
+            master_user=master_user,
+            staff_user=staff_user,
+            jobs=published + open_jobs + assigned,
+            assignments=assignments,
+            chat_rooms=rooms,
+            portfolio_items=portfolio_items,
+        )
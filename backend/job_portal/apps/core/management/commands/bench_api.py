@@ -0,0 +1,235 @@
+import asyncio
+import json
+import random
+import time
+from collections import defaultdict
+
+import aiohttp
+from django.core.management.base import BaseCommand, CommandError
+
+from utils.helpers import percentile
+
+
+class Recorder:
+    """Collects latencies and statuses per endpoint label."""
+
+    def __init__(self):
+        self.latencies = defaultdict(list)
+        self.statuses = defaultdict(lambda: defaultdict(int))
+        self.errors = defaultdict(int)
+        self.unexpected = defaultdict(int)
+
+    def add(self, label, status, elapsed):
+        self.latencies[label].append(elapsed)
+        self.statuses[label][status] += 1
+
+    def add_error(self, label):
+        self.errors[label] += 1
+
+    def add_unexpected(self, label):
+        self.unexpected[label] += 1
+
+    def report(self, duration):
+        endpoints = {}
+        for label in sorted(set(self.latencies) | set(self.errors)):
+            latencies = [value * 1000 for value in self.latencies[label]]
+            statuses = self.statuses[label]
+            endpoints[label] = {
+                "requests": len(latencies),
+                "throughput_rps": round(len(latencies) / duration, 2),
+                "p50_ms": round(percentile(latencies, 50), 2),
+                "p90_ms": round(percentile(latencies, 90), 2),
+                "p99_ms": round(percentile(latencies, 99), 2),
+                "max_ms": round(max(latencies, default=0.0), 2),
+                "client_errors": sum(count for status, count in statuses.items() if 400 <= status < 500),
+                "server_errors": sum(count for status, count in statuses.items() if status >= 500),
+                "connection_errors": self.errors[label],
+                "unexpected_responses": self.unexpected[label],
+                "statuses": {str(status): count for status, count in sorted(statuses.items())},
+            }
+        return endpoints
+
+
+class Journeys:
+    """User journeys replayed by the load driver, one method per role."""
+
+    def __init__(self, session, base_url, recorder, rng):
+        self.session = session
+        self.base_url = base_url.rstrip("/")
+        self.recorder = recorder
+        self.rng = rng
+
+    async def call(self, method, label, path, token, allowed=(), **kwargs):
+        """
+        Send one request and record it.
+
+        Responses outside 2xx and ``allowed`` (outcomes a journey can hit
+        legitimately, e.g. applying twice) are counted as unexpected, so a
+        run that only measures rejections fails instead of reporting them
+        as latencies.
+        """
+        headers = {"Authorization": f"Token {token}"}
+        started = time.perf_counter()
+        try:
+            async with self.session.request(method, self.base_url + path, headers=headers, **kwargs) as response:
+                body = await response.read()
+        except (aiohttp.ClientError, asyncio.TimeoutError):
+            self.recorder.add_error(label)
+            return None
+        self.recorder.add(label, response.status, time.perf_counter() - started)
+        if not 200 <= response.status < 300 and response.status not in allowed:
+            self.recorder.add_unexpected(label)
+        if response.status >= 300 or not body:
+            return None
+        try:
+            return json.loads(body)
+        except ValueError:
+            return None
+
+    def pick(self, data, **match):
+        """Random object from a (paginated) list response, optionally matching fields."""
+        if isinstance(data, dict):
+            data = data.get("results")
+        if not isinstance(data, list):
+            return None
+        candidates = [item for item in data if all(item.get(k) == v for k, v in match.items())]
+        return self.rng.choice(candidates) if candidates else None
+
+    async def master(self, token):
+        await self.call("GET", "GET /api/v1/home/master/new-jobs/", "/api/v1/home/master/new-jobs/", token)
+        jobs = await self.call("GET", "GET /api/v1/search/jobs/", "/api/v1/search/jobs/", token, allowed=(429,))
+        job = self.pick(jobs)
+        if job:
+            await self.call("GET", "GET /api/v1/jobs/{id}/", f"/api/v1/jobs/{job['id']}/", token)
+            await self.call(
+                "POST",
+                "POST /api/v1/jobs/{id}/apply/",
+                f"/api/v1/jobs/{job['id']}/apply/",
+                token,
+                # 400: this master already applied in an earlier journey
+                allowed=(400,),
+                json={"amount": f"{self.rng.randint(50, 500)}.00", "comment": "Benchmark application"},
+            )
+        await self.chat(token)
+
+    async def employer(self, token):
+        await self.call("GET", "GET /api/v1/home/client", "/api/v1/home/client", token)
+        await self.call("GET", "GET /api/v1/search/masters/", "/api/v1/search/masters/", token, allowed=(429,))
+        await self.call("GET", "GET /api/v1/jobs/my_jobs/", "/api/v1/jobs/my_jobs/", token)
+        applications = await self.call("GET", "GET /api/v1/applications/", "/api/v1/applications/", token)
+        application = self.pick(applications, status="pending")
+        if application:
+            await self.call(
+                "POST",
+                "POST /api/v1/applications/{id}/accept/",
+                f"/api/v1/applications/{application['id']}/accept/",
+                token,
+                # 400: another virtual user accepted an application of the job first
+                allowed=(400,),
+            )
+        await self.chat(token)
+
+    async def chat(self, token):
+        rooms = await self.call("GET", "GET /api/v1/chats/rooms/", "/api/v1/chats/rooms/", token)
+        room = self.pick(rooms)
+        if not room:
+            return
+        path = f"/api/v1/chats/rooms/{room['id']}/messages/"
+        await self.call("GET", "GET /api/v1/chats/rooms/{id}/messages/", path, token)
+        await self.call(
+            "POST",
+            "POST /api/v1/chats/rooms/{id}/messages/",
+            path,
+            token,
+            json={"content": "Benchmark message", "message_type": "text"},
+        )
+        await self.call("GET", "GET /api/v1/notifications/", "/api/v1/notifications/", token)
+
+
+class Command(BaseCommand):
+    help = (
+        "Replay employer and master journeys (home, search, job detail, apply, accept, chat) "
+        "against a running server and report per-endpoint throughput and latency percentiles"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--base-url", type=str, default="http://localhost:8000")
+        parser.add_argument(
+            "--tokens-file",
+            type=str,
+            default="bench_tokens.json",
+            help="Tokens written by seed_benchmark_data",
+        )
+        parser.add_argument("--duration", type=float, default=60.0, help="Seconds to run")
+        parser.add_argument("--concurrency", type=int, default=50, help="Simultaneous virtual users")
+        parser.add_argument(
+            "--employer-ratio",
+            type=float,
+            default=0.3,
+            help="Share of journeys run as an employer (the rest run as a master)",
+        )
+        parser.add_argument("--timeout", type=float, default=30.0, help="Per-request timeout in seconds")
+        parser.add_argument("--seed", type=int, default=42)
+        parser.add_argument("--output", type=str, help="Write the JSON report to this file instead of stdout")
+
+    def handle(self, *args, **options):
+        try:
+            with open(options["tokens_file"]) as fh:
+                tokens = json.load(fh)
+        except (OSError, ValueError) as e:
+            raise CommandError(f"Could not read tokens from {options['tokens_file']}: {e}")
+        if not tokens.get("employers") or not tokens.get("masters"):
+            raise CommandError("The tokens file needs both employer and master tokens")
+
+        report = asyncio.run(self.run(tokens, options))
+        output = json.dumps(report, indent=2)
+        if options["output"]:
+            with open(options["output"], "w") as fh:
+                fh.write(output)
+            self.stdout.write(self.style.SUCCESS(f"Report written to {options['output']}"))
+        else:
+            self.stdout.write(output)
+
+        unexpected = {
+            label: endpoint["unexpected_responses"]
+            for label, endpoint in report["endpoints"].items()
+            if endpoint["unexpected_responses"]
+        }
+        if unexpected:
+            raise CommandError(f"Journeys got unexpected responses: {unexpected}")
+
+    async def run(self, tokens, options):
+        recorder = Recorder()
+        rng = random.Random(options["seed"])
+        journeys_run = defaultdict(int)
+        timeout = aiohttp.ClientTimeout(total=options["timeout"])
+        connector = aiohttp.TCPConnector(limit=options["concurrency"])
+
+        async with aiohttp.ClientSession(timeout=timeout, connector=connector) as session:
+            journeys = Journeys(session, options["base_url"], recorder, rng)
+            deadline = time.perf_counter() + options["duration"]
+
+            async def virtual_user():
+                while time.perf_counter() < deadline:
+                    if rng.random() < options["employer_ratio"]:
+                        journeys_run["employer"] += 1
+                        await journeys.employer(rng.choice(tokens["employers"]))
+                    else:
+                        journeys_run["master"] += 1
+                        await journeys.master(rng.choice(tokens["masters"]))
+
+            started = time.perf_counter()
+            await asyncio.gather(*(virtual_user() for _i in range(options["concurrency"])))
+            duration = time.perf_counter() - started
+
+        endpoints = recorder.report(duration)
+        total = sum(endpoint["requests"] for endpoint in endpoints.values())
+        return {
+            "base_url": options["base_url"],
+            "concurrency": options["concurrency"],
+            "duration_s": round(duration, 2),
+            "requests": total,
+            "throughput_rps": round(total / duration, 2),
+            "journeys": dict(journeys_run),
+            "endpoints": endpoints,
+        }
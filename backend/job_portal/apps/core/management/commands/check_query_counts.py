@@ -0,0 +1,264 @@
+import json
+import re
+import time
+from dataclasses import asdict, dataclass, field
+from typing import Dict, List, Optional
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import URLPattern, URLResolver, get_resolver, reverse
+from rest_framework import mixins
+from rest_framework.test import APIClient
+
+from job_portal.apps.core.factories import DataFactory
+
+# Parent lookups of nested routes, taken from the factory scenario
+PARENT_KWARGS = {
+    "job_id": lambda scenario: scenario.jobs[-1].pk,
+    "assignment_id": lambda scenario: scenario.assignments[0].pk,
+    "portfolio_id": lambda scenario: scenario.portfolio_items[0].pk,
+    "chat_room_id": lambda scenario: scenario.chat_rooms[0].pk,
+}
+
+# Bookkeeping queries that are not part of the endpoint's own work
+IGNORED_SQL = re.compile(r"^\s*(SAVEPOINT|RELEASE SAVEPOINT|ROLLBACK TO SAVEPOINT)|silk_", re.I)
+
+
+@dataclass
+class Endpoint:
+    url_name: str
+    route: str
+    view: str
+    action: str
+    kwarg_names: List[str]
+
+
+@dataclass
+class Measurement:
+    endpoint: str
+    action: str
+    url: str = ""
+    user: str = ""
+    status: Optional[int] = None
+    queries: Dict[int, int] = field(default_factory=dict)
+    time_ms: Dict[int, float] = field(default_factory=dict)
+    rows: Dict[int, int] = field(default_factory=dict)
+    skipped: str = ""
+
+    @property
+    def regressed(self) -> bool:
+        return len(set(self.queries.values())) > 1
+
+
+def _get_action(callback) -> Optional[str]:
+    actions = getattr(callback, "actions", None)
+    if actions is not None:
+        action = actions.get("get")
+        return action if action in ("list", "retrieve") else None
+    view_class = getattr(callback, "view_class", None)
+    if view_class is None:
+        return None
+    if issubclass(view_class, mixins.ListModelMixin):
+        return "list"
+    if issubclass(view_class, mixins.RetrieveModelMixin):
+        return "retrieve"
+    return None
+
+
+def iter_endpoints(patterns=None, namespace="", route="", kwarg_names=()):
+    """Yield every routed DRF list/retrieve endpoint under ``api/``."""
+    if patterns is None:
+        patterns = get_resolver().url_patterns
+    for pattern in patterns:
+        names = tuple(kwarg_names) + tuple(pattern.pattern.regex.groupindex)
+        full_route = route + str(pattern.pattern)
+        if isinstance(pattern, URLResolver):
+            child_namespace = namespace
+            if pattern.namespace:
+                child_namespace = f"{namespace}{pattern.namespace}:"
+            yield from iter_endpoints(pattern.url_patterns, child_namespace, full_route, names)
+        elif isinstance(pattern, URLPattern) and pattern.name and "api/" in full_route:
+            if "format" in names:
+                # Format suffix duplicates of the same route
+                continue
+            action = _get_action(pattern.callback)
+            if action:
+                view = getattr(pattern.callback, "cls", None) or pattern.callback.view_class
+                yield Endpoint(
+                    url_name=namespace + pattern.name,
+                    route=full_route,
+                    view=view.__name__,
+                    action=action,
+                    kwarg_names=list(names),
+                )
+
+
+def count_queries(captured) -> int:
+    return sum(1 for query in captured if not IGNORED_SQL.search(query["sql"]))
+
+
+def count_rows(data) -> int:
+    if isinstance(data, dict) and isinstance(data.get("results"), list):
+        return len(data["results"])
+    if isinstance(data, list):
+        return len(data)
+    return 1
+
+
+class Command(BaseCommand):
+    help = (
+        "Seed a factory dataset, request every list/retrieve API endpoint at two "
+        "page sizes and fail if any endpoint's query count depends on the page size"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--page-sizes",
+            type=int,
+            nargs=2,
+            default=[1, 50],
+            metavar=("SMALL", "LARGE"),
+            help="Page sizes to compare (default: 1 50)",
+        )
+        parser.add_argument(
+            "--attachments",
+            type=int,
+            default=2,
+            help="Attachments per job, assignment, message and portfolio item",
+        )
+        parser.add_argument("--only", type=str, help="Only check endpoints whose view name contains this")
+        parser.add_argument("--json", type=str, help="Also write the report to this JSON file")
+        parser.add_argument(
+            "--report-only",
+            action="store_true",
+            help="Print the report without failing on regressions",
+        )
+        parser.add_argument(
+            "--keep-data",
+            action="store_true",
+            help="Commit the factory data instead of rolling it back",
+        )
+
+    def handle(self, *args, **options):
+        small, large = options["page_sizes"]
+        endpoints = [
+            endpoint
+            for endpoint in iter_endpoints()
+            if not options["only"] or options["only"].lower() in endpoint.view.lower()
+        ]
+
+        hosts = list(settings.ALLOWED_HOSTS) + ["testserver"]
+        with override_settings(ALLOWED_HOSTS=hosts, QUERY_COUNT_ASSERTIONS=False), transaction.atomic():
+            scenario = DataFactory(prefix=f"qc{int(time.time())}").scenario(
+                size=large, attachments_per_object=options["attachments"]
+            )
+            results = self.check_endpoints(endpoints, scenario, (small, large))
+            if not options["keep_data"]:
+                transaction.set_rollback(True)
+
+        self.print_report(results, small, large)
+        if options["json"]:
+            with open(options["json"], "w") as fh:
+                json.dump([asdict(result) for result in results], fh, indent=2)
+
+        regressions = [result for result in results if result.regressed]
+        if regressions and not options["report_only"]:
+            raise CommandError(
+                "Query count grows with page size: "
+                + ", ".join(f"{r.endpoint} ({r.queries[small]} -> {r.queries[large]})" for r in regressions)
+            )
+        if regressions:
+            self.stdout.write(self.style.WARNING(f"{len(results)} endpoints checked, {len(regressions)} regressions"))
+        else:
+            self.stdout.write(self.style.SUCCESS(f"{len(results)} endpoints checked, no regressions"))
+
+    def check_endpoints(self, endpoints, scenario, page_sizes) -> List[Measurement]:
+        client = APIClient()
+        list_ids: Dict[tuple, object] = {}
+        results = []
+        # Lists first, so retrieve endpoints can use an id from their list
+        for endpoint in sorted(endpoints, key=lambda e: e.action != "list"):
+            result = Measurement(endpoint=f"{endpoint.view}.{endpoint.action}", action=endpoint.action)
+            results.append(result)
+            parent_names = [name for name in endpoint.kwarg_names if name != "pk"]
+            unknown = [name for name in parent_names if name not in PARENT_KWARGS]
+            if unknown:
+                result.skipped = f"no value for {', '.join(unknown)}"
+                continue
+            kwargs = {name: PARENT_KWARGS[name](scenario) for name in parent_names}
+            if "pk" in endpoint.kwarg_names:
+                pk = list_ids.get((endpoint.view, tuple(parent_names)))
+                if pk is None:
+                    result.skipped = "no object id from the list endpoint"
+                    continue
+                kwargs["pk"] = pk
+            result.url = reverse(endpoint.url_name, kwargs=kwargs)
+
+            user, data = self.pick_user(client, scenario, result.url, page_sizes[0])
+            if user is None:
+                result.status, result.skipped = data, "no user gets a 200"
+                continue
+            result.user = user.username
+            if endpoint.action == "list" and isinstance(data, dict):
+                first = (data.get("results") or [None])[0]
+                if isinstance(first, dict) and "id" in first:
+                    list_ids[(endpoint.view, tuple(parent_names))] = first["id"]
+
+            client.force_authenticate(user)
+            for page_size in page_sizes:
+                status, queries, elapsed, rows = self.measure(client, result.url, page_size)
+                result.status = status
+                result.queries[page_size] = queries
+                result.time_ms[page_size] = round(elapsed * 1000, 2)
+                result.rows[page_size] = rows
+        return results
+
+    def pick_user(self, client, scenario, url, page_size):
+        """First scenario user that gets a non-empty 200, else the first 200."""
+        fallback, last_status = None, None
+        for user in scenario.users:
+            client.force_authenticate(user)
+            status, _queries, _elapsed, rows, data = self.request(client, url, page_size)
+            last_status = status
+            if status == 200 and rows:
+                return user, data
+            if status == 200 and fallback is None:
+                fallback = (user, data)
+        return fallback or (None, last_status)
+
+    def measure(self, client, url, page_size):
+        status, queries, elapsed, rows, _data = self.request(client, url, page_size)
+        return status, queries, elapsed, rows
+
+    def request(self, client, url, page_size):
+        with CaptureQueriesContext(connection) as ctx:
+            started = time.perf_counter()
+            try:
+                with transaction.atomic():
+                    response = client.get(url, {"page_size": page_size})
+            except Exception as e:
+                self.stderr.write(f"{url}: {e}")
+                return 500, 0, 0.0, 0, None
+            elapsed = time.perf_counter() - started
+        data = getattr(response, "data", None)
+        return response.status_code, count_queries(ctx.captured_queries), elapsed, count_rows(data), data
+
+    def print_report(self, results, small, large):
+        header = f"{'endpoint':<58} {'user':<18} {'q@' + str(small):>6} {'q@' + str(large):>6} " \
+                 f"{'ms@' + str(small):>9} {'ms@' + str(large):>9} {'rows':>5}"
+        self.stdout.write(header)
+        self.stdout.write("-" * len(header))
+        for result in results:
+            if result.skipped:
+                self.stdout.write(f"{result.endpoint:<58} skipped: {result.skipped}")
+                continue
+            line = (
+                f"{result.endpoint:<58} {result.user[-18:]:<18} "
+                f"{result.queries.get(small, '-'):>6} {result.queries.get(large, '-'):>6} "
+                f"{result.time_ms.get(small, '-'):>9} {result.time_ms.get(large, '-'):>9} "
+                f"{result.rows.get(large, '-'):>5}"
+            )
+            self.stdout.write(self.style.ERROR(line) if result.regressed else line)
@@ -0,0 +1,259 @@
+import json
+from dataclasses import asdict, dataclass, field
+from typing import Dict, List, Optional
+
+from django.contrib.auth.models import AnonymousUser
+from django.core.exceptions import FieldDoesNotExist
+from django.core.management.base import BaseCommand
+from django.db import DatabaseError, connection
+from django.db.models.expressions import Col
+from django.db.models.lookups import Lookup
+from django.urls import URLPattern, URLResolver, get_resolver
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from utils.abstract_models import AbstractSoftDeleteModel
+
+EQUALITY_LOOKUPS = {"exact", "in", "isnull"}
+RANGE_LOOKUPS = {"gt", "gte", "lt", "lte", "range"}
+
+
+@dataclass
+class Proposal:
+    model: str
+    fields: List[str]
+    partial: bool
+    views: List[str] = field(default_factory=list)
+    reasons: List[str] = field(default_factory=list)
+    covered_by: Optional[str] = None
+    table_calls: int = 0
+    table_time_ms: float = 0.0
+
+    @property
+    def key(self):
+        return self.model, tuple(self.fields), self.partial
+
+
+def iter_view_classes(patterns=None, route=""):
+    """Yield every DRF view class routed under ``api/``."""
+    if patterns is None:
+        patterns = get_resolver().url_patterns
+    for pattern in patterns:
+        full_route = route + str(pattern.pattern)
+        if isinstance(pattern, URLResolver):
+            yield from iter_view_classes(pattern.url_patterns, full_route)
+        elif isinstance(pattern, URLPattern) and "api/" in full_route:
+            view_class = getattr(pattern.callback, "cls", None) or getattr(pattern.callback, "view_class", None)
+            if view_class is not None:
+                yield view_class
+
+
+def resolve_local_field(model, path: str) -> Optional[str]:
+    """Map a filter/ordering path to a column of ``model`` itself, if it is one."""
+    parts = path.lstrip("-").split("__")
+    try:
+        model_field = model._meta.get_field(parts[0])
+    except FieldDoesNotExist:
+        return None
+    if not model_field.concrete or model_field.many_to_many or model_field.primary_key:
+        return None
+    # `service_subcategory__id` reads the foreign key column
+    if len(parts) == 2 and model_field.many_to_one and parts[1] in ("id", "pk"):
+        return model_field.name
+    if len(parts) > 1:
+        return None
+    return model_field.name
+
+
+def where_lookups(queryset):
+    """Yield ``(field name, lookup name, value)`` of the filters on the queryset's own table."""
+    base_alias = queryset.query.get_initial_alias()
+
+    def walk(node):
+        for child in node.children:
+            if isinstance(child, Lookup):
+                lhs = child.lhs
+                if isinstance(lhs, Col) and lhs.alias == base_alias:
+                    yield lhs.target.name, child.lookup_name, child.rhs
+            elif hasattr(child, "children"):
+                yield from walk(child)
+
+    yield from walk(queryset.query.where)
+
+
+def sample_queryset(view_class):
+    """The queryset a view builds for an anonymous list request, or its class queryset."""
+    view = view_class()
+    request = Request(APIRequestFactory().get("/"))
+    request.user = AnonymousUser()
+    view.request, view.args, view.kwargs = request, (), {}
+    view.format_kwarg = None
+    view.action = "list"
+    try:
+        return view.get_queryset()
+    except Exception:
+        return getattr(view_class, "queryset", None)
+
+
+def filter_paths(view_class) -> List[str]:
+    paths = []
+    filterset_fields = getattr(view_class, "filterset_fields", None) or []
+    paths += list(filterset_fields.keys() if isinstance(filterset_fields, dict) else filterset_fields)
+    filterset_class = getattr(view_class, "filterset_class", None)
+    if filterset_class is not None:
+        for declared in filterset_class.base_filters.values():
+            if declared.lookup_expr in EQUALITY_LOOKUPS | RANGE_LOOKUPS and not declared.method:
+                paths.append(declared.field_name)
+    return paths
+
+
+def existing_indexes(model) -> Dict[str, List[str]]:
+    """Indexes (and unique constraints) on the model's table, by name: column lists."""
+    with connection.cursor() as cursor:
+        constraints = connection.introspection.get_constraints(cursor, model._meta.db_table)
+    return {
+        name: info["columns"]
+        for name, info in constraints.items()
+        if (info["index"] or info["unique"] or info["primary_key"]) and info["columns"]
+    }
+
+
+def table_load() -> Optional[List[tuple]]:
+    """``(query, calls, total time)`` of the heaviest statements in pg_stat_statements, if installed."""
+    if connection.vendor != "postgresql":
+        return None
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT query, calls, total_exec_time FROM pg_stat_statements "
+                "ORDER BY total_exec_time DESC LIMIT 1000"
+            )
+            statements = cursor.fetchall()
+    except DatabaseError:
+        return None
+    return statements
+
+
+class Command(BaseCommand):
+    help = (
+        "Propose indexes for API views: compare the filters, filterset fields and orderings "
+        "of every routed viewset with the indexes that exist, ranked by pg_stat_statements load"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--model", type=str, help="Only report this model (app_label.ModelName)")
+        parser.add_argument("--all", action="store_true", help="Also list proposals already covered by an index")
+        parser.add_argument("--json", type=str, help="Also write the proposals to this JSON file")
+
+    def handle(self, *args, **options):
+        proposals: Dict[tuple, Proposal] = {}
+        for view_class in dict.fromkeys(iter_view_classes()):
+            for proposal in self.propose(view_class):
+                if options["model"] and proposal.model.lower() != options["model"].lower():
+                    continue
+                existing = proposals.setdefault(proposal.key, proposal)
+                if existing is not proposal:
+                    existing.views += [v for v in proposal.views if v not in existing.views]
+                    existing.reasons += [r for r in proposal.reasons if r not in existing.reasons]
+
+        self.annotate(proposals.values())
+        results = sorted(
+            (p for p in proposals.values() if options["all"] or not p.covered_by),
+            key=lambda p: (-p.table_time_ms, p.model, p.fields),
+        )
+        self.print_report(results)
+        if options["json"]:
+            with open(options["json"], "w") as fh:
+                json.dump([asdict(p) for p in results], fh, indent=2)
+
+    def propose(self, view_class) -> List[Proposal]:
+        queryset = sample_queryset(view_class)
+        if queryset is None:
+            return []
+        model = queryset.model
+        partial = False
+        base_fields = []
+        for name, lookup, rhs in where_lookups(queryset):
+            if name == "is_deleted" and lookup == "exact" and rhs is False:
+                partial = issubclass(model, AbstractSoftDeleteModel)
+            elif lookup in EQUALITY_LOOKUPS and name not in base_fields:
+                base_fields.append(name)
+
+        ordering = [
+            path
+            for path in (getattr(view_class, "ordering", None) or model._meta.ordering or [])
+            if isinstance(path, str)
+        ]
+        order_field = resolve_local_field(model, ordering[0]) if ordering else None
+        order_key = None
+        if order_field:
+            order_key = ("-" if ordering[0].startswith("-") else "") + order_field
+
+        label = model._meta.label
+        view_name = view_class.__name__
+        candidates = []
+        if base_fields or order_key:
+            candidates.append(
+                (base_fields + ([order_key] if order_key else []), f"default queryset ordered by {ordering[0]}"
+                 if order_key else "default queryset filters")
+            )
+        for path in filter_paths(view_class):
+            name = resolve_local_field(model, path)
+            if name and name not in base_fields:
+                fields = base_fields + [name] + ([order_key] if order_key and order_key.lstrip("-") != name else [])
+                candidates.append((fields, f"filter on {path}"))
+
+        return [
+            Proposal(model=label, fields=fields, partial=partial, views=[view_name], reasons=[reason])
+            for fields, reason in candidates
+            if fields
+        ]
+
+    def annotate(self, proposals):
+        from django.apps import apps
+
+        statements = table_load()
+        if statements is None:
+            self.stdout.write("pg_stat_statements is not available, proposals are not ranked by load")
+        indexes_by_model = {}
+        for proposal in proposals:
+            model = apps.get_model(proposal.model)
+            if proposal.model not in indexes_by_model:
+                indexes_by_model[proposal.model] = existing_indexes(model)
+            columns = [model._meta.get_field(name.lstrip("-")).column for name in proposal.fields]
+            for index_name, index_columns in indexes_by_model[proposal.model].items():
+                # An index serves any leftmost prefix of its columns
+                if index_columns[: len(columns)] == columns:
+                    proposal.covered_by = index_name
+                    break
+            if statements:
+                needle = f'FROM "{model._meta.db_table}"'
+                for query, calls, total_time in statements:
+                    if needle in query:
+                        proposal.table_calls += calls
+                        proposal.table_time_ms += total_time
+                proposal.table_time_ms = round(proposal.table_time_ms, 2)
+
+    def print_report(self, proposals):
+        if not proposals:
+            self.stdout.write(self.style.SUCCESS("Every filter and ordering is covered by an index"))
+            return
+        for proposal in proposals:
+            fields = ", ".join(repr(name) for name in proposal.fields)
+            status = f"covered by {proposal.covered_by}" if proposal.covered_by else "missing"
+            load = f", {proposal.table_calls} calls / {proposal.table_time_ms}ms on the table" \
+                if proposal.table_calls else ""
+            self.stdout.write(
+                (self.style.SUCCESS if proposal.covered_by else self.style.WARNING)(
+                    f"{proposal.model} ({fields}){' live rows only' if proposal.partial else ''}: {status}{load}"
+                )
+            )
+            self.stdout.write(f"    views: {', '.join(proposal.views)}; {'; '.join(proposal.reasons)}")
+            if not proposal.covered_by:
+                if proposal.partial:
+                    self.stdout.write(f"    add to {proposal.model.split('.')[1]}.soft_delete_indexes: ({fields},)")
+                else:
+                    self.stdout.write(f"    add to Meta.indexes: models.Index(fields=[{fields}], name=...)")
+        self.stdout.write(
+            "Declare the indexes on the models, then run makemigrations so the migration state matches them"
+        )
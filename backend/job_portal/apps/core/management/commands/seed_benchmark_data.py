@@ -0,0 +1,124 @@
+import json
+import random
+import time
+from contextlib import contextmanager
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+
+from job_portal.apps.core.factories import DataFactory
+
+UserModel = get_user_model()
+
+
+def chunks(items, size):
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+class Command(BaseCommand):
+    help = (
+        "Generate a large synthetic dataset with bulk_create for benchmarks "
+        "and write API tokens for the load driver (bench_api)"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--employers", type=int, default=5000)
+        parser.add_argument("--masters", type=int, default=50000)
+        parser.add_argument("--jobs", type=int, default=100000)
+        parser.add_argument(
+            "--applications-per-job", type=int, default=2, help="Applications from random masters"
+        )
+        parser.add_argument("--attachments-per-job", type=int, default=1)
+        parser.add_argument("--rooms", type=int, default=10000, help="Employer/master chat rooms")
+        parser.add_argument("--messages", type=int, default=1000000)
+        parser.add_argument("--notifications", type=int, default=5000000)
+        parser.add_argument("--batch-size", type=int, default=5000)
+        parser.add_argument("--prefix", type=str, default="bench", help="Prefix of generated names")
+        parser.add_argument("--seed", type=int, default=42, help="Random seed, for reproducible data")
+        parser.add_argument(
+            "--tokens-file",
+            type=str,
+            default="bench_tokens.json",
+            help="Where to write API tokens of a sample of the generated users",
+        )
+        parser.add_argument("--token-users", type=int, default=200, help="Users per role to issue tokens for")
+
+    def handle(self, *args, **options):
+        self.batch_size = options["batch_size"]
+        self.rng = random.Random(options["seed"])
+        factory = DataFactory(prefix=f"{options['prefix']}{int(time.time())}", batch_size=self.batch_size)
+        started = time.perf_counter()
+
+        with self.stage("reference data"):
+            factory.reference_data()
+
+        employers, masters = [], []
+        with self.stage(f"{options['employers']} employers"):
+            for size in self.sizes(options["employers"]):
+                employers += factory.employers(factory.users(size))
+        with self.stage(f"{options['masters']} masters"):
+            for size in self.sizes(options["masters"]):
+                masters += factory.masters(factory.users(size))
+
+        with self.stage(f"{options['jobs']} jobs"):
+            per_employer = max(1, options["jobs"] // len(employers))
+            employers_per_batch = max(1, self.batch_size // per_employer)
+            for employer_batch in chunks(employers, employers_per_batch):
+                jobs = factory.jobs(employer_batch, per_employer)
+                factory.attachments(jobs, options["attachments_per_job"], UserModel(pk=employer_batch[0].user_id))
+                applicants = [self.rng.sample(masters, options["applications_per_job"]) for _job in jobs]
+                for i in range(options["applications_per_job"]):
+                    factory.applications(jobs, [job_applicants[i] for job_applicants in applicants])
+
+        with self.stage(f"{options['rooms']} chat rooms, {options['messages']} messages"):
+            per_room = options["messages"] // max(1, options["rooms"])
+            rooms_per_batch = max(1, self.batch_size // max(1, per_room))
+            for size in self.sizes(options["rooms"], rooms_per_batch):
+                groups = [
+                    [UserModel(pk=self.rng.choice(employers).user_id), UserModel(pk=self.rng.choice(masters).user_id)]
+                    for _i in range(size)
+                ]
+                rooms = factory.chat_rooms(groups)
+                factory.messages(rooms, groups, per_room)
+
+        with self.stage(f"{options['notifications']} notifications"):
+            user_ids = [e.user_id for e in employers] + [m.user_id for m in masters]
+            per_user = max(1, options["notifications"] // len(user_ids))
+            for batch in chunks(user_ids, max(1, self.batch_size // per_user)):
+                factory.notifications([UserModel(pk=user_id) for user_id in batch], per_user)
+
+        with self.stage("tokens"):
+            sample = options["token_users"]
+            tokens = {
+                "employers": [
+                    token.key
+                    for token in factory.tokens(
+                        [UserModel(pk=e.user_id) for e in employers[:sample]]
+                    )
+                ],
+                "masters": [
+                    token.key
+                    for token in factory.tokens([UserModel(pk=m.user_id) for m in masters[:sample]])
+                ],
+            }
+            with open(options["tokens_file"], "w") as fh:
+                json.dump(tokens, fh)
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Done in {time.perf_counter() - started:.1f}s, tokens written to {options['tokens_file']}"
+            )
+        )
+
+    def sizes(self, total, batch_size=None):
+        batch_size = batch_size or self.batch_size
+        for start in range(0, total, batch_size):
+            yield min(batch_size, total - start)
+
+    @contextmanager
+    def stage(self, name):
+        self.stdout.write(f"Creating {name}...")
+        started = time.perf_counter()
+        yield
+        self.stdout.write(f"  {name}: {time.perf_counter() - started:.1f}s")
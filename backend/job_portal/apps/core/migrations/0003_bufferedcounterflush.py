@@ -0,0 +1,26 @@
+# Generated by Django 5.0.2 on 2026-10-19 07:38
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0002_schedule_buffered_counter_flush'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BufferedCounterFlush',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('flush_id', models.CharField(max_length=255, unique=True, verbose_name='Flush ID')),
+            ],
+            options={
+                'verbose_name': 'Buffered Counter Flush',
+                'verbose_name_plural': 'Buffered Counter Flushes',
+            },
+        ),
+    ]
@@ -1,3 +1,7 @@
+import json
+import re
+
+from django.core.exceptions import ValidationError
 from django.db import models
 from django.utils.translation import gettext_lazy as _
 
@@ -206,6 +210,44 @@ class SystemSettings(AbstractTimestampedModel):
     def __str__(self):
         return f"{self.key}... [#{self.id}]"
 
+    def parse_value(self):
+        """Convert the stored text to the Python type of ``setting_type``; raises ValueError."""
+        if self.setting_type == SettingType.INTEGER:
+            return int(self.value)
+        if self.setting_type == SettingType.BOOLEAN:
+            normalized = self.value.strip().lower()
+            if normalized in ("true", "1", "yes", "on"):
+                return True
+            if normalized in ("false", "0", "no", "off", ""):
+                return False
+            raise ValueError(f"{self.value!r} is not a boolean")
+        if self.setting_type == SettingType.JSON:
+            return json.loads(self.value)
+        return self.value
+
+    def clean(self):
+        try:
+            value = self.parse_value()
+        except ValueError as e:
+            raise ValidationError({"value": _("Invalid %(type)s value: %(error)s") % {
+                "type": self.setting_type, "error": e}})
+        if self.validation_regex:
+            try:
+                pattern = re.compile(self.validation_regex)
+            except re.error as e:
+                raise ValidationError({"validation_regex": _("Invalid regular expression: %(error)s") % {"error": e}})
+            if not pattern.fullmatch(self.value):
+                raise ValidationError({"value": _("Value does not match %(regex)s") % {"regex": self.validation_regex}})
+        if self.setting_type == SettingType.INTEGER:
+            for field_name in ("min_value", "max_value"):
+                bound = getattr(self, field_name)
+                if bound and not re.fullmatch(r"-?\d+", bound):
+                    raise ValidationError({field_name: _("Must be an integer")})
+            if self.min_value and value < int(self.min_value):
+                raise ValidationError({"value": _("Value must be at least %(min)s") % {"min": self.min_value}})
+            if self.max_value and value > int(self.max_value):
+                raise ValidationError({"value": _("Value must be at most %(max)s") % {"max": self.max_value}})
+
 
 class AppVersion(AbstractTimestampedModel):
     """App version tracking for updates."""
@@ -263,3 +305,15 @@ class SupportFAQ(AbstractTimestampedModel):
 
     def __str__(self):
         return f"{self.question[:50]}... [#{self.id}]"
+
+
+class BufferedCounterFlush(AbstractTimestampedModel):
+    """Flush of a buffered counter (utils.counters) applied to the database, so a retry is not applied twice."""
+    flush_id = models.CharField(_("Flush ID"), max_length=255, unique=True)
+
+    class Meta:
+        verbose_name = _("Buffered Counter Flush")
+        verbose_name_plural = _("Buffered Counter Flushes")
+
+    def __str__(self):
+        return f"{self.flush_id} [#{self.id}]"
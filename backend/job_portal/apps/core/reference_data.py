@@ -0,0 +1,112 @@
+"""
+Versioned reference data (categories, locations, languages, skills, professions).
+
+The data version is a timestamp in microseconds since the epoch, moved
+forward whenever a reference row change commits (see ``reference_snapshot``).
+Rows are stamped with ``updated_at``/``deleted_at``/``restored_at`` before
+their transaction commits, so a delta since version N lists the rows touched
+after N - ``DELTA_OVERLAP_SECONDS``: rows still visible are sent in full, the
+others (soft-deleted or deactivated) as tombstone IDs. Clients apply deltas by
+ID, so rows they already have are harmless. Hard deletes leave no trace in the tables;
+they move ``RESET_CACHE_KEY`` forward and clients older than it get a full
+snapshot instead.
+"""
+
+import datetime
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+from django.db.models import BooleanField, ExpressionWrapper, Q
+
+from job_portal.apps.locations.api.serializers import CitySerializer, CountrySerializer
+from job_portal.apps.locations.models import City, Country
+from job_portal.apps.users.api.serializers import ProfessionSerializer, SkillDetailSerializer
+from job_portal.apps.users.models import Profession, Skill
+from utils.cache_utils import cache_key_generator, get_cache, set_cache
+from utils.query_planner import optimize_queryset
+
+from .api.serializers import LanguageSerializer, ServiceCategoryBasicSerializer, ServiceSubcategorySerializer
+from .models import Language, ServiceCategory, ServiceSubcategory
+from .reference_snapshot import RESET_CACHE_KEY, from_version
+
+SNAPSHOT_CACHE_PREFIX = "reference_data_snapshot"
+
+SNAPSHOT_CACHE_TIMEOUT = 24 * 60 * 60
+
+# Longest a transaction may run between saving a reference row and committing
+DELTA_OVERLAP_SECONDS = 5 * 60
+
+
+@dataclass
+class ReferenceDataset:
+    name: str
+    model: type
+    serializer_class: type
+    # Rows clients should have; everything else is a tombstone
+    visible: Q = field(default_factory=Q)
+
+    def get_queryset(self):
+        return optimize_queryset(self.model._base_manager.all(), self.serializer_class).order_by("pk")
+
+
+REFERENCE_DATASETS: List[ReferenceDataset] = [
+    ReferenceDataset("service_categories", ServiceCategory, ServiceCategoryBasicSerializer, Q(is_deleted=False)),
+    ReferenceDataset("service_subcategories", ServiceSubcategory, ServiceSubcategorySerializer, Q(is_deleted=False)),
+    ReferenceDataset("countries", Country, CountrySerializer, Q(is_deleted=False)),
+    ReferenceDataset("cities", City, CitySerializer, Q(is_deleted=False)),
+    ReferenceDataset("languages", Language, LanguageSerializer, Q(is_deleted=False, is_active=True)),
+    ReferenceDataset("skills", Skill, SkillDetailSerializer, Q(is_deleted=False, is_active=True)),
+    ReferenceDataset("professions", Profession, ProfessionSerializer, Q(is_deleted=False, is_active=True)),
+]
+
+
+def get_reference_snapshot(version: int) -> Dict[str, dict]:
+    """
+    Get every visible reference row, cached per version.
+
+    Args:
+        version (int): Current version, from get_reference_version
+
+    Returns:
+        dict: ``{dataset name: {"updated": [rows], "deleted": []}}``
+    """
+    key = cache_key_generator(SNAPSHOT_CACHE_PREFIX, version)
+    snapshot = get_cache(key)
+    if snapshot is None:
+        snapshot = {
+            dataset.name: {
+                "updated": dataset.serializer_class(dataset.get_queryset().filter(dataset.visible), many=True).data,
+                "deleted": [],
+            }
+            for dataset in REFERENCE_DATASETS
+        }
+        set_cache(key, snapshot, SNAPSHOT_CACHE_TIMEOUT)
+    return snapshot
+
+
+def get_reference_delta(since: int) -> Optional[Dict[str, dict]]:
+    """
+    Get the reference rows changed after version ``since``.
+
+    Args:
+        since (int): Version the client has
+
+    Returns:
+        dict: Same shape as the snapshot, or None if the client needs a full snapshot
+    """
+    if since < get_cache(RESET_CACHE_KEY, 0):
+        return None
+    changed_after = from_version(since) - datetime.timedelta(seconds=DELTA_OVERLAP_SECONDS)
+    changed = Q(updated_at__gt=changed_after) | Q(deleted_at__gt=changed_after) | Q(restored_at__gt=changed_after)
+    delta = {}
+    for dataset in REFERENCE_DATASETS:
+        rows = list(
+            dataset.get_queryset()
+            .filter(changed)
+            .annotate(visible=ExpressionWrapper(dataset.visible, output_field=BooleanField()))
+        )
+        delta[dataset.name] = {
+            "updated": dataset.serializer_class([row for row in rows if row.visible], many=True).data,
+            "deleted": [row.pk for row in rows if not row.visible],
+        }
+    return delta
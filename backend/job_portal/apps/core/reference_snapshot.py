@@ -0,0 +1,258 @@
+"""
+Reference data versioning and the per-process compiled snapshot.
+
+Reference tables (categories, subcategories, countries, cities, languages,
+skills, professions) are small and change rarely, yet serializers read them
+on every request: nested ``CitySerializer``/``ServiceSubcategorySerializer``
+output and ``PrimaryKeyRelatedField`` validation. Each worker process keeps
+their live rows compiled into read-only ``{pk: row tuple}`` maps and builds
+model instances from them on demand (see ``core.api.fields``).
+
+The snapshot is tagged with the reference data version. Saving or deleting a
+reference row moves the version forward once the transaction commits, so a
+reader that saw a version also sees every row committed before it, and
+publishes it on Redis (``REFERENCE_DATA_CHANNEL``); a listener thread in
+every process notes it and the next read recompiles. Bulk ``update()`` calls send no signals, so a
+snapshot is also revalidated against the version after
+``REFERENCE_SNAPSHOT_MAX_AGE`` seconds, which is also how processes catch up
+while Redis is unreachable.
+"""
+
+import datetime
+import logging
+import os
+import threading
+import time
+from collections import defaultdict
+from dataclasses import dataclass, field
+from types import MappingProxyType
+from typing import FrozenSet, Mapping, Optional, Tuple
+
+import redis
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, transaction
+from django.db.models import Max
+from django.utils import timezone
+
+from job_portal.apps.locations.models import City, Country
+from job_portal.apps.users.models import Profession, Skill
+from utils.cache_utils import delete_cache, get_cache, set_cache
+
+from .models import Language, ServiceCategory, ServiceSubcategory
+
+logger = logging.getLogger(__name__)
+
+REFERENCE_MODELS = [ServiceCategory, ServiceSubcategory, Country, City, Language, Skill, Profession]
+
+VERSION_CACHE_KEY = "reference_data_version"
+RESET_CACHE_KEY = "reference_data_reset_version"
+COMMITTED_CACHE_KEY = "reference_data_committed_version"
+
+# Bulk updates bypass the signals that clear the version, so it also expires
+VERSION_CACHE_TIMEOUT = 60
+
+LISTENER_RETRY_INTERVAL = 30
+
+
+def to_version(value: Optional[datetime.datetime]) -> int:
+    if value is None:
+        return 0
+    return int(value.timestamp() * 1_000_000)
+
+
+def from_version(version: int) -> datetime.datetime:
+    return datetime.datetime.fromtimestamp(version / 1_000_000, tz=datetime.timezone.utc)
+
+
+def get_reference_version() -> int:
+    """
+    Get the current reference data version.
+
+    Returns:
+        int: Latest commit or change across the reference models, in microseconds
+    """
+    # Read on every call: a cached version must never hide a later commit
+    committed = get_cache(COMMITTED_CACHE_KEY, 0)
+    version = get_cache(VERSION_CACHE_KEY)
+    if version is None:
+        version = get_cache(RESET_CACHE_KEY, 0)
+        for model in REFERENCE_MODELS:
+            latest = model._base_manager.aggregate(
+                updated=Max("updated_at"), deleted=Max("deleted_at"), restored=Max("restored_at")
+            )
+            version = max([version] + [to_version(value) for value in latest.values()])
+        set_cache(VERSION_CACHE_KEY, version, VERSION_CACHE_TIMEOUT)
+    return max(version, committed)
+
+
+def publish_reference_version() -> None:
+    """Announce the current version to every process holding a snapshot."""
+    version = get_reference_version()
+    try:
+        get_redis_client().publish(settings.REFERENCE_DATA_CHANNEL, version)
+    except redis.RedisError as e:
+        logger.warning(f"Could not publish reference data version {version}: {e}")
+
+
+def commit_reference_version(hard_delete: bool = False) -> None:
+    """Move the version past a change that has just committed and announce it."""
+    # updated_at is stamped before commit, so it cannot be the version readers sync to
+    version = max(to_version(timezone.now()), get_cache(COMMITTED_CACHE_KEY, 0) + 1)
+    set_cache(COMMITTED_CACHE_KEY, version, None)
+    if hard_delete:
+        # Deleted rows leave no timestamp behind; clients older than this resync fully
+        set_cache(RESET_CACHE_KEY, version, None)
+    delete_cache(VERSION_CACHE_KEY)
+    publish_reference_version()
+
+
+def invalidate_reference_version(hard_delete: bool = False) -> None:
+    """Move the version forward once the transaction commits."""
+    transaction.on_commit(lambda: commit_reference_version(hard_delete))
+
+
+_redis_client = None
+
+
+def get_redis_client() -> redis.Redis:
+    global _redis_client
+    if _redis_client is None:
+        _redis_client = redis.Redis.from_url(
+            settings.REFERENCE_DATA_REDIS_URL,
+            socket_connect_timeout=0.5,
+            socket_timeout=0.5,
+        )
+    return _redis_client
+
+
+@dataclass(frozen=True)
+class CompiledTable:
+    model: type
+    attnames: Tuple[str, ...]
+    rows: Mapping[int, tuple]
+    _groups: dict = field(default_factory=dict, init=False, repr=False, compare=False)
+
+    def get(self, pk):
+        """Build a model instance of row ``pk``, or None if it is not a live row."""
+        values = self.rows.get(pk)
+        if values is None:
+            return None
+        return self.model.from_db(DEFAULT_DB_ALIAS, self.attnames, values)
+
+    def group_by(self, attname: str) -> Mapping:
+        """
+        Group the row pks by the value of a column, e.g. subcategories by ``category_id``.
+
+        Built on first use and kept for the life of the snapshot.
+
+        Returns:
+            Mapping: column value -> frozenset of pks
+        """
+        groups = self._groups.get(attname)
+        if groups is None:
+            index = self.attnames.index(attname)
+            grouped = defaultdict(set)
+            for pk, row in self.rows.items():
+                grouped[row[index]].add(pk)
+            groups = self._groups[attname] = MappingProxyType({value: frozenset(pks) for value, pks in grouped.items()})
+        return groups
+
+    def search(self, attname: str, text: str) -> FrozenSet[int]:
+        """Get the pks of the rows whose ``attname`` contains ``text``, ignoring case."""
+        index = self.attnames.index(attname)
+        needle = text.casefold()
+        return frozenset(pk for pk, row in self.rows.items() if row[index] and needle in row[index].casefold())
+
+
+@dataclass(frozen=True)
+class CompiledReference:
+    version: int
+    tables: Mapping[type, CompiledTable]
+
+    def get(self, model, pk):
+        table = self.tables.get(model)
+        return table.get(pk) if table is not None else None
+
+    def __contains__(self, model):
+        return model in self.tables
+
+
+def compile_reference(version: int) -> CompiledReference:
+    tables = {}
+    for model in REFERENCE_MODELS:
+        attnames = tuple(field.attname for field in model._meta.concrete_fields)
+        pk_index = attnames.index(model._meta.pk.attname)
+        rows = model._base_manager.filter(is_deleted=False).values_list(*attnames)
+        tables[model] = CompiledTable(model, attnames, MappingProxyType({row[pk_index]: row for row in rows}))
+    return CompiledReference(version, MappingProxyType(tables))
+
+
+class VersionListener(threading.Thread):
+    """Daemon thread recording the latest version published on ``REFERENCE_DATA_CHANNEL``."""
+
+    def __init__(self):
+        super().__init__(name="reference-data-listener", daemon=True)
+        self.announced_version = 0
+
+    def run(self):
+        while True:
+            try:
+                pubsub = get_redis_client().pubsub(ignore_subscribe_messages=True)
+                pubsub.subscribe(settings.REFERENCE_DATA_CHANNEL)
+                while True:
+                    message = pubsub.get_message(timeout=LISTENER_RETRY_INTERVAL)
+                    if message is not None:
+                        self.announced_version = max(self.announced_version, int(message["data"]))
+            except (redis.RedisError, ValueError) as e:
+                logger.warning(f"Reference data listener disconnected, retrying in {LISTENER_RETRY_INTERVAL}s: {e}")
+            time.sleep(LISTENER_RETRY_INTERVAL)
+
+
+_lock = threading.Lock()
+_snapshot: Optional[CompiledReference] = None
+_checked_at = 0.0
+_listener: Optional[VersionListener] = None
+_listener_pid = None
+
+
+def _ensure_listener() -> VersionListener:
+    global _listener, _listener_pid
+    # Threads do not survive a fork, e.g. into django-q workers
+    if _listener is None or _listener_pid != os.getpid():
+        with _lock:
+            if _listener is None or _listener_pid != os.getpid():
+                _listener = VersionListener()
+                _listener_pid = os.getpid()
+                _listener.start()
+    return _listener
+
+
+def get_compiled_reference() -> CompiledReference:
+    """
+    Get this process's reference data snapshot, recompiling it when stale.
+
+    Returns:
+        CompiledReference: Live reference rows at the current version
+    """
+    global _snapshot, _checked_at
+    listener = _ensure_listener()
+    snapshot = _snapshot
+    now = time.monotonic()
+    if (
+        snapshot is not None
+        and listener.announced_version <= snapshot.version
+        and now - _checked_at < settings.REFERENCE_SNAPSHOT_MAX_AGE
+    ):
+        return snapshot
+
+    with _lock:
+        snapshot = _snapshot
+        version = get_reference_version()
+        if version < listener.announced_version:
+            # Another process announced a version this process's cache has not seen
+            delete_cache(VERSION_CACHE_KEY)
+            version = get_reference_version()
+        if snapshot is None or snapshot.version != version:
+            snapshot = _snapshot = compile_reference(version)
+        _checked_at = time.monotonic()
+    return snapshot
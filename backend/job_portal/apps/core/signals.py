@@ -0,0 +1,26 @@
+from django.db.models.signals import post_delete, post_save
+
+from .models import SystemSettings
+from .reference_snapshot import REFERENCE_MODELS, invalidate_reference_version
+from .system_settings import invalidate_settings
+
+
+def reference_data_saved(sender, **kwargs):
+    invalidate_reference_version()
+
+
+def reference_data_deleted(sender, **kwargs):
+    invalidate_reference_version(hard_delete=True)
+
+
+for model in REFERENCE_MODELS:
+    post_save.connect(reference_data_saved, sender=model, dispatch_uid=f"reference_data_saved_{model._meta.label}")
+    post_delete.connect(reference_data_deleted, sender=model, dispatch_uid=f"reference_data_deleted_{model._meta.label}")
+
+
+def system_settings_changed(sender, **kwargs):
+    invalidate_settings()
+
+
+post_save.connect(system_settings_changed, sender=SystemSettings, dispatch_uid="system_settings_saved")
+post_delete.connect(system_settings_changed, sender=SystemSettings, dispatch_uid="system_settings_deleted")
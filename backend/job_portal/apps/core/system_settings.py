@@ -0,0 +1,109 @@
+"""
+Runtime access to ``SystemSettings``.
+
+Each process loads every active setting once, parsed by ``setting_type``,
+and serves ``get_setting`` from memory. Writes (the API viewset and the
+admin both go through ``save``/``delete``) bump a version key in the shared
+cache after commit; processes compare their copy against it at most every
+``VERSION_CHECK_INTERVAL`` seconds and reload when it moved. Parsed JSON
+values are shared, so callers must not mutate them.
+"""
+
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Any, Mapping, Optional
+
+from django.core.cache import cache
+from django.db import transaction
+
+from utils.cache_utils import get_cache, set_cache
+
+from .models import SystemSettings
+
+logger = logging.getLogger(__name__)
+
+VERSION_CACHE_KEY = "system_settings_version"
+VERSION_CHECK_INTERVAL = 5
+
+
+@dataclass(frozen=True)
+class LoadedSettings:
+    version: str
+    values: Mapping[str, Any]
+    public: Mapping[str, Any]
+
+
+def get_settings_version() -> str:
+    version = get_cache(VERSION_CACHE_KEY)
+    if version is None:
+        # First reader after a cache flush picks the version every process will see
+        cache.add(VERSION_CACHE_KEY, str(time.time_ns()), None)
+        version = get_cache(VERSION_CACHE_KEY)
+    return version
+
+
+def bump_settings_version() -> None:
+    global _checked_at
+    set_cache(VERSION_CACHE_KEY, str(time.time_ns()), None)
+    _checked_at = 0.0
+
+
+def invalidate_settings() -> None:
+    """Make every process reload the settings once the current transaction commits."""
+    transaction.on_commit(bump_settings_version)
+
+
+def load_settings(version: str) -> LoadedSettings:
+    values, public = {}, {}
+    for setting in SystemSettings.objects.filter(is_active=True):
+        try:
+            value = setting.parse_value()
+        except ValueError as e:
+            logger.warning(f"Ignoring system setting {setting.key!r}: {e}")
+            continue
+        values[setting.key] = value
+        if setting.is_public:
+            public[setting.key] = value
+    return LoadedSettings(version, MappingProxyType(values), MappingProxyType(public))
+
+
+_lock = threading.Lock()
+_loaded: Optional[LoadedSettings] = None
+_checked_at = 0.0
+
+
+def get_loaded_settings() -> LoadedSettings:
+    """
+    Get this process's copy of the active settings, reloading it when the version moved.
+
+    Returns:
+        LoadedSettings: Parsed values of all active settings and of the public ones
+    """
+    global _loaded, _checked_at
+    loaded = _loaded
+    if loaded is not None and time.monotonic() - _checked_at < VERSION_CHECK_INTERVAL:
+        return loaded
+
+    with _lock:
+        version = get_settings_version()
+        if _loaded is None or _loaded.version != version:
+            _loaded = load_settings(version)
+        _checked_at = time.monotonic()
+        return _loaded
+
+
+def get_setting(key: str, default: Any = None) -> Any:
+    """
+    Get the typed value of an active system setting.
+
+    Args:
+        key (str): Setting key
+        default: Value returned when the setting is missing, inactive or invalid
+
+    Returns:
+        The value parsed according to the setting's ``setting_type``
+    """
+    return get_loaded_settings().values.get(key, default)
@@ -3,7 +3,8 @@ from rest_framework.routers import DefaultRouter
 
 from .api.views import (
     LanguageReadOnlyModelViewSet, ServiceCategoryViewSet, ServiceSubcategoryViewSet,
-    ServiceAreaViewSet, SystemSettingsViewSet, SupportFAQViewSet
+    ServiceAreaViewSet, SystemSettingsViewSet, SupportFAQViewSet, ReferenceDataAPIView,
+    PublicSettingsAPIView
 )
 
 app_name = 'core'
@@ -17,6 +18,7 @@ router.register(r'system-settings', SystemSettingsViewSet, basename='systemsetti
 router.register(r'support/faq', SupportFAQViewSet, basename='supportfaq')
 
 urlpatterns = [
-    # All endpoints handled by router
+    path('api/v1/core/reference-data/', ReferenceDataAPIView.as_view(), name='reference-data'),
+    path('api/v1/core/public-settings/', PublicSettingsAPIView.as_view(), name='public-settings'),
     path('api/v1/core/', include(router.urls)),
 ]
@@ -0,0 +1,91 @@
+"""
+Job view tracking.
+
+A job detail view costs two Redis round trips (three for a user's first view
+of the job in the trending window) and no database write:
+
+- ``Job.view_count`` goes through the buffered counter (``utils.counters``);
+- ``jobviews:<date>`` is a hash of views per job for the day;
+- ``jobviews:<date>:<job id>`` and ``jobviews:all:<job id>`` are HyperLogLogs
+  of the viewers' user IDs, for unique viewers per day and overall (about
+  1% error, at most 12KB per key);
+- a user's first view of the job in the trending window also counts towards
+  the trending scores (``jobs.trending``); later ones only count above.
+
+``jobs.tasks.rollup_job_views`` copies the daily keys into ``JobDailyStats``.
+Day keys expire after ``DAY_KEY_TTL``, so a missed rollup can be rerun within
+that window.
+"""
+
+import datetime
+import logging
+from typing import Dict, Iterable
+
+import redis
+from django.utils import timezone
+
+from utils.counters import get_counter, get_redis_client
+
+from . import trending
+from .models import Job
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = "jobviews"
+DAY_KEY_TTL = 3 * 24 * 60 * 60
+# Refreshed by every view, so only jobs nobody looked at for this long lose their history
+ALL_TIME_KEY_TTL = 180 * 24 * 60 * 60
+
+
+def day_key(day: datetime.date) -> str:
+    return f"{KEY_PREFIX}:{day.isoformat()}"
+
+
+def day_viewers_key(day: datetime.date, job_id) -> str:
+    return f"{KEY_PREFIX}:{day.isoformat()}:{job_id}"
+
+
+def viewers_key(job_id) -> str:
+    return f"{KEY_PREFIX}:all:{job_id}"
+
+
+def record_job_view(job: Job, user) -> None:
+    """Count a view of ``job`` by ``user``."""
+    get_counter(Job, "view_count").incr(job.pk)
+    today = timezone.localdate()
+    try:
+        with get_redis_client().pipeline(transaction=False) as pipe:
+            pipe.hincrby(day_key(today), job.pk, 1)
+            pipe.expire(day_key(today), DAY_KEY_TTL)
+            pipe.pfadd(day_viewers_key(today, job.pk), user.pk)
+            pipe.expire(day_viewers_key(today, job.pk), DAY_KEY_TTL)
+            pipe.pfadd(viewers_key(job.pk), user.pk)
+            pipe.expire(viewers_key(job.pk), ALL_TIME_KEY_TTL)
+            trending.claim_once(pipe, "view", job, user)
+            first_view = pipe.execute()[-1]
+            if first_view:
+                with get_redis_client().pipeline(transaction=False) as pipe:
+                    trending.add_event(pipe, "view", job)
+                    pipe.execute()
+    except redis.RedisError as e:
+        logger.warning(f"Could not record a view of job {job.pk}: {e}")
+
+
+def get_unique_viewers(job_ids: Iterable) -> Dict:
+    """
+    Get the estimated number of distinct viewers of each job.
+
+    Returns:
+        dict: job id -> unique viewers; empty if Redis is unreachable
+    """
+    job_ids = list(job_ids)
+    if not job_ids:
+        return {}
+    try:
+        with get_redis_client().pipeline(transaction=False) as pipe:
+            for job_id in job_ids:
+                pipe.pfcount(viewers_key(job_id))
+            return dict(zip(job_ids, pipe.execute()))
+    except redis.RedisError as e:
+        logger.warning(f"Could not count unique job viewers: {e}")
+        return {}
@@ -1,23 +1,45 @@
 import django_filters.rest_framework as django_filters
+from rest_framework.filters import OrderingFilter
 from rest_framework.serializers import ValidationError
 from django.db.models import Q
 
+from job_portal.apps.core.models import ServiceCategory, ServiceSubcategory
+from job_portal.apps.core.reference_snapshot import get_compiled_reference
+from job_portal.apps.locations.models import City
 from ..models import JobApplication, Job, JobStatus, JobApplicationStatus, JobUrgency, JobAssignment, JobAssignmentStatus
+from ..trending import get_trending, rank_expression
 
 
 class JobFilter(django_filters.FilterSet):
-    """Filter for Job model with master dashboard support."""
+    """
+    Filter for Job model with master dashboard support.
+
+    ``city`` and ``service_category`` take an ID or, as a fallback, part of a
+    name. Both are resolved through the reference snapshot into
+    ``city_id``/``service_subcategory_id`` lists, so the query joins neither
+    table and can use the ``(status, city, created_at)`` and
+    ``(status, service_subcategory, created_at)`` indexes.
+
+    The snapshot holds live rows only. A city ID is matched as given, and a
+    category ID missing from the snapshot (soft-deleted) falls back to its
+    subcategories in the database, as ``ReferencePrimaryKeyRelatedField``
+    does. Names only match live cities and categories, and a category's
+    soft-deleted subcategories are not included.
+    """
     
     # Price filtering
     min_price = django_filters.NumberFilter(field_name='budget_min', lookup_expr='gte')
     max_price = django_filters.NumberFilter(field_name='budget_max', lookup_expr='lte')
     
     # Service filtering
-    service_subcategory = django_filters.NumberFilter(field_name='service_subcategory__id')
-    service_category = django_filters.NumberFilter(field_name='service_subcategory__category__id')
+    service_subcategory = django_filters.NumberFilter(field_name='service_subcategory_id')
+    service_category = django_filters.CharFilter(
+        method='filter_service_category',
+        help_text='Category ID, or part of the name of an active category',
+    )
     
     # Location filtering
-    city = django_filters.CharFilter(field_name='city__name', lookup_expr='icontains')
+    city = django_filters.CharFilter(method='filter_city', help_text='City ID, or part of the name of an active city')
     
     # Time filtering
     service_date_from = django_filters.DateFilter(field_name='service_date', lookup_expr='gte')
@@ -33,7 +55,31 @@ class JobFilter(django_filters.FilterSet):
             'min_price', 'max_price', 'service_subcategory', 'service_category',
             'city', 'service_date_from', 'service_date_to', 'urgency'
         ]
-    
+
+    @staticmethod
+    def resolve_ids(table, value):
+        """IDs named by a filter value: the ID itself, or the live rows whose name contains it."""
+        value = value.strip()
+        if value.isdigit():
+            return {int(value)}
+        return table.search('name', value)
+
+    def filter_city(self, queryset, name, value):
+        city_ids = self.resolve_ids(get_compiled_reference().tables[City], value)
+        return queryset.filter(city_id__in=city_ids)
+
+    def filter_service_category(self, queryset, name, value):
+        reference = get_compiled_reference()
+        categories = reference.tables[ServiceCategory]
+        category_ids = self.resolve_ids(categories, value)
+        subcategories_by_category = reference.tables[ServiceSubcategory].group_by('category_id')
+        subcategory_ids = set().union(*(subcategories_by_category.get(category_id, ()) for category_id in category_ids))
+        missing = [category_id for category_id in category_ids if category_id not in categories.rows]
+        if missing:
+            subcategory_ids.update(
+                ServiceSubcategory._base_manager.filter(category_id__in=missing).values_list('pk', flat=True)
+            )
+        return queryset.filter(service_subcategory_id__in=subcategory_ids)
 
 
 class JobApplicationFilter(django_filters.FilterSet):
@@ -75,3 +121,30 @@ class JobAssignmentFilter(django_filters.FilterSet):
     class Meta:
         model = JobAssignment
         fields = ['status', 'job', 'assigned_at', 'started_at', 'completed_at']
+
+
+class TrendingJobOrderingFilter(OrderingFilter):
+    """
+    ``OrderingFilter`` that also accepts ``ordering=trending``.
+
+    Trending jobs come first in the order of the cached trending list, the
+    rest follow by the view's default ordering.
+    """
+
+    trending_field = "trending"
+
+    def get_valid_fields(self, queryset, view, context={}):
+        return super().get_valid_fields(queryset, view, context) + [(self.trending_field, "Trending")]
+
+    def filter_queryset(self, request, queryset, view):
+        ordering = self.get_ordering(request, queryset, view)
+        if not ordering or self.trending_field not in [term.lstrip("-") for term in ordering]:
+            return super().filter_queryset(request, queryset, view)
+
+        queryset = queryset.annotate(trending_rank=rank_expression(get_trending("jobs")))
+        ordering = [
+            term.replace(self.trending_field, "trending_rank") if term.lstrip("-") == self.trending_field else term
+            for term in ordering
+        ]
+        ordering += [term for term in self.get_default_ordering(view) or [] if term not in ordering]
+        return queryset.order_by(*ordering)
@@ -1,10 +1,13 @@
 from rest_framework import permissions
 
+from ..models import JobStatus
+
 
 class JobAccessPermission(permissions.BasePermission):
     """
     Custom permission to only allow owners of a job or applicants to access it.
     Employers can manage applications for their jobs.
+    Masters can read published jobs, and jobs they applied to in any state.
     """
 
     def has_object_permission(self, request, view, obj):
@@ -15,4 +18,9 @@ class JobAccessPermission(permissions.BasePermission):
         if hasattr(request.user, 'employer_profile') and obj.employer == request.user.employer_profile:
             return True
 
+        if request.method in permissions.SAFE_METHODS and hasattr(request.user, 'master_profile'):
+            if obj.status == JobStatus.PUBLISHED:
+                return True
+            return obj.applications.filter(applicant=request.user.master_profile).exists()
+
         return False
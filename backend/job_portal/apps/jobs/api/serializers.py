@@ -1,14 +1,22 @@
 from django.core.validators import FileExtensionValidator, get_available_image_extensions
 from rest_framework import serializers
 
-from job_portal.apps.attachments.serializers import AttachmentSerializer
+from job_portal.apps.attachments.serializers import (
+    AttachmentSerializer,
+    ChunkedUploadField,
+    PrimeAttachmentURLsListSerializer,
+    merge_chunked_uploads,
+)
+from job_portal.apps.core.api.fields import ReferencePrimaryKeyRelatedField
 from job_portal.apps.core.api.serializers import ServiceSubcategorySerializer
 from job_portal.apps.core.models import ServiceSubcategory
-from job_portal.apps.jobs.models import Job, JobApplication, JobAssignment, JobStatus
+from job_portal.apps.jobs.analytics import get_unique_viewers
+from job_portal.apps.jobs.models import Job, JobApplication, JobAssignment, JobDailyStats, JobStatus
 from job_portal.apps.locations.api.serializers import CitySerializer
 from job_portal.apps.locations.models import City
 from job_portal.apps.users.api.serializers import UserDetailChildSerializer
 from job_portal.apps.users.models import Employer, Master
+from utils.counters import BufferedCountersListSerializer, BufferedCountersSerializerMixin
 from utils.serializers import AbstractTimestampedModelSerializer
 
 
@@ -22,18 +30,22 @@ class EmployerBasicSerializer(serializers.ModelSerializer):
         fields = ["id", "user", "total_orders", "completed_orders", "cancelled_orders", "contact_phone"]
 
 
-class JobSerializer(AbstractTimestampedModelSerializer):
+class JobListSerializer(BufferedCountersListSerializer, PrimeAttachmentURLsListSerializer):
+    """Batches the attachment URLs and pending view counts of a page of jobs."""
+
+
+class JobSerializer(BufferedCountersSerializerMixin, AbstractTimestampedModelSerializer):
     attachments = AttachmentSerializer(many=True, read_only=True)
     employer = EmployerBasicSerializer(read_only=True)
     city = CitySerializer(read_only=True)
-    city_id = serializers.PrimaryKeyRelatedField(
+    city_id = ReferencePrimaryKeyRelatedField(
         queryset=City.objects.all(),
         source="city",
         write_only=True,
         help_text="ID of the city",
     )
     service_subcategory = ServiceSubcategorySerializer(read_only=True)
-    service_subcategory_id = serializers.PrimaryKeyRelatedField(
+    service_subcategory_id = ReferencePrimaryKeyRelatedField(
         queryset=ServiceSubcategory.objects.all(),
         source="service_subcategory",
         write_only=True,
@@ -61,10 +73,41 @@ class JobSerializer(AbstractTimestampedModelSerializer):
             "final_price",
             "special_requirements",
             "attachments",
+            "view_count",
             "created_at",
             "updated_at",
         ]
-        read_only_fields = ["id", "employer", "created_at", "updated_at"]
+        read_only_fields = ["id", "employer", "view_count", "created_at", "updated_at"]
+        list_serializer_class = JobListSerializer
+        buffered_counters = ["view_count"]
+
+
+class JobDailyStatsSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = JobDailyStats
+        fields = ["date", "views", "unique_viewers"]
+
+
+class MyJobListSerializer(JobListSerializer):
+    """Also counts the unique viewers of the page in one Redis round trip."""
+
+    def to_representation(self, data):
+        iterable = list(data.all() if hasattr(data, "all") else data)
+        unique_viewers = get_unique_viewers(item.pk for item in iterable)
+        for item in iterable:
+            item.unique_viewers = unique_viewers.get(item.pk)
+        return super().to_representation(iterable)
+
+
+class MyJobSerializer(JobSerializer):
+    """Job with the view analytics shown to its employer."""
+
+    unique_viewers = serializers.IntegerField(read_only=True, allow_null=True, default=None)
+    daily_stats = JobDailyStatsSerializer(source="recent_daily_stats", many=True, read_only=True, default=list)
+
+    class Meta(JobSerializer.Meta):
+        fields = JobSerializer.Meta.fields + ["unique_viewers", "daily_stats"]
+        list_serializer_class = MyJobListSerializer
 
 
 class JobApplicationSerializer(AbstractTimestampedModelSerializer):
@@ -228,8 +271,28 @@ class JobAttachmentUploadSerializer(serializers.Serializer):
         ),
         allow_empty=False,
         write_only=True,
+        required=False,
         validators=[validate_total_size]
     )
+    upload_ids = serializers.ListField(
+        child=ChunkedUploadField(
+            validators=[
+                FileExtensionValidator(allowed_extensions=get_available_image_extensions()),
+                validate_file_size,
+            ],
+        ),
+        allow_empty=False,
+        write_only=True,
+        required=False,
+        help_text="IDs of completed chunked uploads (api/v1/uploads/)",
+    )
+
+    def validate(self, attrs):
+        files = merge_chunked_uploads(attrs, "files", "upload_ids")
+        if not files:
+            raise serializers.ValidationError({"files": "No files provided"})
+        validate_total_size(files)
+        return attrs
 
 
 class JobAssignmentAttachmentUploadSerializer(serializers.Serializer):
@@ -244,5 +307,25 @@ class JobAssignmentAttachmentUploadSerializer(serializers.Serializer):
         ),
         allow_empty=False,
         write_only=True,
+        required=False,
         validators=[validate_total_size]
     )
+    upload_ids = serializers.ListField(
+        child=ChunkedUploadField(
+            validators=[
+                FileExtensionValidator(allowed_extensions=get_available_image_extensions()),
+                validate_file_size,
+            ],
+        ),
+        allow_empty=False,
+        write_only=True,
+        required=False,
+        help_text="IDs of completed chunked uploads (api/v1/uploads/)",
+    )
+
+    def validate(self, attrs):
+        files = merge_chunked_uploads(attrs, "files", "upload_ids")
+        if not files:
+            raise serializers.ValidationError({"files": "No files provided"})
+        validate_total_size(files)
+        return attrs
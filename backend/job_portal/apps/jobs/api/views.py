@@ -1,5 +1,8 @@
+from datetime import timedelta
+
 from rest_framework.serializers import ValidationError
 from django.db import transaction
+from django.db.models import Prefetch
 from django.utils import timezone
 from django_filters.rest_framework import DjangoFilterBackend
 from drf_spectacular.utils import extend_schema
@@ -20,6 +23,9 @@ from job_portal.apps.users.api.permissions import HasEmployerProfile, HasMasterP
 from utils.permissions import (
     HasSpecificPermission,
 )
+from utils.query_planner import SerializerQueryPlanMixin
+from .. import trending
+from ..analytics import record_job_view
 from .filters import JobApplicationFilter, JobFilter, JobAssignmentFilter
 from .permissions import JobAccessPermission
 from .serializers import (
@@ -31,6 +37,7 @@ from .serializers import (
     JobAssignmentSerializer,
     JobAttachmentUploadSerializer,
     JobSerializer,
+    MyJobSerializer,
     ProgressUpdateSerializer,
 )
 from ..models import (
@@ -41,6 +48,7 @@ from ..models import (
     JobApplicationStatus,
     JobAssignment,
     JobAssignmentStatus,
+    JobDailyStats,
     JobStatus,
 )
 
@@ -49,7 +57,10 @@ class _JobApiActionSerializer(CResponseSerializer):
     data = JobSerializer(read_only=True)
 
 
-class JobAPIViewSet(viewsets.ModelViewSet):
+MY_JOBS_STATS_DAYS = 14
+
+
+class JobAPIViewSet(SerializerQueryPlanMixin, viewsets.ModelViewSet):
     """ViewSet for managing jobs."""
 
     permission_classes = [IsAuthenticated]
@@ -66,12 +77,15 @@ class JobAPIViewSet(viewsets.ModelViewSet):
     ordering = ["-created_at"]
 
     def get_queryset(self):
-        qs = Job.objects.select_related(
-            "employer__user", "service_subcategory", "city__country"
-        )
+        qs = Job.objects.all()
         if self.action in ["list"]:
             qs = qs.filter(status=JobStatus.PUBLISHED)
-        return qs
+        return self.plan_queryset(qs)
+
+    def get_serializer_class(self):
+        if self.action == "my_jobs":
+            return MyJobSerializer
+        return super().get_serializer_class()
 
     def get_permissions(self):
         perms = super().get_permissions()
@@ -98,6 +112,12 @@ class JobAPIViewSet(viewsets.ModelViewSet):
             ]
         return perms
 
+    def retrieve(self, request, *args, **kwargs):
+        instance = self.get_object()
+        if instance.employer.user_id != request.user.id:
+            record_job_view(instance, request.user)
+        return Response(self.get_serializer(instance).data)
+
     def perform_create(self, serializer):
         serializer.save(employer=self.request.user.employer_profile)
 
@@ -176,6 +196,7 @@ class JobAPIViewSet(viewsets.ModelViewSet):
             applicant=master_profile,
             status=JobApplicationStatus.PENDING,
         )
+        trending.record_event("application", job, request.user)
         notify(
             verb="application_received",
             sender=job_application.applicant.user,
@@ -215,6 +236,7 @@ class JobAPIViewSet(viewsets.ModelViewSet):
                     },
                 }
             )
+        trending.record_event("bookmark", job, request.user)
         return Response(
             {
                 "message": "Job bookmarked successfully",
@@ -313,8 +335,9 @@ class JobAPIViewSet(viewsets.ModelViewSet):
         return Response(serializer.data)
 
     @extend_schema(
-        description="Get my jobs (all jobs created by current employer)",
-        responses={200: JobSerializer(many=True)},
+        description="Get my jobs (all jobs created by current employer) with their view statistics "
+                    f"for the last {MY_JOBS_STATS_DAYS} days",
+        responses={200: MyJobSerializer(many=True)},
         operation_id="v1_jobs_my_jobs",
     )
     @action(
@@ -325,7 +348,15 @@ class JobAPIViewSet(viewsets.ModelViewSet):
     def my_jobs(self, request, *args, **kwargs):
         """Get all jobs created by the current employer (including drafts)."""
         queryset = self.filter_queryset(self.get_queryset())
-        queryset = queryset.filter(employer=request.user.employer_profile)
+        queryset = queryset.filter(employer=request.user.employer_profile).prefetch_related(
+            Prefetch(
+                "daily_stats",
+                queryset=JobDailyStats.objects.filter(
+                    date__gt=timezone.localdate() - timedelta(days=MY_JOBS_STATS_DAYS)
+                ).order_by("date"),
+                to_attr="recent_daily_stats",
+            )
+        )
 
         page = self.paginate_queryset(queryset)
         if page is not None:
@@ -343,7 +374,7 @@ class _JobApplicationApiActionSerializer(CResponseSerializer):
     data = _JobApplicationApiActionDataSerializer(read_only=True)
 
 
-class JobApplicationAPIViewSet(viewsets.ModelViewSet):
+class JobApplicationAPIViewSet(SerializerQueryPlanMixin, viewsets.ModelViewSet):
     """ViewSet for managing job applications."""
 
     permission_classes = [IsAuthenticated]
@@ -361,15 +392,15 @@ class JobApplicationAPIViewSet(viewsets.ModelViewSet):
     ordering = ["-created_at"]
 
     def get_queryset(self):
-        qs = JobApplication.objects.select_related("job__employer", "applicant")
+        qs = JobApplication.objects.all()
         user = self.request.user
         if hasattr(user, "employer_profile"):
             qs = qs.filter(job__employer=user.employer_profile)
         elif hasattr(user, "master_profile"):
             qs = qs.filter(applicant=user.master_profile)
         else:
-            qs = JobApplication.objects.none()
-        return qs
+            return JobApplication.objects.none()
+        return self.plan_queryset(qs)
     
     def get_permissions(self):
         perms = super().get_permissions()
@@ -540,7 +571,7 @@ class _JobAssignmentApiActionSerializer(CResponseSerializer):
     data = WrapperSerializer(read_only=True)
 
 
-class JobAssignmentViewSet(viewsets.ModelViewSet):
+class JobAssignmentViewSet(SerializerQueryPlanMixin, viewsets.ModelViewSet):
     permission_classes = [IsAuthenticated, HasMasterProfile]
     serializer_class = JobAssignmentSerializer
     filter_backends = [DjangoFilterBackend, OrderingFilter]
@@ -552,10 +583,8 @@ class JobAssignmentViewSet(viewsets.ModelViewSet):
     ]
 
     def get_queryset(self):
-        qs = JobAssignment.objects.select_related(
-            "job", "master", "accepted_application"
-        ).filter(master=self.request.user.master_profile)
-        return qs
+        qs = JobAssignment.objects.filter(master=self.request.user.master_profile)
+        return self.plan_queryset(qs)
 
     def perform_destroy(self, instance: JobAssignment):
         instance.attachments.all().delete()
@@ -676,7 +705,7 @@ class JobAttachmentAPIViewSet(
     viewsets.GenericViewSet,
 ):
     permission_classes = [IsAuthenticated, IsAttachmentOwner, HasEmployerProfile]
-    parser_classes = [parsers.MultiPartParser, parsers.FormParser]
+    parser_classes = [parsers.MultiPartParser, parsers.FormParser, parsers.JSONParser]
 
     def _get_job_obj(self) -> Job:
         if hasattr(self.request, "_job_obj"):
@@ -704,8 +733,7 @@ class JobAttachmentAPIViewSet(
         if not files:
             raise ValidationError("No files provided")
         attachments = create_attachments(files, self.request.user, job)
-        for a in attachments:
-            job.attachments.add(a)
+        job.attachments.add(*attachments)
         return attachments
 
 
@@ -716,7 +744,7 @@ class AssignmentAttachmentAPIViewSet(
     viewsets.GenericViewSet,
 ):
     permission_classes = [IsAuthenticated, IsAttachmentOwner, HasMasterProfile]
-    parser_classes = [parsers.MultiPartParser, parsers.FormParser]
+    parser_classes = [parsers.MultiPartParser, parsers.FormParser, parsers.JSONParser]
 
     def _get_job_assignment_obj(self) -> JobAssignment:
         if hasattr(self.request, "_job_assignment_obj"):
@@ -743,7 +771,6 @@ class AssignmentAttachmentAPIViewSet(
         files = serializer.validated_data["files"]
         if not files:
             raise ValidationError("No files provided")
-        attachments = create_attachments(files, self.request.user, assignment)
-        for a in attachments:
-            assignment.attachments.add(a)
+        attachments = create_attachments(files, self.request.user, assignment, is_public=False)
+        assignment.attachments.add(*attachments)
         return attachments
@@ -0,0 +1,21 @@
+# Generated by Django 5.0.2 on 2026-10-19 07:01
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0002_remove_jobapplication_deleted_at_and_more'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='job',
+            index=models.Index(condition=models.Q(('is_deleted', False)), fields=['status', '-created_at'], name='jobs_job_status_5102ce_live'),
+        ),
+        migrations.AddIndex(
+            model_name='job',
+            index=models.Index(condition=models.Q(('is_deleted', False)), fields=['employer', '-created_at'], name='jobs_job_employe_e08e65_live'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.0.2 on 2026-10-19 07:14
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0003_job_soft_delete_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='job',
+            name='view_count',
+            field=models.PositiveIntegerField(default=0, verbose_name='View Count'),
+        ),
+    ]
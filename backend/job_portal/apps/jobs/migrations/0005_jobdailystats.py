@@ -0,0 +1,30 @@
+# Generated by Django 5.0.2 on 2026-10-19 07:16
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0004_job_view_count'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='JobDailyStats',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField(verbose_name='Date')),
+                ('views', models.PositiveIntegerField(default=0, verbose_name='Views')),
+                ('unique_viewers', models.PositiveIntegerField(default=0, verbose_name='Unique Viewers')),
+                ('job', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='daily_stats', to='jobs.job')),
+            ],
+            options={
+                'verbose_name': 'Job Daily Stats',
+                'verbose_name_plural': 'Job Daily Stats',
+                'ordering': ['job', 'date'],
+                'unique_together': {('job', 'date')},
+            },
+        ),
+    ]
@@ -0,0 +1,32 @@
+from django.db import migrations
+
+SCHEDULE_NAME = "rollup_job_views"
+
+
+def create_schedule(apps, schema_editor):
+    Schedule = apps.get_model("django_q", "Schedule")
+    Schedule.objects.update_or_create(
+        name=SCHEDULE_NAME,
+        defaults={
+            "func": "job_portal.apps.jobs.tasks.rollup_job_views",
+            "schedule_type": "H",
+            "repeats": -1,
+        },
+    )
+
+
+def delete_schedule(apps, schema_editor):
+    Schedule = apps.get_model("django_q", "Schedule")
+    Schedule.objects.filter(name=SCHEDULE_NAME).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("jobs", "0005_jobdailystats"),
+        ("django_q", "0017_task_cluster_alter"),
+    ]
+
+    operations = [
+        migrations.RunPython(create_schedule, delete_schedule),
+    ]
@@ -0,0 +1,33 @@
+from django.db import migrations
+
+SCHEDULE_NAME = "update_trending"
+
+
+def create_schedule(apps, schema_editor):
+    Schedule = apps.get_model("django_q", "Schedule")
+    Schedule.objects.update_or_create(
+        name=SCHEDULE_NAME,
+        defaults={
+            "func": "job_portal.apps.jobs.tasks.update_trending",
+            "schedule_type": "I",
+            "minutes": 10,
+            "repeats": -1,
+        },
+    )
+
+
+def delete_schedule(apps, schema_editor):
+    Schedule = apps.get_model("django_q", "Schedule")
+    Schedule.objects.filter(name=SCHEDULE_NAME).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("jobs", "0006_schedule_job_view_rollup"),
+        ("django_q", "0017_task_cluster_alter"),
+    ]
+
+    operations = [
+        migrations.RunPython(create_schedule, delete_schedule),
+    ]
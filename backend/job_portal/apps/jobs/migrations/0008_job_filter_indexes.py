@@ -0,0 +1,21 @@
+# Generated by Django 5.0.2 on 2026-10-19 07:23
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0007_schedule_trending_update'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='job',
+            index=models.Index(condition=models.Q(('is_deleted', False)), fields=['status', 'city', '-created_at'], name='jobs_job_status_bd646a_live'),
+        ),
+        migrations.AddIndex(
+            model_name='job',
+            index=models.Index(condition=models.Q(('is_deleted', False)), fields=['status', 'service_subcategory', '-created_at'], name='jobs_job_status_344d18_live'),
+        ),
+    ]
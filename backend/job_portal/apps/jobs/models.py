@@ -73,6 +73,19 @@ class Job(AbstractCascadingSoftDeleteModel, AbstractTimestampedModel):
     completed_at = models.DateTimeField(_("Completed At"), null=True, blank=True)
     cancelled_at = models.DateTimeField(_("Cancelled At"), null=True, blank=True)
 
+    # Incremented through utils.counters
+    view_count = models.PositiveIntegerField(_("View Count"), default=0)
+
+    soft_delete_indexes = [
+        # Published job search and feeds, newest first
+        ("status", "-created_at"),
+        # Job filters by city and by category (resolved to subcategory IDs)
+        ("status", "city", "-created_at"),
+        ("status", "service_subcategory", "-created_at"),
+        # Employer's own jobs (my_jobs)
+        ("employer", "-created_at"),
+    ]
+
     class Meta:
         verbose_name = _("Job")
         verbose_name_plural = _("Jobs")
@@ -216,3 +229,21 @@ class FavoriteJob(AbstractTimestampedModel):
 
     def __str__(self):
         return f"{self.user.username} favorited {self.job.title} [#{self.id}]"
+
+
+class JobDailyStats(models.Model):
+    """Views of a job per day, rolled up from Redis by ``jobs.tasks.rollup_job_views``."""
+
+    job = models.ForeignKey(Job, on_delete=models.CASCADE, related_name='daily_stats')
+    date = models.DateField(_("Date"))
+    views = models.PositiveIntegerField(_("Views"), default=0)
+    unique_viewers = models.PositiveIntegerField(_("Unique Viewers"), default=0)
+
+    class Meta:
+        verbose_name = _("Job Daily Stats")
+        verbose_name_plural = _("Job Daily Stats")
+        ordering = ['job', 'date']
+        unique_together = ['job', 'date']
+
+    def __str__(self):
+        return f"{self.job_id} on {self.date}: {self.views} views [#{self.id}]"
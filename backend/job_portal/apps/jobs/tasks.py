@@ -0,0 +1,94 @@
+import datetime
+import logging
+import time
+from collections import defaultdict
+
+from django.utils import timezone
+
+from job_portal.apps.core.models import ServiceSubcategory
+from utils.cache_utils import set_cache
+from utils.counters import get_redis_client
+from . import trending
+from .analytics import day_key, day_viewers_key
+from .models import Job, JobDailyStats, JobStatus
+
+logger = logging.getLogger(__name__)
+
+ROLLUP_BATCH_SIZE = 1000
+
+
+def rollup_job_views(days=2):
+    """
+    django-q task: copy the per-day job views from Redis into ``JobDailyStats``.
+
+    Rows are upserted, so rolling up the same day again (the schedule covers
+    today and yesterday every hour) only refreshes it.
+
+    Args:
+        days (int): Number of days to roll up, ending today
+
+    Returns:
+        int: Number of rows written
+    """
+    client = get_redis_client()
+    today = timezone.localdate()
+    written = 0
+    for offset in range(days):
+        day = today - datetime.timedelta(days=offset)
+        views = {int(job_id): int(count) for job_id, count in client.hgetall(day_key(day)).items()}
+        job_ids = list(Job._base_manager.filter(pk__in=views).values_list("pk", flat=True))
+        for start in range(0, len(job_ids), ROLLUP_BATCH_SIZE):
+            batch = job_ids[start:start + ROLLUP_BATCH_SIZE]
+            with client.pipeline(transaction=False) as pipe:
+                for job_id in batch:
+                    pipe.pfcount(day_viewers_key(day, job_id))
+                unique_viewers = pipe.execute()
+            JobDailyStats.objects.bulk_create(
+                [
+                    JobDailyStats(job_id=job_id, date=day, views=views[job_id], unique_viewers=uniques)
+                    for job_id, uniques in zip(batch, unique_viewers)
+                ],
+                update_conflicts=True,
+                unique_fields=["job", "date"],
+                update_fields=["views", "unique_viewers"],
+            )
+            written += len(batch)
+    logger.info(f"Rolled up views of {written} job days")
+    return written
+
+
+def update_trending():
+    """
+    django-q task: recompute the trending scores and cache the top lists.
+
+    Scores decay with ``trending.HALF_LIFE_SECONDS``. Twice as many jobs as
+    listed are scored so that closed or deleted ones can be dropped.
+
+    Returns:
+        dict: Number of entries published per kind
+    """
+    client = get_redis_client()
+    now = time.time()
+    published = {}
+
+    job_scores = trending.decayed_scores(client, "jobs", now)
+    candidates = [job_id for job_id, _score in trending.top(job_scores, trending.TOP_N["jobs"] * 2)]
+    live = set(Job.objects.filter(pk__in=candidates, status=JobStatus.PUBLISHED).values_list("pk", flat=True))
+    published["jobs"] = trending.top({job_id: job_scores[job_id] for job_id in live}, trending.TOP_N["jobs"])
+
+    subcategory_scores = trending.decayed_scores(client, "subcategories", now)
+    published["subcategories"] = trending.top(subcategory_scores, trending.TOP_N["subcategories"])
+    category_scores = defaultdict(float)
+    for subcategory_id, category_id in ServiceSubcategory.objects.filter(
+        pk__in=list(subcategory_scores)
+    ).values_list("pk", "category_id"):
+        category_scores[category_id] += subcategory_scores[subcategory_id]
+    published["categories"] = trending.top(category_scores, trending.TOP_N["categories"])
+
+    published["cities"] = trending.top(trending.decayed_scores(client, "cities", now), trending.TOP_N["cities"])
+
+    for kind, ranking in published.items():
+        set_cache(trending.cache_key(kind), ranking, trending.CACHE_TIMEOUT)
+    counts = {kind: len(ranking) for kind, ranking in published.items()}
+    logger.info(f"Published trending lists: {counts}")
+    return counts
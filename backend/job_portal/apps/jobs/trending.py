@@ -0,0 +1,166 @@
+"""
+Trending jobs, subcategories, categories and cities.
+
+Job events (views, bookmarks, applications) add a weight to hourly buckets in
+Redis, one hash per entity kind and hour: ``trending:<kind>:<hour>`` maps an
+entity ID to its weighted event count. Buckets expire once they leave the
+``WINDOW_BUCKETS`` window. Events in ``ONCE_PER_USER_EVENTS`` count once per
+user and job within the window, so refreshing a job or toggling a bookmark
+does not pump it.
+
+``jobs.tasks.update_trending`` (every 10 minutes) sums each entity's buckets
+with exponential decay, ``weight * 0.5 ** (age / HALF_LIFE_SECONDS)``, and
+stores the ``TOP_N`` IDs of every kind in the cache. Readers
+(``get_trending``) do a single cache lookup. Category scores are the sums of
+their subcategories' scores; jobs that are no longer published are dropped.
+"""
+
+import logging
+import time
+from collections import defaultdict
+from typing import Dict, List
+
+import redis
+from django.db.models import Case, IntegerField, Value, When
+
+from utils.cache_utils import get_cache
+from utils.counters import get_redis_client
+
+from .models import Job
+
+logger = logging.getLogger(__name__)
+
+EVENT_WEIGHTS = {
+    "view": 1,
+    "bookmark": 3,
+    "application": 5,
+}
+
+# Events a user can repeat at will through the API
+ONCE_PER_USER_EVENTS = {"view", "bookmark"}
+
+KEY_PREFIX = "trending"
+BUCKET_SECONDS = 60 * 60
+WINDOW_BUCKETS = 72
+HALF_LIFE_SECONDS = 24 * 60 * 60
+
+TOP_N = {
+    "jobs": 100,
+    "subcategories": 50,
+    "categories": 20,
+    "cities": 50,
+}
+CACHE_PREFIX = "trending"
+# Lists outlive a few missed runs of the task rather than vanish
+CACHE_TIMEOUT = 6 * 60 * 60
+
+
+def bucket_key(kind: str, bucket: int) -> str:
+    return f"{KEY_PREFIX}:{kind}:{bucket}"
+
+
+def cache_key(kind: str) -> str:
+    return f"{CACHE_PREFIX}:{kind}"
+
+
+def once_key(event: str, job: Job, user) -> str:
+    return f"{KEY_PREFIX}:once:{event}:{job.pk}:{user.pk}"
+
+
+def claim_once(client, event: str, job: Job, user):
+    """
+    Mark a user's ``event`` on a job as counted for the window.
+
+    Args:
+        client: Redis client or pipeline
+
+    Returns:
+        Truthy only for the user's first such event in the window (on a
+        pipeline, the command's result)
+    """
+    return client.set(once_key(event, job, user), 1, nx=True, ex=WINDOW_BUCKETS * BUCKET_SECONDS)
+
+
+def add_event(pipe, event: str, job: Job) -> None:
+    """Queue the bucket increments of a job event on a Redis pipeline."""
+    weight = EVENT_WEIGHTS[event]
+    bucket = int(time.time() // BUCKET_SECONDS)
+    ttl = (WINDOW_BUCKETS + 1) * BUCKET_SECONDS
+    for kind, entity_id in (
+        ("jobs", job.pk),
+        ("subcategories", job.service_subcategory_id),
+        ("cities", job.city_id),
+    ):
+        if entity_id is not None:
+            pipe.hincrby(bucket_key(kind, bucket), entity_id, weight)
+            pipe.expire(bucket_key(kind, bucket), ttl)
+
+
+def record_event(event: str, job: Job, user=None) -> None:
+    """
+    Count a job event towards the trending scores.
+
+    Args:
+        event (str): Key of ``EVENT_WEIGHTS``
+        job (Job): Job the event happened on
+        user: User behind the event; required for ``ONCE_PER_USER_EVENTS``
+    """
+    try:
+        client = get_redis_client()
+        if event in ONCE_PER_USER_EVENTS and not claim_once(client, event, job, user):
+            return
+        with client.pipeline(transaction=False) as pipe:
+            add_event(pipe, event, job)
+            pipe.execute()
+    except redis.RedisError as e:
+        logger.warning(f"Could not record trending event {event} on job {job.pk}: {e}")
+
+
+def decayed_scores(client, kind: str, now: float) -> Dict[int, float]:
+    current = int(now // BUCKET_SECONDS)
+    buckets = range(current - WINDOW_BUCKETS + 1, current + 1)
+    with client.pipeline(transaction=False) as pipe:
+        for bucket in buckets:
+            pipe.hgetall(bucket_key(kind, bucket))
+        bucket_counts = pipe.execute()
+
+    scores = defaultdict(float)
+    for bucket, counts in zip(buckets, bucket_counts):
+        age = max(now - (bucket + 0.5) * BUCKET_SECONDS, 0)
+        factor = 0.5 ** (age / HALF_LIFE_SECONDS)
+        for entity_id, count in counts.items():
+            scores[int(entity_id)] += int(count) * factor
+    return scores
+
+
+def top(scores: Dict[int, float], n: int) -> List[list]:
+    ranked = sorted(scores.items(), key=lambda item: item[1], reverse=True)[:n]
+    return [[entity_id, round(score, 3)] for entity_id, score in ranked]
+
+
+def get_trending(kind: str) -> List[int]:
+    """
+    Get the IDs of the trending entities of a kind, most trending first.
+
+    Args:
+        kind (str): ``jobs``, ``subcategories``, ``categories`` or ``cities``
+
+    Returns:
+        list: Up to ``TOP_N[kind]`` IDs; empty until ``update_trending`` has run
+    """
+    return [entity_id for entity_id, _score in get_cache(cache_key(kind), [])]
+
+
+def rank_expression(ids: List[int], field: str = "pk"):
+    """
+    Expression giving each row its position in ``ids``, for ``order_by``.
+
+    Rows not in ``ids`` all get ``len(ids)``, so they sort after the listed ones.
+    """
+    if not ids:
+        return Value(0, output_field=IntegerField())
+    return Case(
+        *(When(**{field: entity_id}, then=Value(rank)) for rank, entity_id in enumerate(ids)),
+        default=Value(len(ids)),
+        output_field=IntegerField(),
+    )
@@ -1,8 +1,9 @@
+from job_portal.apps.core.api.fields import ReferenceSerializerMixin
 from utils.serializers import AbstractTimestampedModelSerializer
 from ..models import Country, City
 
 
-class CountrySerializer(AbstractTimestampedModelSerializer):
+class CountrySerializer(ReferenceSerializerMixin, AbstractTimestampedModelSerializer):
     """Serializer for Country model."""
 
     class Meta:
@@ -14,7 +15,7 @@ class CountrySerializer(AbstractTimestampedModelSerializer):
         ]
 
 
-class CitySerializer(AbstractTimestampedModelSerializer):
+class CitySerializer(ReferenceSerializerMixin, AbstractTimestampedModelSerializer):
     """Serializer for City model."""
 
     country = CountrySerializer(read_only=True)
@@ -5,6 +5,7 @@ from rest_framework.generics import get_object_or_404
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.serializers import ValidationError
 from utils.pagination import CustomPagination
+from utils.query_planner import optimize_queryset
 
 from ..models import Review
 from .serializers import (
@@ -23,9 +24,7 @@ class ReviewListForJobAPIView(generics.ListAPIView):
 
     def get_queryset(self):
         job = get_object_or_404(Job, id=self.kwargs.get("job_id"))
-        return Review.objects.filter(job=job).select_related(
-            "reviewer", "master__user", "job"
-        )
+        return optimize_queryset(Review.objects.filter(job=job), ReviewSerializer)
 
 
 class MyReviewsListAPIView(generics.ListAPIView):
@@ -36,9 +35,7 @@ class MyReviewsListAPIView(generics.ListAPIView):
     pagination_class = CustomPagination
 
     def get_queryset(self):
-        return Review.objects.filter(reviewer=self.request.user).select_related(
-            "reviewer", "master__user", "job"
-        )
+        return optimize_queryset(Review.objects.filter(reviewer=self.request.user), ReviewSerializer)
 
 
 class AddReviewForJobDoneAPIView(generics.CreateAPIView):
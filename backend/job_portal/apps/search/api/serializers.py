@@ -1,7 +1,11 @@
 from rest_framework import serializers
 from django.contrib.auth import get_user_model
 
-from job_portal.apps.attachments.serializers import AttachmentSerializer
+from job_portal.apps.attachments.serializers import (
+    AttachmentSerializer,
+    PrimeAttachmentURLsListSerializer,
+)
+from job_portal.apps.core.api.fields import ReferenceSerializerMixin
 from job_portal.apps.core.models import ServiceCategory, ServiceSubcategory
 from job_portal.apps.jobs.models import Job
 from job_portal.apps.users.models import Master, MasterStatistics, Profession, PortfolioItem
@@ -10,7 +14,7 @@ from job_portal.apps.users.api.serializers import MasterStatisticsSerializer, Us
 UserModel = get_user_model()
 
 
-class ProfessionBasicSerializer(serializers.ModelSerializer):
+class ProfessionBasicSerializer(ReferenceSerializerMixin, serializers.ModelSerializer):
     """Basic profession information."""
     
     class Meta:
@@ -18,7 +22,7 @@ class ProfessionBasicSerializer(serializers.ModelSerializer):
         fields = ["id", "name"]
 
 
-class ServiceCategoryBasicSerializer(serializers.ModelSerializer):
+class ServiceCategoryBasicSerializer(ReferenceSerializerMixin, serializers.ModelSerializer):
     """Basic service category information."""
     
     class Meta:
@@ -45,9 +49,10 @@ class PortfolioItemBasicSerializer(serializers.ModelSerializer):
             "attachments",
             "description",
         ]
+        list_serializer_class = PrimeAttachmentURLsListSerializer
 
 
-class ServiceSubcategoryBasicSerializer(serializers.ModelSerializer):
+class ServiceSubcategoryBasicSerializer(ReferenceSerializerMixin, serializers.ModelSerializer):
     """Basic service subcategory serializer."""
     
     class Meta:
@@ -58,7 +63,7 @@ class ServiceSubcategoryBasicSerializer(serializers.ModelSerializer):
         ]
 
 
-class ServiceCategorySerializer(serializers.ModelSerializer):
+class ServiceCategorySerializer(ReferenceSerializerMixin, serializers.ModelSerializer):
     """Serializer for service categories in search results."""
 
     class Meta:
@@ -72,7 +77,7 @@ class ServiceCategorySerializer(serializers.ModelSerializer):
         ]
 
 
-class ServiceSubcategorySerializer(serializers.ModelSerializer):
+class ServiceSubcategorySerializer(ReferenceSerializerMixin, serializers.ModelSerializer):
     """Serializer for service subcategories in search results."""
 
     category = ServiceCategorySerializer(read_only=True)
@@ -188,7 +193,7 @@ class ServiceCategoryWithCountSerializer(serializers.ModelSerializer):
 class HomePageDataSerializer(serializers.Serializer):
     """Comprehensive serializer for home page data with proper OpenAPI documentation."""
     
-    featured_categories = ServiceCategoryWithCountSerializer(many=True, help_text="Featured service categories")
+    featured_categories = ServiceCategoryWithCountSerializer(many=True, help_text="Trending and featured service categories")
     recommended_masters = MasterRecommendationSerializer(many=True, help_text="Recommended masters for the user")
     user_location = serializers.CharField(help_text="Current user location")
     total_masters_count = serializers.IntegerField(help_text="Total number of available masters")
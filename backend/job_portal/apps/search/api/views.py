@@ -8,9 +8,13 @@ from rest_framework.response import Response
 from rest_framework.views import APIView
 
 from job_portal.apps.core.models import ServiceCategory
+from job_portal.apps.jobs.api.filters import TrendingJobOrderingFilter
 from job_portal.apps.jobs.models import Job, JobStatus
+from job_portal.apps.jobs.trending import get_trending, rank_expression
 from job_portal.apps.users.api.permissions import HasEmployerProfile, HasMasterProfile
 from job_portal.apps.users.models import Master
+from utils.decorators import RateLimitMixin
+from utils.query_planner import SerializerQueryPlanMixin
 from .serializers import (
     MasterSearchSerializer,
     JobSearchSerializer,
@@ -26,9 +30,10 @@ from .serializers import (
     description="Search masters by keywords, profession, location, and other criteria. "
                 "Returns paginated list of master profiles with portfolio items and skills.",
 )
-class MasterSearchAPIView(generics.ListAPIView):
+class MasterSearchAPIView(RateLimitMixin, SerializerQueryPlanMixin, generics.ListAPIView):
     """Search masters with optimized queryset and serializer."""
 
+    rate_limit_scope = "search"
     serializer_class = MasterSearchSerializer
     permission_classes = [AllowAny]
     filter_backends = [DjangoFilterBackend, SearchFilter, OrderingFilter]
@@ -52,34 +57,22 @@ class MasterSearchAPIView(generics.ListAPIView):
     ordering = ["-statistics__average_rating"]
 
     def get_queryset(self):
-        """Get available masters with optimized queryset."""
-        return (
+        """Get available masters; joins and prefetches are planned from the serializer."""
+        return self.plan_queryset(
             Master.objects.filter(
                 user__is_active=True,
                 is_available=True,
-            )
-            .select_related(
-                "user",
-                "profession",
-                "statistics",
-            )
-            .prefetch_related(
-                "services_offered",
-                "services_offered__category",
-                "portfolio_items",
-                "master_skills",
-                "master_skills__skill",
-            )
-            .distinct()
+            ).distinct()
         )
 
 
-class JobSearchAPIView(generics.ListAPIView):
+class JobSearchAPIView(RateLimitMixin, generics.ListAPIView):
     """Search jobs with optimized search serializer."""
 
+    rate_limit_scope = "search"
     serializer_class = JobSearchSerializer
     permission_classes = [AllowAny]
-    filter_backends = [DjangoFilterBackend, SearchFilter, OrderingFilter]
+    filter_backends = [DjangoFilterBackend, SearchFilter, TrendingJobOrderingFilter]
     filterset_fields = {
         "status": ["exact"],
         "city": ["exact"],
@@ -122,22 +115,25 @@ class HomeClientAPIView(APIView):
     @extend_schema(
         responses={200: HomePageDataSerializer},
         summary="Get home page data with master recommendations",
-        description="Returns featured categories, recommended masters, and statistics for the home page. "
+        description="Returns trending and featured categories, recommended masters, and statistics for the home page. "
                     "Prioritizes top masters first, then fills with additional masters if needed.",
     )
     def get(self, request):
         """Get recommended masters based on employer preferences and location."""
 
-        # Get featured service categories with master count annotation
+        # Get featured and trending service categories with master count annotation,
+        # trending ones first
+        trending_category_ids = get_trending('categories')[:6]
         featured_categories = ServiceCategory.objects.filter(
+            Q(featured=True) | Q(id__in=trending_category_ids),
             is_active=True,
-            featured=True
         ).annotate(
             master_count=Count(
                 'subcategories__providers_offering_service',
                 distinct=True
-            )
-        ).order_by('sort_order', 'name')[:6]
+            ),
+            trending_rank=rank_expression(trending_category_ids),
+        ).order_by('trending_rank', 'sort_order', 'name')[:6]
 
         # Recommendation algorithm based on Master model fields
         # First, get top masters (preferred)
@@ -6,7 +6,13 @@ from rest_framework import serializers
 from rest_framework.serializers import ValidationError
 
 from accounts.models import UserModel
-from job_portal.apps.attachments.serializers import AttachmentSerializer
+from job_portal.apps.attachments.serializers import (
+    AttachmentSerializer,
+    ChunkedUploadField,
+    merge_chunked_uploads,
+)
+from job_portal.apps.core.api.fields import ReferencePrimaryKeyRelatedField, ReferenceSerializerMixin
+from utils.counters import BufferedCountersSerializerMixin
 from utils.serializers import AbstractTimestampedModelSerializer
 from ..models import (
     Certificate,
@@ -137,7 +143,7 @@ class MasterProfileCreateUpdateSerializer(AbstractTimestampedModelSerializer):
         return instance
 
 
-class SkillDetailSerializer(AbstractTimestampedModelSerializer):
+class SkillDetailSerializer(ReferenceSerializerMixin, AbstractTimestampedModelSerializer):
     class Meta:
         model = Skill
         fields = ("id", "name", "description", "category", "is_active")
@@ -146,8 +152,8 @@ class SkillDetailSerializer(AbstractTimestampedModelSerializer):
 
 class MasterSkillSerializer(AbstractTimestampedModelSerializer):
     skill = SkillDetailSerializer(read_only=True)
-    skill_id = serializers.PrimaryKeyRelatedField(
-        source="skill", queryset=Skill.objects.filter(is_active=True), write_only=True
+    skill_id = ReferencePrimaryKeyRelatedField(
+        source="skill", queryset=Skill.objects.filter(is_active=True), filters={"is_active": True}, write_only=True
     )
 
     class Meta:
@@ -188,9 +194,10 @@ class MasterSkillSerializer(AbstractTimestampedModelSerializer):
 
 class PortfolioItemSerializer(AbstractTimestampedModelSerializer):
     skill_used = SkillDetailSerializer(read_only=True)
-    skill_used_id = serializers.PrimaryKeyRelatedField(
+    skill_used_id = ReferencePrimaryKeyRelatedField(
         source="skill_used",
         queryset=Skill.objects.filter(is_active=True),
+        filters={"is_active": True},
         write_only=True,
         required=False,
         allow_null=True,
@@ -247,8 +254,30 @@ class PortfolioItemAttachmentUploadSerializer(serializers.Serializer):
         ),
         allow_empty=False,
         write_only=True,
+        required=False,
         validators=[validate_total_size],
     )
+    upload_ids = serializers.ListField(
+        child=ChunkedUploadField(
+            validators=[
+                FileExtensionValidator(
+                    allowed_extensions=get_available_image_extensions()
+                ),
+                validate_file_size,
+            ],
+        ),
+        allow_empty=False,
+        write_only=True,
+        required=False,
+        help_text="IDs of completed chunked uploads (api/v1/uploads/)",
+    )
+
+    def validate(self, attrs):
+        files = merge_chunked_uploads(attrs, "files", "upload_ids")
+        if not files:
+            raise ValidationError({"files": "No files provided"})
+        validate_total_size(files)
+        return attrs
 
 
 class CertificateSerializer(AbstractTimestampedModelSerializer):
@@ -274,7 +303,7 @@ class CertificateSerializer(AbstractTimestampedModelSerializer):
         return Certificate.objects.create(**validated_data, master=master_profile)
 
 
-class ProfessionSerializer(AbstractTimestampedModelSerializer):
+class ProfessionSerializer(ReferenceSerializerMixin, AbstractTimestampedModelSerializer):
     class Meta:
         model = Profession
         fields = (
@@ -332,7 +361,7 @@ class PublicMasterProfileSerializer(serializers.ModelSerializer):
         )
 
 
-class PublicMasterProfileDetailSerializer(serializers.ModelSerializer):
+class PublicMasterProfileDetailSerializer(BufferedCountersSerializerMixin, serializers.ModelSerializer):
     """Detailed serializer for master profile."""
 
     user = UserDetailChildSerializer(read_only=True)
@@ -368,7 +397,9 @@ class PublicMasterProfileDetailSerializer(serializers.ModelSerializer):
             "portfolio_items",
             "certificates",
             "statistics",
+            "view_count",
         )
+        buffered_counters = ["view_count"]
 
 
 class MasterOnlineStatusRequestSerializer(serializers.Serializer):
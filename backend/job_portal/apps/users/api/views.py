@@ -24,6 +24,7 @@ from ..models import (
     Profession,
     Skill,
 )
+from utils.counters import get_counter
 from .permissions import HasEmployerProfile, HasMasterProfile
 from .serializers import (
     CertificateSerializer,
@@ -148,7 +149,7 @@ class MasterPortfolioAttachmentAPIViewSet(
     viewsets.GenericViewSet,
 ):
     permission_classes = [IsAuthenticated, IsAttachmentOwner, HasMasterProfile]
-    parser_classes = [parsers.MultiPartParser, parsers.FormParser]
+    parser_classes = [parsers.MultiPartParser, parsers.FormParser, parsers.JSONParser]
 
     def _get_portfolio_obj(self) -> PortfolioItem:
         if hasattr(self.request, "_portfolio_obj"):
@@ -176,8 +177,7 @@ class MasterPortfolioAttachmentAPIViewSet(
         if not files:
             raise ValidationError("No files provided")
         attachments = create_attachments(files, self.request.user, item)
-        for a in attachments:
-            item.attachments.add(a)
+        item.attachments.add(*attachments)
         return attachments
 
 
@@ -251,6 +251,8 @@ class PublicMasterProfileAPIViewSet(ReadOnlyModelViewSet):
     @action(detail=True, methods=["get"])
     def details(self, request, pk=None):
         obj = self.get_object()
+        if obj.user_id != request.user.id:
+            get_counter(Master, "view_count").incr(obj.pk)
         return Response(PublicMasterProfileDetailSerializer(instance=obj).data)
 
 
@@ -0,0 +1,18 @@
+# Generated by Django 5.0.2 on 2026-10-19 07:14
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='master',
+            name='view_count',
+            field=models.PositiveIntegerField(default=0, verbose_name='View Count'),
+        ),
+    ]
@@ -70,6 +70,9 @@ class Master(AbstractSoftDeleteModel, AbstractTimestampedModel):
     is_verified_provider = models.BooleanField(_("Verified Provider"), default=False)
     is_top_master = models.BooleanField(_("Top Master"), default=False)
 
+    # Profile page views, incremented through utils.counters
+    view_count = models.PositiveIntegerField(_("View Count"), default=0)
+
     skills = models.ManyToManyField('Skill', through='MasterSkill', related_name='masters')
 
     class Meta:
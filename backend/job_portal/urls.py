@@ -13,4 +13,5 @@ urlpatterns = [
     path('', include('job_portal.apps.search.urls')),
     path('', include('job_portal.apps.contacts.urls')),
     path('', include('job_portal.apps.reviews.urls')),
+    path('', include('job_portal.apps.attachments.urls')),
 ]
@@ -1,15 +1,104 @@
+import functools
 import re
 
-from django.db import models
+from django.core.exceptions import FieldDoesNotExist
+from django.db import IntegrityError, models, router, transaction
 from django.db.models import Q, UniqueConstraint
 from django.db.models.constants import LOOKUP_SEP
+from django.db.models.signals import class_prepared
+from django.dispatch import receiver
 from django.utils import timezone
 from django.utils.encoding import force_str
 from django.utils.text import slugify
 from django.utils.translation import gettext_lazy as _
 
 
-class SoftDeleteManager(models.Manager):
+def _is_soft_deletable(model):
+    field_names = {field.name for field in model._meta.get_fields()}
+    return {"is_deleted", "deleted_at", "restored_at"} <= field_names
+
+
+def _cascade_querysets(queryset, cascade_fields, visited=frozenset()):
+    """
+    Yield querysets of the related objects reached through ``cascade_fields``,
+    deepest relations first.
+
+    Related rows are selected with a subquery on the parent queryset, so no
+    primary keys are loaded into Python and each related model costs one query.
+    """
+    model = queryset.model
+    for field_name in cascade_fields:
+        try:
+            related_model = model._meta.get_field(field_name).related_model
+        except FieldDoesNotExist:
+            continue
+        if related_model is None or related_model in visited or not _is_soft_deletable(related_model):
+            continue
+        related = related_model._base_manager.filter(pk__in=queryset.values(field_name))
+        yield from _cascade_querysets(
+            related,
+            getattr(related_model, "soft_delete_cascade", ()),
+            visited | {model, related_model},
+        )
+        yield related
+
+
+def cascade_soft_delete(queryset, cascade_fields=None):
+    """
+    Soft delete every row of a queryset and its cascade with one UPDATE per model.
+
+    Args:
+        queryset: QuerySet of a soft-deletable model
+        cascade_fields: Relations to cascade to (default: the model's ``soft_delete_cascade``)
+
+    Returns:
+        int: Number of rows of ``queryset`` soft deleted
+    """
+    if cascade_fields is None:
+        cascade_fields = getattr(queryset.model, "soft_delete_cascade", ())
+    now = timezone.now()
+    # Children first: their subqueries read the parent rows before these are updated
+    for related in _cascade_querysets(queryset, cascade_fields):
+        related.filter(is_deleted=False).update(is_deleted=True, deleted_at=now)
+    return queryset.filter(is_deleted=False).update(is_deleted=True, deleted_at=now)
+
+
+def cascade_restore(queryset, cascade_fields=None):
+    """
+    Restore every soft-deleted row of a queryset and its cascade with one UPDATE per model.
+
+    Args:
+        queryset: QuerySet of a soft-deletable model
+        cascade_fields: Relations to cascade to (default: the model's ``soft_delete_cascade``)
+
+    Returns:
+        int: Number of rows of ``queryset`` restored
+    """
+    if cascade_fields is None:
+        cascade_fields = getattr(queryset.model, "soft_delete_cascade", ())
+    now = timezone.now()
+    for related in _cascade_querysets(queryset, cascade_fields):
+        related.filter(is_deleted=True).update(is_deleted=False, deleted_at=None, restored_at=now)
+    return queryset.filter(is_deleted=True).update(is_deleted=False, deleted_at=None, restored_at=now)
+
+
+class SoftDeleteQuerySet(models.QuerySet):
+    """QuerySet with set-based soft delete and restore (see ``cascade_soft_delete``)."""
+
+    def soft_delete(self):
+        """Soft delete the selected objects and their cascade."""
+        return cascade_soft_delete(self)
+
+    def restore(self):
+        """Restore the selected objects and their cascade."""
+        return cascade_restore(self)
+
+    def hard_delete(self):
+        """Permanently delete the selected objects."""
+        return super().delete()
+
+
+class SoftDeleteManager(models.Manager.from_queryset(SoftDeleteQuerySet)):
     """
     Enhanced soft delete manager that automatically filters out soft-deleted objects.
     Provides comprehensive methods to work with both active and deleted objects.
@@ -37,18 +126,11 @@ class SoftDeleteManager(models.Manager):
 
     def bulk_restore(self, pks):
         """Restore multiple soft-deleted objects by primary keys."""
-        return self.all_with_deleted().filter(pk__in=pks, is_deleted=True).update(
-            is_deleted=False,
-            deleted_at=None,
-            restored_at=timezone.now()
-        )
+        return self.all_with_deleted().filter(pk__in=pks).restore()
 
     def bulk_soft_delete(self, pks):
         """Soft delete multiple objects by primary keys."""
-        return self.filter(pk__in=pks).update(
-            is_deleted=True,
-            deleted_at=timezone.now()
-        )
+        return self.filter(pk__in=pks).soft_delete()
 
     def get_deleted_count(self):
         """Get count of deleted objects."""
@@ -77,35 +159,9 @@ class CascadingSoftDeleteManager(SoftDeleteManager):
             obj: The object to soft delete
             cascade_fields: List of field names to cascade soft delete to
         """
-
-        # Soft delete the main object
+        cascade_soft_delete(self.all_with_deleted().filter(pk=obj.pk), cascade_fields or [])
         obj.deleted_at = timezone.now()
         obj.is_deleted = True
-        obj.save(update_fields=['deleted_at', 'is_deleted'])
-
-        # Handle cascading if specified
-        if cascade_fields:
-            self._cascade_to_related_objects(obj, cascade_fields)
-
-    def _cascade_to_related_objects(self, obj, cascade_fields):
-        """Cascade soft delete to related objects."""
-
-        for field_name in cascade_fields:
-            if hasattr(obj, field_name):
-                related_objects = getattr(obj, field_name)
-
-                # Handle different types of relationships
-                if hasattr(related_objects, 'all'):  # Many-to-many or reverse foreign key
-                    for related_obj in related_objects.all():
-                        if hasattr(related_obj, 'is_deleted'):
-                            related_obj.deleted_at = timezone.now()
-                            related_obj.is_deleted = True
-                            related_obj.save(update_fields=['deleted_at', 'is_deleted'])
-
-                elif hasattr(related_objects, 'is_deleted'):  # One-to-one or foreign key
-                    related_objects.deleted_at = timezone.now()
-                    related_objects.is_deleted = True
-                    related_objects.save(update_fields=['deleted_at', 'is_deleted'])
 
     def restore_with_cascade(self, obj, cascade_fields=None):
         """
@@ -115,27 +171,10 @@ class CascadingSoftDeleteManager(SoftDeleteManager):
             obj: The object to restore
             cascade_fields: List of field names to cascade restore to
         """
-        # Restore the main object
-        obj.restore()
-
-        # Handle cascading restore if specified
-        if cascade_fields:
-            self._cascade_restore_related_objects(obj, cascade_fields)
-
-    def _cascade_restore_related_objects(self, obj, cascade_fields):
-        """Cascade restore to related objects."""
-        for field_name in cascade_fields:
-            if hasattr(obj, field_name):
-                related_objects = getattr(obj, field_name)
-
-                # Handle different types of relationships
-                if hasattr(related_objects, 'all'):  # Many-to-many or reverse foreign key
-                    for related_obj in related_objects.all():
-                        if hasattr(related_obj, 'is_deleted') and related_obj.is_deleted:
-                            related_obj.restore()
-
-                elif hasattr(related_objects, 'is_deleted') and related_objects.is_deleted:
-                    related_objects.restore()
+        cascade_restore(self.all_with_deleted().filter(pk=obj.pk), cascade_fields or [])
+        obj.deleted_at = None
+        obj.restored_at = timezone.now()
+        obj.is_deleted = False
 
 
 class AbstractTimestampedModel(models.Model):
@@ -170,6 +209,11 @@ class AbstractActiveModel(models.Model):
 
 class AbstractSoftDeleteModel(models.Model):
     """Abstract model that provides soft delete functionality."""
+
+    # Field lists of indexes that only cover live rows (``condition=Q(is_deleted=False)``),
+    # matching what SoftDeleteManager queries, e.g. [("status", "-created_at")]
+    soft_delete_indexes = []
+
     deleted_at = models.DateTimeField(_("Deleted at"), null=True, blank=True)
     restored_at = models.DateTimeField(_("Restored at"), null=True, blank=True)
     is_deleted = models.BooleanField(_("Is deleted"), default=False)
@@ -206,6 +250,10 @@ class AbstractCascadingSoftDeleteModel(AbstractSoftDeleteModel):
     Automatically soft deletes related objects when this object is soft deleted.
     """
 
+    # Relations (reverse foreign keys, many-to-many, ...) whose soft-deletable
+    # objects are soft deleted and restored together with this object
+    soft_delete_cascade = []
+
     # Use the cascading manager
     objects = CascadingSoftDeleteManager()
 
@@ -215,15 +263,16 @@ class AbstractCascadingSoftDeleteModel(AbstractSoftDeleteModel):
     def get_cascade_fields(self):
         """
         Override this method to specify which fields should cascade soft delete.
-        Return a list of field names.
+        Return a list of field names. Bulk operations on querysets use
+        ``soft_delete_cascade`` directly.
         """
-        return []
+        return list(self.soft_delete_cascade)
 
     def delete(self, using=None, keep_parents=False):
         """Override delete to implement cascading soft delete."""
         cascade_fields = self.get_cascade_fields()
         if cascade_fields:
-            self.objects.cascade_soft_delete(self, cascade_fields)
+            type(self).objects.cascade_soft_delete(self, cascade_fields)
         else:
             super().delete(using, keep_parents)
 
@@ -231,11 +280,43 @@ class AbstractCascadingSoftDeleteModel(AbstractSoftDeleteModel):
         """Override restore to implement cascading restore."""
         cascade_fields = self.get_cascade_fields()
         if cascade_fields:
-            self.objects.restore_with_cascade(self, cascade_fields)
+            if strict and not self.is_deleted:
+                raise ValueError("Object is not deleted")
+            type(self).objects.restore_with_cascade(self, cascade_fields)
         else:
             super().restore(strict)
 
 
+def soft_delete_index(model, fields):
+    """
+    Build a partial index over the live (not soft-deleted) rows of a model.
+
+    Args:
+        model: Model class the index belongs to
+        fields: Field names, optionally prefixed with "-" for descending order
+
+    Returns:
+        Index: Named index with ``condition=Q(is_deleted=False)``
+    """
+    index = models.Index(fields=list(fields), condition=Q(is_deleted=False), name="soft_delete_index")
+    # Distinguishes the generated name from a plain index on the same fields
+    index.suffix = "live"
+    index.set_name_with_model(model)
+    return index
+
+
+@receiver(class_prepared)
+def add_soft_delete_indexes(sender, **kwargs):
+    """Append each model's ``soft_delete_indexes`` to its Meta.indexes."""
+    if not issubclass(sender, AbstractSoftDeleteModel):
+        return
+    if not sender.soft_delete_indexes:
+        return
+    sender._meta.indexes.extend(soft_delete_index(sender, fields) for fields in sender.soft_delete_indexes)
+    # Migration state only reads Meta options the model declared
+    sender._meta.original_attrs["indexes"] = sender._meta.indexes
+
+
 class TitleField(models.CharField):
     """Custom CharField for title with default max_length and verbose name."""
 
@@ -258,24 +339,20 @@ class UniqueFieldMixin:
         ]
 
     def get_queryset(self, model_cls, slug_field):
+        # The base manager also sees soft-deleted rows, which still hold their values
         for field, model in self._get_fields(model_cls):
             if model and field == slug_field:
-                return model._default_manager.all()
-        return model_cls._default_manager.all()
+                return model._base_manager.all()
+        return model_cls._base_manager.all()
 
-    def find_unique(self, model_instance, field, iterator, *args):
-        # exclude the current model instance from the queryset used in finding
-        # next valid hash
-        queryset = self.get_queryset(model_instance.__class__, field)
-        if model_instance.pk:
-            queryset = queryset.exclude(pk=model_instance.pk)
-
-        # form a kwarg dict used to implement any unique_together constraints
+    def get_unique_scope(self, model_instance):
+        """Lookups of the unique_together/UniqueConstraint groups the field belongs to."""
         kwargs = {}
         for params in model_instance._meta.unique_together:
             if self.attname in params:
                 for param in params:
-                    kwargs[param] = getattr(model_instance, param, None)
+                    if param != self.attname:
+                        kwargs[param] = getattr(model_instance, param, None)
 
         # for support django 2.2+
         query = Q()
@@ -292,19 +369,118 @@ class UniqueFieldMixin:
                         if field != self.attname
                     }
                     query &= Q(**condition)
+        return query, kwargs
+
+    def get_candidate_prefix(self, original):
+        """Longest prefix shared by every candidate the iterator can produce."""
+        return original
 
+    def find_unique(self, model_instance, field, iterator, *args):
+        # exclude the current model instance from the queryset used in finding
+        # next valid hash
+        queryset = self.get_queryset(model_instance.__class__, field)
+        if model_instance.pk:
+            queryset = queryset.exclude(pk=model_instance.pk)
+        query, kwargs = self.get_unique_scope(model_instance)
+
+        # One query for every taken value the candidates could collide with
         new = next(iterator)
-        kwargs[self.attname] = new
-        while not new or queryset.filter(query, **kwargs):
+        kwargs["%s__startswith" % self.attname] = self.get_candidate_prefix(new)
+        taken = set(queryset.filter(query, **kwargs).values_list(self.attname, flat=True))
+        while not new or new in taken:
             new = next(iterator)
-            kwargs[self.attname] = new
         setattr(model_instance, self.attname, new)
         return new
 
 
+def _has_unique_conflict(instance):
+    for field in instance._meta.concrete_fields:
+        if isinstance(field, AutoSlugField) and not field.allow_duplicates:
+            queryset = field.get_queryset(type(instance), field)
+            if queryset.filter(**{field.attname: getattr(instance, field.attname)}).exists():
+                return True
+    return False
+
+
+def _retry_on_slug_conflict(save):
+    """
+    Wrap ``Model.save`` so that an insert losing a slug race to a concurrent
+    insert is retried with a freshly allocated slug.
+    """
+
+    @functools.wraps(save)
+    def wrapper(instance, *args, **kwargs):
+        if not instance._state.adding:
+            return save(instance, *args, **kwargs)
+        using = kwargs.get("using") or router.db_for_write(type(instance), instance=instance)
+        for attempt in range(AutoSlugField.save_attempts):
+            try:
+                # Savepoint, so a conflict does not break the caller's transaction
+                with transaction.atomic(using=using):
+                    return save(instance, *args, **kwargs)
+            except IntegrityError:
+                if attempt == AutoSlugField.save_attempts - 1 or not _has_unique_conflict(instance):
+                    raise
+
+    wrapper.retries_slug_conflicts = True
+    return wrapper
+
+
+def assign_unique_slugs(objs):
+    """
+    Allocate unique slugs for unsaved instances before ``bulk_create``.
+
+    ``bulk_create`` would otherwise generate every slug in ``pre_save`` with
+    its own query. Here each AutoSlugField runs one query per 500 distinct
+    slug prefixes, and slugs within the batch are kept apart in Python.
+
+    Args:
+        objs: Unsaved instances of one model
+    """
+    objs = list(objs)
+    if not objs:
+        return
+    model = type(objs[0])
+    for field in model._meta.concrete_fields:
+        if not isinstance(field, AutoSlugField):
+            continue
+        originals = [field.get_original_slug(obj) for obj in objs]
+        if field.allow_duplicates:
+            taken = None
+        elif model._meta.unique_together or model._meta.constraints:
+            # Scoped uniqueness differs per row; allocate one by one
+            for obj in objs:
+                field.create_slug(obj, add=True)
+                obj._auto_slugs_assigned = getattr(obj, "_auto_slugs_assigned", set()) | {field.attname}
+            continue
+        else:
+            prefixes = list({field.get_candidate_prefix(original) for original in originals})
+            taken = set()
+            queryset = field.get_queryset(model, field)
+            for start in range(0, len(prefixes), 500):
+                query = Q()
+                for prefix in prefixes[start:start + 500]:
+                    query |= Q(**{"%s__startswith" % field.attname: prefix})
+                taken.update(queryset.filter(query).values_list(field.attname, flat=True))
+
+        for obj, original in zip(objs, originals):
+            new = original
+            if taken is not None:
+                candidates = field.slug_generator(original, 2)
+                new = next(candidates)
+                while not new or new in taken:
+                    new = next(candidates)
+                taken.add(new)
+            setattr(obj, field.attname, new)
+            obj._auto_slugs_assigned = getattr(obj, "_auto_slugs_assigned", set()) | {field.attname}
+
+
 class AutoSlugField(UniqueFieldMixin, models.SlugField):
     """Custom CharField for slug with default max_length and verbose name."""
 
+    # Inserts that lose a slug race are retried this many times in total
+    save_attempts = 3
+
     def __init__(self, *args, **kwargs):
         kwargs.setdefault('max_length', 80)
         kwargs.setdefault('verbose_name', _("Slug"))
@@ -355,14 +531,28 @@ class AutoSlugField(UniqueFieldMixin, models.SlugField):
             return slugify_function(content)
         return ""
 
+    def contribute_to_class(self, cls, name, *args, **kwargs):
+        super().contribute_to_class(cls, name, *args, **kwargs)
+        if not cls._meta.abstract and not self.allow_duplicates:
+            if not getattr(cls.save, "retries_slug_conflicts", False):
+                cls.save = _retry_on_slug_conflict(cls.save)
+
+    def get_candidate_prefix(self, original):
+        # Candidates that outgrow max_length are cut short before the suffix
+        longest_end = "%s%s" % (self.separator, self.max_unique_query_attempts)
+        slug_len = self.max_length
+        if slug_len and len(original) + len(longest_end) > slug_len:
+            return self._slug_strip(original[: slug_len - len(longest_end)])
+        return original
+
     def slug_generator(self, original_slug, start):
         yield original_slug
         for i in range(start, self.max_unique_query_attempts):
             slug = original_slug
             end = "%s%s" % (self.separator, i)
             end_len = len(end)
-            if self.slug_len and len(slug) + end_len > self.slug_len:
-                slug = slug[: self.slug_len - end_len]
+            if self.max_length and len(slug) + end_len > self.max_length:
+                slug = slug[: self.max_length - end_len]
                 slug = self._slug_strip(slug)
             slug = "%s%s" % (slug, end)
             yield slug
@@ -385,39 +575,40 @@ class AutoSlugField(UniqueFieldMixin, models.SlugField):
         if use_existing_slug:
             return slug
 
-        # get fields to populate from and slug field to set
+        original_slug = self.get_original_slug(model_instance)
+
+        if self.allow_duplicates:
+            setattr(model_instance, self.attname, original_slug)
+            return original_slug
+
+        slug_field = model_instance._meta.get_field(self.attname)
+        return self.find_unique(
+            model_instance, slug_field, self.slug_generator(original_slug, 2)
+        )
+
+    def get_original_slug(self, model_instance):
+        """Slug built from ``populate_from``, before any uniqueness suffix."""
+        # get fields to populate from
         populate_from = self._populate_from
         if not isinstance(populate_from, (list, tuple)):
             populate_from = (populate_from,)
 
-        slug_field = model_instance._meta.get_field(self.attname)
         slugify_function = getattr(
             model_instance, "slugify_function", self.slugify_function
         )
 
-        # slugify the original field content and set next step to 2
+        # slugify the original field content
         slug_for_field = lambda lookup_value: self.slugify_func(
             self.get_slug_fields(model_instance, lookup_value),
             slugify_function=slugify_function,
         )
         slug = self.separator.join(map(slug_for_field, populate_from))
-        start = 2
 
         # strip slug depending on max_length attribute of the slug field
         # and clean-up
-        self.slug_len = slug_field.max_length
-        if self.slug_len:
-            slug = slug[: self.slug_len]
-        slug = self._slug_strip(slug)
-        original_slug = slug
-
-        if self.allow_duplicates:
-            setattr(model_instance, self.attname, slug)
-            return slug
-
-        return self.find_unique(
-            model_instance, slug_field, self.slug_generator(original_slug, start)
-        )
+        if self.max_length:
+            slug = slug[: self.max_length]
+        return self._slug_strip(slug)
 
     def get_slug_fields(self, model_instance, lookup_value):
         if callable(lookup_value):
@@ -442,6 +633,9 @@ class AutoSlugField(UniqueFieldMixin, models.SlugField):
         return attr
 
     def pre_save(self, model_instance, add):
+        if self.attname in getattr(model_instance, "_auto_slugs_assigned", ()):
+            # Allocated up front by assign_unique_slugs
+            return getattr(model_instance, self.attname)
         value = force_str(self.create_slug(model_instance, add))
         return value
 
@@ -4,32 +4,51 @@ from django.core.exceptions import ValidationError
 from django.db.models import QuerySet
 from django.utils.translation import gettext_lazy as _
 
-from utils.abstract_models import AbstractMetaModel
+from utils.abstract_models import (
+    AbstractCascadingSoftDeleteModel,
+    AbstractMetaModel,
+    AbstractSoftDeleteModel,
+    cascade_restore,
+    cascade_soft_delete,
+)
+
+
+def _overrides(model, method_name):
+    """Whether a model customises a soft delete hook beyond the abstract models."""
+    method = getattr(model, method_name)
+    return method not in (
+        getattr(AbstractSoftDeleteModel, method_name),
+        getattr(AbstractCascadingSoftDeleteModel, method_name),
+    )
 
 
 def restore_queryset(modeladmin, request, queryset):
     """Restore soft-deleted objects."""
-    if isinstance(queryset, QuerySet):
+    if not isinstance(queryset, QuerySet):
+        queryset.restore()
+    elif _overrides(queryset.model, "restore"):
+        # Per-object hooks (e.g. UserModel.restore) need the instances
         for obj in queryset:
             obj.restore(strict=False)
     else:
-        queryset.restore()
+        cascade_restore(queryset)
 
 
 def soft_delete_queryset(modeladmin, request, queryset):
     """Soft delete objects."""
-    if isinstance(queryset, QuerySet):
+    if not isinstance(queryset, QuerySet):
+        queryset.delete()
+    elif _overrides(queryset.model, "delete"):
         for obj in queryset:
             obj.delete()
     else:
-        queryset.delete()
+        cascade_soft_delete(queryset)
 
 
 def hard_delete_queryset(modeladmin, request, queryset):
     """Hard delete objects permanently."""
     if isinstance(queryset, QuerySet):
-        for obj in queryset:
-            obj.hard_delete()
+        QuerySet.delete(queryset)
     else:
         queryset.hard_delete()
 
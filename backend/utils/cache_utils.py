@@ -3,6 +3,10 @@ from typing import Any
 
 from django.core.cache import cache
 
+from utils.request_metrics import record_cache_lookup
+
+_MISSING = object()
+
 
 def cache_key_generator(prefix: str, *args, **kwargs) -> str:
     """
@@ -45,7 +49,9 @@ def get_cache(key: str, default: Any = None) -> Any:
     Returns:
         Cached value or default
     """
-    return cache.get(key, default)
+    value = cache.get(key, _MISSING)
+    record_cache_lookup(value is not _MISSING)
+    return default if value is _MISSING else value
 
 
 def set_cache(key: str, value: Any, timeout: int = 300) -> None:
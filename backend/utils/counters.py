@@ -0,0 +1,260 @@
+"""
+Buffered counters: increments in Redis, flushed to the database in batches.
+
+Bumping a counter column on every read (FAQ views, job and profile views)
+serializes requests on the row lock of popular rows. ``BufferedCounter``
+adds to a Redis hash instead (``HINCRBY counters:<app.model>:<field> <pk>``)
+and the ``flush_buffered_counters`` django-q task, scheduled every minute,
+moves the accumulated deltas into the table with one ``UPDATE`` per counter.
+Reads add the pending delta to the database value, see
+``BufferedCountersSerializerMixin``.
+
+A flush first renames the hash to ``<key>:flushing`` and tags it with a
+flush id (one Lua call), so increments that arrive during the flush go to a
+fresh hash. The UPDATE commits together with a ``core.BufferedCounterFlush``
+row for that id, and the renamed hash is deleted afterwards. A flush that
+fails before the delete is retried by the next run, which finds the id
+recorded and only deletes the hash, so deltas are applied exactly once.
+
+While Redis is unreachable increments are written to the database directly,
+and Redis is retried after ``REDIS_RETRY_INTERVAL`` seconds.
+"""
+
+import datetime
+import logging
+import time
+import uuid
+from functools import lru_cache
+from typing import Dict, Iterable
+
+import redis
+from django.apps import apps
+from django.conf import settings
+from django.core.exceptions import FieldDoesNotExist
+from django.db import connection, transaction
+from django.db.models import Case, F, Value, When
+from django.utils import timezone
+from rest_framework import serializers
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = "counters"
+FLUSHING_SUFFIX = ":flushing"
+FLUSH_LOCK_KEY = "counters-flush-lock"
+FLUSH_LOCK_TIMEOUT = 300
+FLUSH_BATCH_SIZE = 1000
+REDIS_RETRY_INTERVAL = 30
+# Field of the flushing hash holding its flush id (the other fields are pks)
+FLUSH_ID_FIELD = "flush_id"
+# Applied flush ids are kept this long; a flushing hash is retried every minute
+FLUSH_RECORD_RETENTION = datetime.timedelta(days=7)
+
+# KEYS: counter hash, flushing hash. ARGV: flush id field, new flush id.
+# Claims the counter hash unless an earlier flush is still pending, and
+# returns the flushing hash (empty when there is nothing to flush).
+CLAIM_SCRIPT = """
+if redis.call('EXISTS', KEYS[2]) == 0 then
+    if redis.call('EXISTS', KEYS[1]) == 0 then
+        return {}
+    end
+    redis.call('RENAME', KEYS[1], KEYS[2])
+    redis.call('HSET', KEYS[2], ARGV[1], ARGV[2])
+end
+return redis.call('HGETALL', KEYS[2])
+"""
+
+_client = None
+_retry_at = 0.0
+
+
+def get_redis_client() -> redis.Redis:
+    global _client
+    if _client is None:
+        _client = redis.Redis.from_url(
+            settings.BUFFERED_COUNTERS_REDIS_URL,
+            socket_connect_timeout=0.5,
+            socket_timeout=0.5,
+            decode_responses=True,
+        )
+    return _client
+
+
+def _redis_available() -> bool:
+    return time.monotonic() >= _retry_at
+
+
+def _redis_failed(e: Exception) -> None:
+    global _retry_at
+    logger.warning(f"Buffered counters falling back to the database: {e}")
+    _retry_at = time.monotonic() + REDIS_RETRY_INTERVAL
+
+
+class BufferedCounter:
+    """Counter column ``field`` of ``model``, incremented through Redis."""
+
+    def __init__(self, model, field: str):
+        self.model = model
+        self.field = field
+        self.key = f"{KEY_PREFIX}:{model._meta.label_lower}:{field}"
+        self.flushing_key = self.key + FLUSHING_SUFFIX
+
+    def incr(self, pk, amount: int = 1) -> None:
+        """Add ``amount`` to the counter of row ``pk``."""
+        if _redis_available():
+            try:
+                get_redis_client().hincrby(self.key, pk, amount)
+                return
+            except redis.RedisError as e:
+                _redis_failed(e)
+        self.model._base_manager.filter(pk=pk).update(**{self.field: F(self.field) + amount})
+
+    def pending(self, pks: Iterable) -> Dict:
+        """
+        Get the increments of rows ``pks`` not flushed yet.
+
+        Returns:
+            dict: pk -> pending delta, for the rows that have one
+        """
+        pks = [pk for pk in pks if pk is not None]
+        if not pks or not _redis_available():
+            return {}
+        try:
+            with get_redis_client().pipeline(transaction=False) as pipe:
+                pipe.hmget(self.key, pks)
+                pipe.hmget(self.flushing_key, pks)
+                current, flushing = pipe.execute()
+        except redis.RedisError as e:
+            _redis_failed(e)
+            return {}
+        deltas = {}
+        for pk, a, b in zip(pks, current, flushing):
+            delta = int(a or 0) + int(b or 0)
+            if delta:
+                deltas[pk] = delta
+        return deltas
+
+    def merge(self, instances) -> None:
+        """Add the pending deltas to the counter attribute of loaded instances."""
+        instances = [instance for instance in instances if instance is not None]
+        deltas = self.pending(instance.pk for instance in instances)
+        for instance in instances:
+            if instance.pk in deltas:
+                setattr(instance, self.field, getattr(instance, self.field) + deltas[instance.pk])
+
+    def flush(self) -> int:
+        """
+        Apply the buffered increments to the database.
+
+        Returns:
+            int: Number of rows updated
+        """
+        client = get_redis_client()
+        response = client.register_script(CLAIM_SCRIPT)(
+            keys=[self.key, self.flushing_key], args=[FLUSH_ID_FIELD, uuid.uuid4().hex]
+        )
+        if not response:
+            return 0
+        fields = dict(zip(response[::2], response[1::2]))
+        # Hashes claimed before flush ids existed get one now
+        flush_id = f"{self.key}:{fields.pop(FLUSH_ID_FIELD, None) or uuid.uuid4().hex}"
+        deltas = [(int(pk), int(delta)) for pk, delta in fields.items() if int(delta)]
+
+        flush_model = apps.get_model("core", "BufferedCounterFlush")
+        with transaction.atomic():
+            _flush, created = flush_model.objects.get_or_create(flush_id=flush_id)
+            if created:
+                for start in range(0, len(deltas), FLUSH_BATCH_SIZE):
+                    self.apply(deltas[start:start + FLUSH_BATCH_SIZE])
+            else:
+                logger.info(f"Buffered counter flush {flush_id} was already applied")
+        client.delete(self.flushing_key)
+        return len(deltas) if created else 0
+
+    def apply(self, deltas) -> None:
+        if not deltas:
+            return
+        if connection.vendor != "postgresql":
+            self.model._base_manager.filter(pk__in=[pk for pk, _delta in deltas]).update(**{
+                self.field: F(self.field) + Case(*(When(pk=pk, then=Value(delta)) for pk, delta in deltas))
+            })
+            return
+        quote = connection.ops.quote_name
+        table = quote(self.model._meta.db_table)
+        column = quote(self.model._meta.get_field(self.field).column)
+        pk_column = quote(self.model._meta.pk.column)
+        values = ", ".join(["(%s, %s)"] * len(deltas))
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"UPDATE {table} AS t SET {column} = t.{column} + v.delta "
+                f"FROM (VALUES {values}) AS v(id, delta) WHERE t.{pk_column} = v.id",
+                [param for row in deltas for param in row],
+            )
+
+
+@lru_cache(maxsize=None)
+def get_counter(model, field: str) -> BufferedCounter:
+    return BufferedCounter(model, field)
+
+
+def flush_buffered_counters():
+    """
+    django-q task: flush every buffered counter to the database.
+
+    Counters are found by scanning Redis, so the worker needs no registry.
+    Concurrent runs are serialized by a Redis lock.
+    """
+    client = get_redis_client()
+    lock = client.lock(FLUSH_LOCK_KEY, timeout=FLUSH_LOCK_TIMEOUT)
+    if not lock.acquire(blocking=False):
+        logger.info("Buffered counters are already being flushed")
+        return 0
+    try:
+        keys = {key.removesuffix(FLUSHING_SUFFIX) for key in client.scan_iter(match=f"{KEY_PREFIX}:*", count=500)}
+        flushed = 0
+        for key in sorted(keys):
+            _prefix, label, field = key.split(":")
+            try:
+                model = apps.get_model(label)
+                model._meta.get_field(field)
+            except (LookupError, FieldDoesNotExist):
+                logger.warning(f"Dropping buffered counter {key}: no such model field")
+                client.delete(key, key + FLUSHING_SUFFIX)
+                continue
+            flushed += get_counter(model, field).flush()
+        apps.get_model("core", "BufferedCounterFlush").objects.filter(
+            created_at__lt=timezone.now() - FLUSH_RECORD_RETENTION
+        ).delete()
+        return flushed
+    finally:
+        lock.release()
+
+
+class BufferedCountersListSerializer(serializers.ListSerializer):
+    """Merges the pending counter deltas of the whole list in one Redis round trip."""
+
+    def to_representation(self, data):
+        iterable = list(data.all() if hasattr(data, "all") else data)
+        model = self.child.Meta.model
+        for field in self.child.Meta.buffered_counters:
+            get_counter(model, field).merge(iterable)
+        for item in iterable:
+            item._buffered_counters_merged = True
+        return super().to_representation(iterable)
+
+
+class BufferedCountersSerializerMixin:
+    """
+    Model serializer showing buffered counters with their pending increments.
+
+    List ``Meta.buffered_counters``; use ``BufferedCountersListSerializer``
+    (or a subclass) as ``Meta.list_serializer_class`` so lists are merged
+    in one batch. Nested in another serializer the database value is shown,
+    to keep lists of parents from costing a Redis call per row.
+    """
+
+    def to_representation(self, instance):
+        if self.parent is None and not getattr(instance, "_buffered_counters_merged", False):
+            for field in self.Meta.buffered_counters:
+                get_counter(self.Meta.model, field).merge([instance])
+            instance._buffered_counters_merged = True
+        return super().to_representation(instance)
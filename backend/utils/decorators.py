@@ -1,8 +1,6 @@
 from django.core.exceptions import PermissionDenied
-from rest_framework import status
-from rest_framework.response import Response
 
-from utils.cache_utils import get_cache, set_cache
+from utils.rate_limit import RateLimitThrottle
 
 
 class GroupRequiredMixin:
@@ -19,27 +17,19 @@ class GroupRequiredMixin:
 
 
 class RateLimitMixin:
-    """Mixin to implement rate limiting for class-based views."""
+    """
+    Mixin to rate limit DRF views with the Redis rate limiter (utils.rate_limit).
 
-    max_requests = 100
-    window = 3600  # 1 hour
+    Set ``rate_limit_scope`` to a key of ``settings.RATE_LIMITS``.
+    """
 
-    def dispatch(self, request, *args, **kwargs):
-        # Generate rate limit key
-        user_id = request.user.id if request.user.is_authenticated else request.META.get('REMOTE_ADDR')
-        key = f"rate_limit_{user_id}"
-
-        # Check current request count
-        current_requests = get_cache(key, 0)
-        if current_requests >= self.max_requests:
-            return Response({
-                'error': 'Rate limit exceeded. Try again later.'
-            }, status=status.HTTP_429_TOO_MANY_REQUESTS)
+    rate_limit_scope = None
 
-        # Increment request count
-        set_cache(key, current_requests + 1, self.window)
-
-        return super().dispatch(request, *args, **kwargs)
+    def get_throttles(self):
+        throttles = super().get_throttles()
+        if self.rate_limit_scope:
+            throttles.append(RateLimitThrottle(self.rate_limit_scope))
+        return throttles
 
 
 class LogActionMixin:
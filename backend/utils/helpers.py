@@ -1,3 +1,4 @@
+from django.conf import settings
 from django.http import HttpRequest
 
 
@@ -19,6 +20,30 @@ def get_client_ip(request: HttpRequest) -> str:
     return ip
 
 
+def get_remote_ip(request: HttpRequest) -> str:
+    """
+    Get the client's IP address as seen by the nearest trusted proxy.
+
+    Unlike ``get_client_ip`` the client cannot pick the result: each of the
+    ``TRUSTED_PROXY_COUNT`` proxies in front of the app (nginx) appends the
+    address it received the request from to X-Forwarded-For, so the entry
+    that many hops from the end is used. Without proxies, ``REMOTE_ADDR``.
+    Use it for access control and rate limiting.
+
+    Args:
+        request: Django HTTP request object
+
+    Returns:
+        str: Client IP address
+    """
+    proxies = settings.TRUSTED_PROXY_COUNT
+    x_forwarded_for = request.META.get('HTTP_X_FORWARDED_FOR')
+    if proxies and x_forwarded_for:
+        addresses = [address.strip() for address in x_forwarded_for.split(',')]
+        return addresses[-min(proxies, len(addresses))]
+    return request.META.get('REMOTE_ADDR')
+
+
 def format_file_size(size_bytes: int) -> str:
     """
     Format file size in human-readable format.
@@ -39,3 +64,21 @@ def format_file_size(size_bytes: int) -> str:
         i += 1
 
     return f"{size_bytes:.1f}{size_names[i]}"
+
+
+def percentile(values, pct: float) -> float:
+    """
+    Nearest-rank percentile of a list of numbers.
+
+    Args:
+        values: Numbers, in any order
+        pct (float): Percentile between 0 and 100
+
+    Returns:
+        float: The percentile, or 0.0 for an empty list
+    """
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
@@ -0,0 +1,149 @@
+import threading
+from bisect import bisect_left
+from typing import Dict, Iterable, Tuple
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+_registry: Dict[str, "BaseMetric"] = {}
+_registry_lock = threading.Lock()
+
+
+def _label_key(labels: dict) -> Tuple[Tuple[str, str], ...]:
+    return tuple(sorted((key, str(value)) for key, value in labels.items()))
+
+
+def _format_labels(labels: Iterable[Tuple[str, str]]) -> str:
+    labels = list(labels)
+    if not labels:
+        return ""
+    escaped = ",".join(
+        '{}="{}"'.format(key, value.replace("\\", "\\\\").replace('"', '\\"'))
+        for key, value in labels
+    )
+    return "{%s}" % escaped
+
+
+class BaseMetric:
+    """Base class for process-local metrics."""
+
+    kind = "untyped"
+
+    def __init__(self, name: str, description: str = ""):
+        self.name = name
+        self.description = description
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def samples(self):
+        raise NotImplementedError
+
+    def render(self) -> str:
+        lines = [
+            f"# HELP {self.name} {self.description}",
+            f"# TYPE {self.name} {self.kind}",
+        ]
+        for name, labels, value in self.samples():
+            lines.append(f"{name}{_format_labels(labels)} {value}")
+        return "\n".join(lines)
+
+
+class Counter(BaseMetric):
+    """Monotonically increasing counter."""
+
+    kind = "counter"
+
+    def inc(self, amount: float = 1, **labels) -> None:
+        key = _label_key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels) -> float:
+        return self._values.get(_label_key(labels), 0)
+
+    def samples(self):
+        with self._lock:
+            items = list(self._values.items())
+        for key, value in items:
+            yield self.name, key, value
+
+
+class Histogram(BaseMetric):
+    """Bucketed distribution of observed values (latencies, sizes)."""
+
+    kind = "histogram"
+
+    def __init__(self, name: str, description: str = "", buckets=DEFAULT_BUCKETS):
+        super().__init__(name, description)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value: float, **labels) -> None:
+        key = _label_key(labels)
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                state = self._values[key] = [[0] * len(self.buckets), 0.0, 0]
+            if index < len(self.buckets):
+                state[0][index] += 1
+            state[1] += value
+            state[2] += 1
+
+    def samples(self):
+        with self._lock:
+            items = [(key, (list(state[0]), state[1], state[2])) for key, state in self._values.items()]
+        for key, (counts, total, count) in items:
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets, counts):
+                cumulative += bucket_count
+                yield f"{self.name}_bucket", key + (("le", str(bound)),), cumulative
+            yield f"{self.name}_bucket", key + (("le", "+Inf"),), count
+            yield f"{self.name}_sum", key, total
+            yield f"{self.name}_count", key, count
+
+
+def _get_or_create(metric_cls, name, *args, **kwargs):
+    metric = _registry.get(name)
+    if metric is None:
+        with _registry_lock:
+            metric = _registry.get(name)
+            if metric is None:
+                metric = _registry[name] = metric_cls(name, *args, **kwargs)
+    if not isinstance(metric, metric_cls):
+        raise ValueError(f"Metric '{name}' is already registered as {metric.kind}")
+    return metric
+
+
+def counter(name: str, description: str = "") -> Counter:
+    """
+    Get or create a process-local counter.
+
+    Args:
+        name (str): Metric name in Prometheus notation
+        description (str): Help text
+
+    Returns:
+        Counter: Registered counter
+    """
+    return _get_or_create(Counter, name, description)
+
+
+def histogram(name: str, description: str = "", buckets=DEFAULT_BUCKETS) -> Histogram:
+    """
+    Get or create a process-local histogram.
+
+    Args:
+        name (str): Metric name in Prometheus notation
+        description (str): Help text
+        buckets: Upper bounds of the histogram buckets
+
+    Returns:
+        Histogram: Registered histogram
+    """
+    return _get_or_create(Histogram, name, description, buckets=buckets)
+
+
+def render_prometheus() -> str:
+    """Render every registered metric in the Prometheus text exposition format."""
+    with _registry_lock:
+        metrics = sorted(_registry.values(), key=lambda m: m.name)
+    return "\n".join(metric.render() for metric in metrics) + "\n"
@@ -0,0 +1,200 @@
+"""
+Derive ``select_related``/``prefetch_related`` from a serializer's field tree.
+
+Nested serializers on forward foreign keys and one-to-one relations become
+``select_related`` joins; nested ``many=True`` serializers and many-related
+primary key fields become ``Prefetch`` lookups whose querysets are planned
+recursively from the child serializer. Plans are computed once per
+serializer class.
+
+Nested serializers that look their instance up elsewhere
+(``resolves_from_snapshot = True``, see ``core.api.fields``) are not joined.
+
+Fields the planner cannot see through (``SerializerMethodField``, properties)
+can declare what they read with ``Meta.select_related_hints`` and
+``Meta.prefetch_related_hints``.
+"""
+
+import logging
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+from django.conf import settings
+from django.core.exceptions import FieldDoesNotExist
+from django.db import connection
+from django.db.models import Prefetch
+from rest_framework import serializers
+from rest_framework.response import Response
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class QueryPlan:
+    select_related: List[str] = field(default_factory=list)
+    # lookup -> (related model, plan of the related queryset)
+    prefetch_related: Dict[str, tuple] = field(default_factory=dict)
+    hinted_prefetches: List[str] = field(default_factory=list)
+
+
+_plans: Dict[type, QueryPlan] = {}
+
+
+def _resolve_source(model, source: str):
+    """Return ``(path, related model, is_many)`` for a relation source, else None."""
+    path = []
+    is_many = False
+    for attname in source.split("."):
+        try:
+            model_field = model._meta.get_field(attname)
+        except FieldDoesNotExist:
+            return None
+        if not model_field.is_relation or model_field.related_model is None:
+            return None
+        if model_field.many_to_many or model_field.one_to_many:
+            is_many = True
+        path.append(attname)
+        model = model_field.related_model
+    return "__".join(path), model, is_many
+
+
+def _plan_fields(serializer, model, prefix: str, plan: QueryPlan) -> None:
+    meta = getattr(serializer, "Meta", None)
+    for hint in getattr(meta, "select_related_hints", ()):
+        plan.select_related.append(prefix + hint)
+    for hint in getattr(meta, "prefetch_related_hints", ()):
+        plan.hinted_prefetches.append(prefix + hint)
+
+    for serializer_field in serializer.fields.values():
+        if serializer_field.write_only or serializer_field.source == "*":
+            continue
+
+        if getattr(serializer_field, "resolves_from_snapshot", False) and "." not in serializer_field.source:
+            continue
+
+        if isinstance(serializer_field, serializers.ListSerializer):
+            child = serializer_field.child
+        elif isinstance(serializer_field, serializers.ManyRelatedField):
+            child = None
+        elif isinstance(serializer_field, serializers.BaseSerializer):
+            child = serializer_field
+        else:
+            continue
+
+        resolved = _resolve_source(model, serializer_field.source)
+        if resolved is None:
+            continue
+        path, related_model, is_many = resolved
+
+        if is_many:
+            child_plan = QueryPlan()
+            if child is not None and hasattr(child, "fields"):
+                _plan_fields(child, related_model, "", child_plan)
+            plan.prefetch_related[prefix + path] = (related_model, child_plan)
+        else:
+            plan.select_related.append(prefix + path)
+            if hasattr(child, "fields"):
+                _plan_fields(child, related_model, f"{prefix}{path}__", plan)
+
+
+def get_query_plan(serializer_class) -> QueryPlan:
+    """
+    Build (or fetch the cached) query plan of a model serializer class.
+
+    Args:
+        serializer_class: ModelSerializer subclass
+
+    Returns:
+        QueryPlan: Relations to join and to prefetch
+    """
+    plan = _plans.get(serializer_class)
+    if plan is None:
+        plan = QueryPlan()
+        model = getattr(getattr(serializer_class, "Meta", None), "model", None)
+        if model is not None:
+            try:
+                _plan_fields(serializer_class(), model, "", plan)
+            except Exception as e:
+                logger.warning(f"Could not plan queries for {serializer_class.__name__}: {e}")
+        _plans[serializer_class] = plan
+    return plan
+
+
+def apply_query_plan(queryset, plan: QueryPlan):
+    """Apply a query plan to a queryset of the plan's root model."""
+    if plan.select_related:
+        queryset = queryset.select_related(*plan.select_related)
+    lookups = [
+        Prefetch(lookup, queryset=apply_query_plan(related_model._default_manager.all(), child_plan))
+        for lookup, (related_model, child_plan) in plan.prefetch_related.items()
+    ]
+    lookups += plan.hinted_prefetches
+    if lookups:
+        queryset = queryset.prefetch_related(*lookups)
+    return queryset
+
+
+def optimize_queryset(queryset, serializer_class):
+    """
+    Add the joins and prefetches ``serializer_class`` needs to ``queryset``.
+
+    Args:
+        queryset: QuerySet of the serializer's model
+        serializer_class: ModelSerializer subclass used to render it
+
+    Returns:
+        QuerySet: Queryset with select_related/prefetch_related applied
+    """
+    model = getattr(getattr(serializer_class, "Meta", None), "model", None)
+    if model is None or not issubclass(queryset.model, model):
+        # e.g. an action rendering another model; nothing to plan for this queryset
+        return queryset
+    return apply_query_plan(queryset, get_query_plan(serializer_class))
+
+
+class QueryCountExceeded(AssertionError):
+    pass
+
+
+class _QueryCounter:
+    def __init__(self):
+        self.queries: List[str] = []
+
+    def __call__(self, execute, sql, params, many, context):
+        self.queries.append(sql)
+        return execute(sql, params, many, context)
+
+
+class SerializerQueryPlanMixin:
+    """
+    ViewSet mixin that plans querysets from the serializer.
+
+    Call ``self.plan_queryset(qs)`` at the end of ``get_queryset``. With
+    ``settings.QUERY_COUNT_ASSERTIONS`` enabled (tests, development), ``list``
+    raises ``QueryCountExceeded`` when rendering a page runs at least one query
+    per row, i.e. when the query count grows with the page size.
+    """
+
+    def plan_queryset(self, queryset, serializer_class: Optional[type] = None):
+        return optimize_queryset(queryset, serializer_class or self.get_serializer_class())
+
+    def list(self, request, *args, **kwargs):
+        if not getattr(settings, "QUERY_COUNT_ASSERTIONS", False):
+            return super().list(request, *args, **kwargs)
+
+        queryset = self.filter_queryset(self.get_queryset())
+        page = self.paginate_queryset(queryset)
+        rows = list(page if page is not None else queryset)
+
+        counter = _QueryCounter()
+        with connection.execute_wrapper(counter):
+            data = self.get_serializer(rows, many=True).data
+        if len(rows) > 1 and len(counter.queries) >= len(rows):
+            raise QueryCountExceeded(
+                f"{type(self).__name__}.list ran {len(counter.queries)} queries to render "
+                f"{len(rows)} rows; first query: {counter.queries[0]}"
+            )
+
+        if page is not None:
+            return self.get_paginated_response(data)
+        return Response(data)
@@ -0,0 +1,261 @@
+"""
+Atomic rate limiting on Redis with the generic cell rate algorithm (GCRA).
+
+Each limit stores one value per key, the theoretical arrival time of the
+next request, so a check is a single Lua call however many limits apply
+(per user, per IP, per scope) and the windows slide instead of resetting.
+Either every limit consumes the request or none of them does.
+
+Limits are written as DRF-style rates (``"60/min"``): that many requests
+may arrive in one burst, then one more per ``period / count``. HTTP views
+use ``RateLimitThrottle`` with the scopes in ``settings.RATE_LIMITS``;
+asyncio code (the chat consumer) uses ``AsyncRateLimiter``.
+``LocalRateLimit`` runs the same algorithm in-process, for limits that need
+no coordination (one WebSocket connection).
+
+Anonymous clients are keyed by ``utils.helpers.get_remote_ip``, the address
+the trusted proxy saw, so rotating X-Forwarded-For does not escape the limit.
+
+If Redis is unreachable checks fail open and are retried after
+``REDIS_RETRY_INTERVAL`` seconds.
+"""
+
+import asyncio
+import logging
+import time
+import weakref
+from dataclasses import dataclass
+from typing import List, Optional, Sequence, Tuple
+
+import redis
+import redis.asyncio as aioredis
+from django.conf import settings
+from rest_framework.throttling import BaseThrottle
+
+from utils import metrics
+from utils.helpers import get_remote_ip
+
+logger = logging.getLogger(__name__)
+
+rate_limited = metrics.counter(
+    "rate_limited_total",
+    "Requests rejected by the rate limiter, by scope and key kind.",
+)
+
+# ARGV: interval_1, burst_1, interval_2, burst_2, ... (milliseconds per
+# request, requests allowed in a burst). Returns {0, 0} when allowed,
+# otherwise {1-based index of the exhausted limit, milliseconds to wait}.
+GCRA_SCRIPT = """
+local now_parts = redis.call('TIME')
+local now = tonumber(now_parts[1]) * 1000 + tonumber(now_parts[2]) / 1000
+local tats = {}
+for i = 1, #KEYS do
+    local interval = tonumber(ARGV[2 * i - 1])
+    local burst = tonumber(ARGV[2 * i])
+    local tat = math.max(tonumber(redis.call('GET', KEYS[i])) or now, now)
+    local new_tat = tat + interval
+    local wait = new_tat - now - burst * interval
+    if wait > 0 then
+        return {i, math.ceil(wait)}
+    end
+    tats[i] = new_tat
+end
+for i = 1, #KEYS do
+    redis.call('SET', KEYS[i], tats[i], 'PX', math.ceil(tats[i] - now) + 1000)
+end
+return {0, 0}
+"""
+
+REDIS_RETRY_INTERVAL = 30
+
+PERIODS = {"s": 1, "sec": 1, "m": 60, "min": 60, "h": 3600, "hour": 3600, "d": 86400, "day": 86400}
+
+
+@dataclass(frozen=True)
+class Limit:
+    """``burst`` requests at once, refilled at ``rate`` requests per second."""
+
+    rate: float
+    burst: int
+
+    @classmethod
+    def parse(cls, value) -> "Limit":
+        """Build a limit from ``"60/min"`` or ``{"rate": 1.0, "burst": 60}``."""
+        if isinstance(value, Limit):
+            return value
+        if isinstance(value, dict):
+            return cls(rate=float(value["rate"]), burst=int(value["burst"]))
+        count, period = value.split("/")
+        return cls(rate=int(count) / PERIODS[period], burst=int(count))
+
+    @property
+    def interval_ms(self) -> float:
+        return 1000 / self.rate
+
+
+@dataclass
+class RateLimitResult:
+    allowed: bool
+    # Name of the exhausted limit and seconds until it admits a request
+    limited_by: Optional[str] = None
+    retry_after: float = 0.0
+
+
+class LocalRateLimit:
+    """In-process GCRA for a single ``Limit``, the same algorithm as ``GCRA_SCRIPT``."""
+
+    def __init__(self, limit: Limit):
+        self.limit = limit
+        self.tat = 0.0
+
+    def consume(self) -> bool:
+        """Consume one request; False if the limit is exhausted."""
+        now = time.monotonic()
+        interval = 1 / self.limit.rate
+        new_tat = max(self.tat, now) + interval
+        if new_tat - now > self.limit.burst * interval:
+            return False
+        self.tat = new_tat
+        return True
+
+
+def _script_args(limits: Sequence[Tuple[str, str, Limit]]) -> Tuple[List[str], List[float]]:
+    keys, args = [], []
+    for _name, key, limit in limits:
+        keys.append(key)
+        args += [limit.interval_ms, limit.burst]
+    return keys, args
+
+
+def _to_result(limits, response) -> RateLimitResult:
+    index, wait_ms = (int(value) for value in response)
+    if not index:
+        return RateLimitResult(allowed=True)
+    return RateLimitResult(allowed=False, limited_by=limits[index - 1][0], retry_after=wait_ms / 1000)
+
+
+class RateLimiter:
+    """Checks several named limits against Redis in one round trip."""
+
+    _client = None
+    _script = None
+    _retry_at = 0.0
+
+    @classmethod
+    def get_script(cls):
+        if cls._script is None:
+            cls._client = redis.Redis.from_url(
+                settings.RATE_LIMIT_REDIS_URL,
+                socket_connect_timeout=0.5,
+                socket_timeout=0.5,
+            )
+            cls._script = cls._client.register_script(GCRA_SCRIPT)
+        return cls._script
+
+    @classmethod
+    def check(cls, limits: Sequence[Tuple[str, str, Limit]]) -> RateLimitResult:
+        """
+        Consume one request from every limit, or from none of them.
+
+        Args:
+            limits: ``(name, redis key, Limit)`` triples
+
+        Returns:
+            RateLimitResult: Whether the request is allowed, and if not which
+            limit rejected it and for how long
+        """
+        if not limits or time.monotonic() < cls._retry_at:
+            return RateLimitResult(allowed=True)
+        keys, args = _script_args(limits)
+        try:
+            return _to_result(limits, cls.get_script()(keys=keys, args=args))
+        except redis.RedisError as e:
+            logger.warning(f"Rate limiter failing open: {e}")
+            cls._retry_at = time.monotonic() + REDIS_RETRY_INTERVAL
+            return RateLimitResult(allowed=True)
+
+
+_async_clients = weakref.WeakKeyDictionary()
+
+
+def get_async_redis_client() -> aioredis.Redis:
+    """Get the asyncio Redis client of the rate limiter bound to the running event loop."""
+    loop = asyncio.get_running_loop()
+    client = _async_clients.get(loop)
+    if client is None:
+        client = _async_clients[loop] = aioredis.Redis.from_url(
+            settings.RATE_LIMIT_REDIS_URL,
+            socket_connect_timeout=0.5,
+            socket_timeout=0.5,
+        )
+    return client
+
+
+class AsyncRateLimiter:
+    """asyncio counterpart of ``RateLimiter`` for a fixed set of limits."""
+
+    def __init__(self, limits: Sequence[Tuple[str, str, Limit]]):
+        self.limits = list(limits)
+        self.keys, self.args = _script_args(self.limits)
+        self._script = None
+        self._retry_at = 0.0
+
+    async def check(self) -> RateLimitResult:
+        if time.monotonic() < self._retry_at:
+            return RateLimitResult(allowed=True)
+        try:
+            if self._script is None:
+                self._script = get_async_redis_client().register_script(GCRA_SCRIPT)
+            return _to_result(self.limits, await self._script(keys=self.keys, args=self.args))
+        except Exception as e:
+            logger.warning(f"Rate limiter failing open: {e}")
+            self._retry_at = time.monotonic() + REDIS_RETRY_INTERVAL
+            return RateLimitResult(allowed=True)
+
+
+def get_request_limits(request, scope: str) -> List[Tuple[str, str, Limit]]:
+    """
+    Limits of ``settings.RATE_LIMITS[scope]`` that apply to a request.
+
+    ``user`` applies to authenticated users, ``ip`` to anonymous clients and
+    ``global`` to every request of the scope.
+    """
+    config = settings.RATE_LIMITS.get(scope, {})
+    limits = []
+    user = getattr(request, "user", None)
+    if user is not None and user.is_authenticated:
+        if "user" in config:
+            limits.append(("user", f"ratelimit:{scope}:user:{user.pk}", Limit.parse(config["user"])))
+    elif "ip" in config:
+        limits.append(("ip", f"ratelimit:{scope}:ip:{get_remote_ip(request)}", Limit.parse(config["ip"])))
+    if "global" in config:
+        limits.append(("global", f"ratelimit:{scope}:global", Limit.parse(config["global"])))
+    return limits
+
+
+class RateLimitThrottle(BaseThrottle):
+    """
+    DRF throttle backed by ``RateLimiter``.
+
+    Subclass with a ``scope`` from ``settings.RATE_LIMITS``, or instantiate
+    with ``RateLimitThrottle(scope)`` from ``get_throttles``.
+    """
+
+    scope: Optional[str] = None
+
+    def __init__(self, scope: Optional[str] = None):
+        if scope is not None:
+            self.scope = scope
+        self.result = RateLimitResult(allowed=True)
+
+    def allow_request(self, request, view):
+        scope = self.scope or getattr(view, "rate_limit_scope", None)
+        if not scope:
+            return True
+        self.result = RateLimiter.check(get_request_limits(request, scope))
+        if not self.result.allowed:
+            rate_limited.inc(scope=scope, key=self.result.limited_by)
+        return self.result.allowed
+
+    def wait(self):
+        return self.result.retry_after or None
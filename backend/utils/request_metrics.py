@@ -0,0 +1,186 @@
+"""
+Sampled per-view request metrics and SQL query budgets.
+
+``RequestMetricsMiddleware`` measures a sample of requests: wall time, the
+number and duration of SQL queries (through ``connection.execute_wrapper``),
+cache hits and misses of ``utils.cache_utils.get_cache`` and the time spent
+in serializer ``.data``. Results are aggregated per view into the
+process-local registry of ``utils.metrics`` and exposed on
+``/metrics/``.
+
+Sampled requests are also checked against a query budget: the
+``query_budget`` attribute of the view class, ``REQUEST_QUERY_BUDGETS`` keyed
+by URL name, or ``REQUEST_QUERY_BUDGET_DEFAULT``. Violations are logged and
+counted, never raised.
+
+With ``REQUEST_METRICS_SAMPLE_RATE = 0`` the middleware removes itself from
+the stack at startup, and the cache and serializer hooks reduce to a single
+context variable lookup.
+"""
+
+import logging
+import random
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Optional
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connection
+
+from utils import metrics
+
+logger = logging.getLogger(__name__)
+
+QUERY_COUNT_BUCKETS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000)
+
+request_duration = metrics.histogram(
+    "http_request_duration_seconds",
+    "Wall time of sampled requests, by view.",
+)
+request_queries = metrics.histogram(
+    "http_request_db_queries",
+    "SQL queries run by sampled requests, by view.",
+    buckets=QUERY_COUNT_BUCKETS,
+)
+request_query_duration = metrics.histogram(
+    "http_request_db_duration_seconds",
+    "Time spent executing SQL in sampled requests, by view.",
+)
+request_serializer_duration = metrics.histogram(
+    "http_request_serializer_duration_seconds",
+    "Time spent building serializer data in sampled requests, by view.",
+)
+request_cache_lookups = metrics.counter(
+    "http_request_cache_lookups_total",
+    "Cache lookups made through utils.cache_utils in sampled requests, by view and result.",
+)
+query_budget_exceeded = metrics.counter(
+    "http_request_query_budget_exceeded_total",
+    "Sampled requests that ran more SQL queries than their view's budget.",
+)
+
+
+@dataclass
+class RequestStats:
+    queries: int = 0
+    query_time: float = 0.0
+    cache_hits: int = 0
+    cache_misses: int = 0
+    serializer_time: float = 0.0
+    serializer_depth: int = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        # connection.execute_wrapper hook
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.query_time += time.perf_counter() - started
+            self.queries += 1
+
+
+_current_stats: ContextVar[Optional[RequestStats]] = ContextVar("request_stats", default=None)
+
+
+def record_cache_lookup(hit: bool) -> None:
+    """Count a cache hit or miss against the request being sampled, if any."""
+    stats = _current_stats.get()
+    if stats is not None:
+        if hit:
+            stats.cache_hits += 1
+        else:
+            stats.cache_misses += 1
+
+
+def _install_serializer_timing() -> None:
+    """Wrap ``BaseSerializer.data`` once to time top-level serialization."""
+    from rest_framework.serializers import BaseSerializer
+
+    data_property = BaseSerializer.data
+    if getattr(data_property.fget, "_timed", False):
+        return
+
+    def timed_data(serializer):
+        stats = _current_stats.get()
+        if stats is None:
+            return data_property.fget(serializer)
+        # Serializer.data and ListSerializer.data call up to BaseSerializer.data
+        stats.serializer_depth += 1
+        started = time.perf_counter()
+        try:
+            return data_property.fget(serializer)
+        finally:
+            stats.serializer_depth -= 1
+            if stats.serializer_depth == 0:
+                stats.serializer_time += time.perf_counter() - started
+
+    timed_data._timed = True
+    BaseSerializer.data = property(timed_data)
+
+
+def get_view_name(request) -> str:
+    match = getattr(request, "resolver_match", None)
+    if match is None:
+        return "<unresolved>"
+    return match.view_name or match._func_path
+
+
+def get_query_budget(request) -> Optional[int]:
+    match = getattr(request, "resolver_match", None)
+    if match is None:
+        return None
+    view_class = getattr(match.func, "cls", None) or getattr(match.func, "view_class", None)
+    budget = getattr(view_class, "query_budget", None)
+    if budget is None:
+        budget = settings.REQUEST_QUERY_BUDGETS.get(match.view_name)
+    if budget is None:
+        budget = settings.REQUEST_QUERY_BUDGET_DEFAULT
+    return budget
+
+
+class RequestMetricsMiddleware:
+    """Record per-view timings, SQL and cache usage for a sample of requests."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.sample_rate = settings.REQUEST_METRICS_SAMPLE_RATE
+        if self.sample_rate <= 0:
+            raise MiddlewareNotUsed
+        _install_serializer_timing()
+
+    def __call__(self, request):
+        if self.sample_rate < 1 and random.random() >= self.sample_rate:
+            return self.get_response(request)
+
+        stats = RequestStats()
+        token = _current_stats.set(stats)
+        started = time.perf_counter()
+        try:
+            with connection.execute_wrapper(stats):
+                response = self.get_response(request)
+        finally:
+            _current_stats.reset(token)
+        self.record(request, stats, time.perf_counter() - started)
+        return response
+
+    def record(self, request, stats: RequestStats, elapsed: float) -> None:
+        view = get_view_name(request)
+        request_duration.observe(elapsed, view=view)
+        request_queries.observe(stats.queries, view=view)
+        request_query_duration.observe(stats.query_time, view=view)
+        if stats.serializer_time:
+            request_serializer_duration.observe(stats.serializer_time, view=view)
+        if stats.cache_hits:
+            request_cache_lookups.inc(stats.cache_hits, view=view, result="hit")
+        if stats.cache_misses:
+            request_cache_lookups.inc(stats.cache_misses, view=view, result="miss")
+
+        budget = get_query_budget(request)
+        if budget is not None and stats.queries > budget:
+            query_budget_exceeded.inc(view=view)
+            logger.warning(
+                f"{request.method} {request.path} ({view}) ran {stats.queries} queries, "
+                f"over its budget of {budget} ({stats.query_time * 1000:.1f}ms in SQL)"
+            )
@@ -1,5 +1,7 @@
 from typing import List
 
+from django.conf import settings
+from django.http import HttpResponse, HttpResponseForbidden
 from rest_framework import status
 from rest_framework.response import Response
 from rest_framework.views import APIView
@@ -69,3 +71,16 @@ class BaseActionAPIViewMixin:
 class BaseActionAPIView(BaseActionAPIViewMixin, APIView):
     def post(self, request):
         return self.handle_action(request)
+
+
+def metrics_view(request):
+    """Expose process-local metrics (see utils.metrics) to Prometheus scrapers."""
+    from utils.helpers import get_remote_ip
+    from utils.metrics import render_prometheus
+
+    allowed_ips = getattr(settings, "METRICS_ALLOWED_IPS", [])
+    if not request.user.is_staff and get_remote_ip(request) not in allowed_ips:
+        return HttpResponseForbidden()
+    return HttpResponse(
+        render_prometheus(), content_type="text/plain; version=0.0.4; charset=utf-8"
+    )